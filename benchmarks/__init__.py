@@ -0,0 +1,4 @@
+"""
+Benchmark scripts for the cookbook pipeline. Run from the repository root,
+e.g. ``python -m benchmarks.chunk_offsets``.
+"""
@@ -0,0 +1,55 @@
+"""
+Benchmark: chunk offset computation in SimpleSemanticChunker.
+
+Chunks synthetic transcripts of increasing size with the length-based mode
+(no embedding calls) and reports time per sentence. With linear offset
+tracking the per-sentence cost stays flat as the transcript grows.
+
+Usage:
+    python -m benchmarks.chunk_offsets [--max-sentences 200000]
+"""
+
+import argparse
+import random
+import time
+
+from gemini_chunker import SimpleSemanticChunker
+
+WORDS = (
+    "revenue margin guidance quarter growth cloud segment customers demand "
+    "pricing operating cash flow capital expenditure outlook headwinds"
+).split()
+
+def synthetic_transcript(num_sentences: int, seed: int = 0) -> str:
+    """Build a transcript of num_sentences short sentences with mixed punctuation."""
+    rng = random.Random(seed)
+    endings = [".", ".", ".", "?", "!", "..."]
+    return " ".join(
+        " ".join(rng.choices(WORDS, k=rng.randint(6, 18))).capitalize() + rng.choice(endings)
+        for _ in range(num_sentences)
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-sentences", type=int, default=200_000)
+    args = parser.parse_args()
+
+    chunker = SimpleSemanticChunker(embedding_model=None, min_sentences=3)
+
+    sizes = []
+    n = args.max_sentences
+    while n >= 12_500 and len(sizes) < 5:
+        sizes.append(n)
+        n //= 2
+    sizes.reverse()
+
+    print(f"{'sentences':>10} {'chunks':>8} {'seconds':>9} {'us/sentence':>12}")
+    for size in sizes:
+        text = synthetic_transcript(size)
+        start = time.perf_counter()
+        spans = chunker.chunk_spans(text)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} {len(spans):>8} {elapsed:>9.3f} {elapsed / size * 1e6:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: per-row vs bulk transcript inserts in db_interface.
+
+Loads the same synthetic transcripts into a fresh file database twice, once
+with insert_transcript (one INSERT and commit per row) and once with
+insert_transcripts_bulk (executemany in a single transaction), and reports
+rows per second for each.
+
+Usage:
+    python -m benchmarks.db_bulk_insert [--rows 5000] [--text-chars 20000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from db_interface import (
+    create_tables,
+    insert_companies_bulk,
+    insert_transcript,
+    insert_transcripts_bulk,
+    make_connection,
+)
+
+def _fresh_db(directory: str, name: str):
+    conn = make_connection(db_path=os.path.join(directory, name), refresh=True)
+    create_tables(conn)
+    company_ids = insert_companies_bulk(conn, [{"name": f"Company {i}"} for i in range(50)])
+    return conn, company_ids
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--text-chars", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    text = ("Revenue grew in the quarter. " * (args.text_chars // 29 + 1))[:args.text_chars]
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn, company_ids = _fresh_db(directory, "per_row.db")
+        start = time.perf_counter()
+        for i in range(args.rows):
+            insert_transcript(conn, company_ids[i % len(company_ids)], f"2024-01-{i % 28 + 1:02d}", text)
+        per_row = time.perf_counter() - start
+        conn.close()
+
+        conn, company_ids = _fresh_db(directory, "bulk.db")
+        rows = (
+            {
+                "company_id": company_ids[i % len(company_ids)],
+                "date": f"2024-01-{i % 28 + 1:02d}",
+                "transcript_text": text,
+            }
+            for i in range(args.rows)
+        )
+        start = time.perf_counter()
+        insert_transcripts_bulk(conn, rows, batch_size=args.batch_size)
+        bulk = time.perf_counter() - start
+        conn.close()
+
+    print(f"{'path':>8} {'rows':>8} {'seconds':>9} {'rows/sec':>10}")
+    print(f"{'per-row':>8} {args.rows:>8} {per_row:>9.3f} {args.rows / per_row:>10.0f}")
+    print(f"{'bulk':>8} {args.rows:>8} {bulk:>9.3f} {args.rows / bulk:>10.0f}")
+    print(f"speedup: {per_row / bulk:.1f}x")
+
+if __name__ == "__main__":
+    main()
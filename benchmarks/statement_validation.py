@@ -0,0 +1,121 @@
+"""
+Benchmark: RawStatement parsing paths.
+
+Parses the same synthetic statements with the notebook's original models
+(a Python field_validator per label), with the data_model models whose
+labels are validated natively by pydantic-core, per response and in one
+bulk pass, and for stored rows, through model_construct without validation
+and through raw_statements_from_rows.
+
+Usage:
+    python -m benchmarks.statement_validation [--statements 1000000] [--per-response 20]
+"""
+
+import argparse
+import json
+import time
+from enum import Enum
+
+from pydantic import BaseModel, field_validator
+
+from data_model import (
+    STATEMENT_TYPE_LOOKUP,
+    TEMPORAL_TYPE_LOOKUP,
+    RawStatement,
+    RawStatementList,
+    parse_raw_statements,
+    raw_statements_from_rows,
+)
+
+class _NotebookTemporalType(Enum):
+    ATEMPORAL = "ATEMPORAL"
+    STATIC = "STATIC"
+    DYNAMIC = "DYNAMIC"
+
+class _NotebookStatementType(Enum):
+    FACT = "FACT"
+    OPINION = "OPINION"
+    PREDICTION = "PREDICTION"
+
+class _NotebookRawStatement(BaseModel):
+    # As previously defined in the notebook
+    statement: str
+    statement_type: _NotebookStatementType
+    temporal_type: _NotebookTemporalType
+
+    @field_validator("temporal_type", mode="before")
+    @classmethod
+    def _parse_temporal_label(cls, value):
+        if value is None:
+            return _NotebookTemporalType.ATEMPORAL
+        return _NotebookTemporalType(value.strip().upper())
+
+    @field_validator("statement_type", mode="before")
+    @classmethod
+    def _parse_statement_label(cls, value=None):
+        if value is None:
+            return _NotebookStatementType.FACT
+        return _NotebookStatementType(value.strip().upper())
+
+class _NotebookRawStatementList(BaseModel):
+    statements: list[_NotebookRawStatement]
+
+def _statements(count: int) -> list[dict]:
+    statement_types = ("FACT", "OPINION", "PREDICTION")
+    temporal_types = ("STATIC", "DYNAMIC", "ATEMPORAL")
+    return [
+        {
+            "statement": f"Company {i % 500} reported revenue growth of {i % 37}% in Q{i % 4 + 1} 2024.",
+            "statement_type": statement_types[i % 3],
+            "temporal_type": temporal_types[i % 3],
+        }
+        for i in range(count)
+    ]
+
+def _timed(label: str, count: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>32} {elapsed:>9.2f} {count / elapsed:>14,.0f}")
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--statements", type=int, default=1_000_000)
+    parser.add_argument("--per-response", type=int, default=20)
+    args = parser.parse_args()
+
+    statements = _statements(args.statements)
+    responses = [
+        json.dumps({"statements": statements[i:i + args.per_response]})
+        for i in range(0, len(statements), args.per_response)
+    ]
+    bulk = json.dumps(statements)
+    rows = [(s["statement"], s["statement_type"], s["temporal_type"]) for s in statements]
+
+    n = args.statements
+    print(f"{'path':>32} {'seconds':>9} {'statements/sec':>14}")
+    baseline = _timed("notebook, per response", n, lambda: [
+        _NotebookRawStatementList.model_validate_json(r) for r in responses
+    ])
+    timings = {
+        "native, per response": _timed("native, per response", n, lambda: [
+            RawStatementList.model_validate_json(r) for r in responses
+        ]),
+        "native, one bulk pass": _timed("native, one bulk pass", n, lambda: parse_raw_statements(bulk)),
+        "model_construct, trusted rows": _timed("model_construct, trusted rows", n, lambda: [
+            RawStatement.model_construct(
+                statement=text,
+                statement_type=STATEMENT_TYPE_LOOKUP[statement_type],
+                temporal_type=TEMPORAL_TYPE_LOOKUP[temporal_type],
+            )
+            for text, statement_type, temporal_type in rows
+        ]),
+        "raw_statements_from_rows": _timed("raw_statements_from_rows", n, lambda: raw_statements_from_rows(rows)),
+    }
+    print()
+    for label, elapsed in timings.items():
+        print(f"{label}: {baseline / elapsed:.1f}x vs notebook")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Benchmark: end-to-end pipeline scenarios on a synthetic corpus.
+
+Runs each scenario against the synthetic earnings calls from
+benchmarks.synthetic, with fake_services standing in for the embedding and
+LLM endpoints (configurable latency and error rates), so no API key or
+network is needed:
+
+- chunking: semantic chunking and quarter detection, per transcript
+- embedding: GeminiEmbeddings over each transcript's sentences, per call
+- extraction: StatementExtractor over all chunks, per LLM request
+- db_load: bulk load of transcripts, chunks and statements, per batch
+- temporal_queries: get_statements_valid_at lookups, per query
+
+Each scenario runs in a fresh process so its peak RSS is its own. Results
+are printed as JSON with throughput, p50/p99 latency and peak RSS. With
+--baseline, results are compared to an earlier run and the exit status is
+1 if any scenario's throughput dropped or p99 latency grew by more than
+--tolerance.
+
+Usage:
+    python -m benchmarks.suite [--scenarios chunking,db_load] [--transcripts 200] [--output results.json]
+    python -m benchmarks.suite --baseline results.json --tolerance 0.15
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_dataset
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _summary(latencies: list, items: int, seconds: float, unit: str, **extra) -> dict:
+    latencies_ms = np.asarray(latencies, dtype=np.float64) * 1000
+    return {
+        "items": items,
+        "unit": unit,
+        "seconds": round(seconds, 4),
+        "throughput": round(items / seconds, 2) if seconds > 0 else None,
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3) if len(latencies_ms) else None,
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3) if len(latencies_ms) else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        **extra,
+    }
+
+def _corpus(args) -> list:
+    return list(synthetic_dataset(args.transcripts, args.companies, args.words, seed=args.seed))
+
+def _embeddings(args, latency: float = 0.0, errors: bool = False):
+    from fake_services import FakeEmbeddingClient
+    from gemini_chunker import GeminiEmbeddings
+
+    client = FakeEmbeddingClient(
+        dim=args.dim,
+        latency=latency,
+        jitter=args.jitter if latency else 0.0,
+        rate_limit_rate=args.rate_limit_rate if errors else 0.0,
+        error_rate=args.error_rate if errors else 0.0,
+        seed=args.seed,
+    )
+    return client, GeminiEmbeddings(client=client, requests_per_minute=None, max_concurrency=args.workers)
+
+def _chunked(args, corpus: list) -> list:
+    """Transcripts chunked by length, as setup for the scenarios after chunking."""
+    from gemini_chunker import Chunk, SimpleSemanticChunker, Transcript
+
+    chunker = SimpleSemanticChunker(embedding_model=None, min_sentences=3)
+    return [
+        Transcript(
+            text=record["transcript"],
+            company=record["company"],
+            date=record["date"],
+            chunks=[Chunk(**c) for c in chunker.chunk(record["transcript"])],
+        )
+        for record in corpus
+    ]
+
+def scenario_chunking(args) -> dict:
+    from gemini_chunker import SimpleSemanticChunker
+    from transcript_metadata import find_fiscal_quarter
+
+    corpus = _corpus(args)
+    _, embeddings = _embeddings(args)
+    chunker = SimpleSemanticChunker(embedding_model=embeddings, min_sentences=3)
+    latencies, chunks = [], 0
+    start = time.perf_counter()
+    for record in corpus:
+        t0 = time.perf_counter()
+        chunks += len(chunker.chunk(record["transcript"]))
+        find_fiscal_quarter(record["transcript"])
+        latencies.append(time.perf_counter() - t0)
+    seconds = time.perf_counter() - start
+    characters = sum(len(record["transcript"]) for record in corpus)
+    return _summary(
+        latencies, len(corpus), seconds, "transcripts",
+        chunks=chunks, characters_per_second=round(characters / seconds),
+    )
+
+def scenario_embedding(args) -> dict:
+    from gemini_chunker import SENTENCE_PATTERN
+
+    corpus = _corpus(args)
+    client, embeddings = _embeddings(args, latency=args.embedding_latency, errors=True)
+    documents = [SENTENCE_PATTERN.findall(record["transcript"]) for record in corpus]
+    latencies = []
+    start = time.perf_counter()
+    for sentences in documents:
+        t0 = time.perf_counter()
+        embeddings.embed_documents(sentences)
+        latencies.append(time.perf_counter() - t0)
+    seconds = time.perf_counter() - start
+    texts = sum(len(sentences) for sentences in documents)
+    return _summary(
+        latencies, texts, seconds, "texts",
+        calls=len(documents), service=client.stats(),
+    )
+
+def scenario_extraction(args) -> dict:
+    from fake_services import FakeLLM
+    from statement_extraction import StatementExtractor, chunk_inputs_from_transcript
+
+    transcripts = _chunked(args, _corpus(args))
+    chunks = [c for t in transcripts for c in chunk_inputs_from_transcript(t)]
+    llm = FakeLLM(
+        latency=args.llm_latency,
+        latency_per_1k_tokens=args.llm_latency_per_1k_tokens,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    )
+    latencies = []
+
+    def timed(prompt: str) -> str:
+        t0 = time.perf_counter()
+        try:
+            return llm(prompt)
+        finally:
+            latencies.append(time.perf_counter() - t0)
+
+    extractor = StatementExtractor(timed, num_workers=args.workers)
+    start = time.perf_counter()
+    results = extractor.extract(chunks)
+    seconds = time.perf_counter() - start
+    return _summary(
+        latencies, len(chunks), seconds, "chunks",
+        statements=sum(len(s) for s in results.values()),
+        extractor=extractor.stats(), service=llm.stats(),
+    )
+
+def _statement_rows(args, transcripts: list, chunk_ids: list) -> list:
+    """Deterministic statements per chunk, as the fake LLM would extract them."""
+    from fake_services import FakeLLM
+
+    llm = FakeLLM(seed=args.seed)
+    rows = []
+    chunk_id = iter(chunk_ids)
+    for t in transcripts:
+        valid_at = t.date.date()
+        for chunk in t.chunks:
+            cid = next(chunk_id)
+            for s in llm.statements(chunk.text)[:args.statements_per_chunk]:
+                rows.append({
+                    "chunk_id": cid,
+                    "transcript_id": t.transcript_row,
+                    "company_id": t.company_row,
+                    "statement": s["statement"],
+                    "statement_type": s["statement_type"],
+                    "temporal_type": s["temporal_type"],
+                    "valid_at": None if s["temporal_type"] == "ATEMPORAL" else valid_at.isoformat(),
+                    "invalid_at": (valid_at + timedelta(days=91)).isoformat() if s["temporal_type"] == "DYNAMIC" else None,
+                })
+    return rows
+
+def _load(args, conn, transcripts: list, latencies: list) -> int:
+    """Bulk load transcripts, chunks and statements in batches; returns rows written."""
+    from db_interface import (
+        insert_chunks_bulk,
+        insert_companies_bulk,
+        insert_statements_bulk,
+        insert_transcripts_bulk,
+    )
+
+    names = sorted({t.company for t in transcripts})
+    company_ids = dict(zip(names, insert_companies_bulk(conn, [{"name": n} for n in names])))
+    rows = len(names)
+    for i in range(0, len(transcripts), args.db_batch):
+        batch = transcripts[i:i + args.db_batch]
+        t0 = time.perf_counter()
+        transcript_ids = insert_transcripts_bulk(conn, [
+            {"company_id": company_ids[t.company], "date": t.date.date().isoformat(), "transcript_text": t.text}
+            for t in batch
+        ])
+        chunk_rows = []
+        for t, transcript_id in zip(batch, transcript_ids):
+            t.transcript_row, t.company_row = transcript_id, company_ids[t.company]
+            for index, chunk in enumerate(t.chunks):
+                chunk_rows.append({
+                    "transcript_id": transcript_id,
+                    "chunk_index": index,
+                    "start_index": chunk.metadata["start_index"],
+                    "end_index": chunk.metadata["end_index"],
+                    "sentence_count": chunk.metadata["sentence_count"],
+                    "text": chunk.text,
+                })
+        chunk_ids = insert_chunks_bulk(conn, chunk_rows)
+        statements = _statement_rows(args, batch, chunk_ids)
+        insert_statements_bulk(conn, statements)
+        latencies.append(time.perf_counter() - t0)
+        rows += len(batch) + len(chunk_rows) + len(statements)
+    return rows
+
+class _Row:
+    """Mutable view of a Transcript with the database IDs assigned while loading."""
+
+    def __init__(self, transcript):
+        self.text = transcript.text
+        self.company = transcript.company
+        self.date = transcript.date
+        self.chunks = transcript.chunks
+        self.transcript_row = None
+        self.company_row = None
+
+def _database(directory: str):
+    from db_interface import create_tables, make_connection
+
+    conn = make_connection(db_path=os.path.join(directory, "bench.db"), refresh=True, profile="performance")
+    create_tables(conn)
+    return conn
+
+def scenario_db_load(args) -> dict:
+    transcripts = [_Row(t) for t in _chunked(args, _corpus(args))]
+    with tempfile.TemporaryDirectory() as directory:
+        conn = _database(directory)
+        latencies = []
+        start = time.perf_counter()
+        rows = _load(args, conn, transcripts, latencies)
+        seconds = time.perf_counter() - start
+        # The performance profile runs in WAL mode; move the pages into the main file before measuring
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size = os.path.getsize(os.path.join(directory, "bench.db"))
+        conn.close()
+    return _summary(latencies, rows, seconds, "rows", batches=len(latencies), db_mb=round(size / 2**20, 1))
+
+def scenario_temporal_queries(args) -> dict:
+    from db_interface import get_statements_valid_at
+
+    transcripts = [_Row(t) for t in _chunked(args, _corpus(args))]
+    with tempfile.TemporaryDirectory() as directory:
+        conn = _database(directory)
+        _load(args, conn, transcripts, [])
+        company_ids = [row[0] for row in conn.execute("SELECT id FROM companies")]
+        first = min(t.date for t in transcripts).date()
+        span = (max(t.date for t in transcripts).date() - first).days + 180
+        rng = random.Random(args.seed)
+        queries = [
+            (rng.choice(company_ids), (first + timedelta(days=rng.randrange(span))).isoformat())
+            for _ in range(args.queries)
+        ]
+        latencies, returned = [], 0
+        start = time.perf_counter()
+        for company_id, at in queries:
+            t0 = time.perf_counter()
+            returned += len(get_statements_valid_at(conn, company_id, at, limit=args.query_limit))
+            latencies.append(time.perf_counter() - t0)
+        seconds = time.perf_counter() - start
+        statements = conn.execute("SELECT COUNT(*) FROM statements").fetchone()[0]
+        conn.close()
+    return _summary(latencies, len(queries), seconds, "queries", statements=statements, rows_returned=returned)
+
+SCENARIOS = {
+    "chunking": scenario_chunking,
+    "embedding": scenario_embedding,
+    "extraction": scenario_extraction,
+    "db_load": scenario_db_load,
+    "temporal_queries": scenario_temporal_queries,
+}
+
+def _run(name: str, args) -> dict:
+    # Scenario output (progress prints from db_interface) goes to stderr
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        return SCENARIOS[name](args)
+    finally:
+        sys.stdout = stdout
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Find scenarios that regressed against a baseline run.
+
+    Args:
+        results (dict): Scenario results of this run
+        baseline (dict): Scenario results of the baseline run
+        tolerance (float): Allowed relative throughput drop and p99 increase
+
+    Returns:
+        list: One message per regression
+    """
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if before.get("throughput") and current.get("throughput") is not None:
+            change = current["throughput"] / before["throughput"] - 1
+            if change < -tolerance:
+                regressions.append(f"{name}: throughput {change:+.1%} ({before['throughput']} -> {current['throughput']} {current['unit']}/s)")
+        if before.get("p99_ms") and current.get("p99_ms") is not None:
+            change = current["p99_ms"] / before["p99_ms"] - 1
+            if change > tolerance:
+                regressions.append(f"{name}: p99 latency {change:+.1%} ({before['p99_ms']} -> {current['p99_ms']} ms)")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--transcripts", type=int, default=200)
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--words", type=int, default=8000, help="approximate words per transcript")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=16, help="concurrent embedding/LLM requests")
+    parser.add_argument("--dim", type=int, default=768, help="embedding dimension")
+    parser.add_argument("--embedding-latency", type=float, default=0.02, help="seconds per embedding request")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per LLM request")
+    parser.add_argument("--llm-latency-per-1k-tokens", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra random seconds per embedding request")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="probability a request fails with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability a request fails with 503")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability the LLM skips a chunk")
+    parser.add_argument("--statements-per-chunk", type=int, default=8)
+    parser.add_argument("--db-batch", type=int, default=20, help="transcripts per bulk-load batch")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--query-limit", type=int, default=100)
+    parser.add_argument("--no-isolate", action="store_true", help="run scenarios in this process")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    results = {}
+    for name in names:
+        print(f"running {name}...", file=sys.stderr)
+        if args.no_isolate:
+            results[name] = _run(name, args)
+        else:
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                results[name] = pool.submit(_run, name, args).result()
+
+    report = {
+        "run_id": str(uuid.uuid4()),
+        "date": date.today().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "scenarios": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline"] = baseline.get("run_id")
+        report["regressions"] = compare(results, baseline.get("scenarios", {}), args.tolerance)
+
+    text = json.dumps(report, indent=2, default=str)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if report.get("regressions"):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Synthetic earnings-call corpus for benchmarks.
+
+Generates transcripts shaped like real calls: an operator introduction that
+names the fiscal quarter, prepared remarks from investor relations, the CEO
+and the CFO with financial figures, a Q&A session of analyst questions and
+executive answers, and a closing. The default length of about 8,000 words
+matches a typical hour-long call. Output is deterministic for a given seed.
+
+Usage:
+    python -m benchmarks.synthetic [--transcripts 10] [--companies 5] [--words 8000] > corpus.jsonl
+"""
+
+import argparse
+import json
+import random
+from datetime import date, timedelta
+from typing import Iterator
+
+_PREFIXES = (
+    "Nova", "Apex", "Blue", "Summit", "Quantum", "Vertex", "Harbor", "Silver",
+    "Crest", "Atlas", "Pioneer", "Orion", "Granite", "Cedar", "Helix", "Zenith",
+)
+_ROOTS = (
+    "Dynamics", "Systems", "Health", "Energy", "Logistics", "Semiconductor",
+    "Financial", "Software", "Retail", "Networks", "Materials", "Robotics",
+)
+_SUFFIXES = ("Inc.", "Corp.", "Holdings", "Group", "Ltd.", "Inc")
+_FIRST = ("Jane", "John", "Maria", "David", "Priya", "Chen", "Laura", "Ahmed", "Sofia", "Michael")
+_LAST = ("Doe", "Smith", "Garcia", "Kim", "Patel", "Nguyen", "Rossi", "Cohen", "Okafor", "Brown")
+_BANKS = ("Morgan Stanley", "Goldman Sachs", "JPMorgan", "Bank of America", "Barclays", "UBS", "Jefferies")
+_ORDINALS = ("first", "second", "third", "fourth")
+
+_METRICS = ("revenue", "operating margin", "gross margin", "free cash flow", "earnings per share", "bookings")
+_SEGMENTS = ("cloud", "enterprise", "consumer", "services", "international", "data center", "subscription")
+_REMARKS = (
+    "We continued to see strong demand across our {segment} business.",
+    "Our {segment} segment grew {pct}% year over year, ahead of our expectations.",
+    "We are investing in {segment} capacity to support customer growth.",
+    "Customers are consolidating onto our platform, which is driving larger deals.",
+    "Pricing remained disciplined and churn stayed near historic lows.",
+    "We expect {metric} to improve through the rest of the fiscal year.",
+    "Supply chain conditions have normalized and lead times are back to pre-pandemic levels.",
+    "We launched {count} new products this quarter, led by our {segment} offerings.",
+    "Headwinds in {segment} were offset by strength elsewhere in the portfolio.",
+    "Our backlog now stands at ${amount} billion, up {pct}% from a year ago.",
+)
+_FIGURES = (
+    "Total {metric} was ${amount} billion, up {pct}% year over year.",
+    "{Metric} came in at {pct}%, an improvement of {bps} basis points.",
+    "We returned ${amount} billion to shareholders through buybacks and dividends.",
+    "For the {next} quarter, we expect {metric} between ${amount} and ${amount_high} billion.",
+    "We are raising our full-year guidance for {metric} by {pct}%.",
+    "Operating expenses were ${amount} billion, reflecting continued investment in {segment}.",
+)
+_QUESTIONS = (
+    "Can you talk about the demand environment in {segment} and how it trended through the quarter?",
+    "How should we think about {metric} for the rest of the year?",
+    "What are you seeing in terms of pricing, and is there any pushback from customers?",
+    "Could you give us more color on the {segment} pipeline going into next quarter?",
+    "How much of the guidance raise is driven by {segment} versus the rest of the business?",
+    "Are there any changes to your capital allocation priorities?",
+)
+_ANSWERS = (
+    "Thanks for the question.",
+    "Demand in {segment} remained healthy and we saw acceleration in the final month.",
+    "We are comfortable with the {metric} trajectory we outlined.",
+    "Pricing has held up well and we have not seen meaningful pushback.",
+    "The pipeline is the strongest it has been in several years.",
+    "We remain focused on profitable growth and disciplined investment.",
+    "I would add that our {segment} customers are expanding their commitments.",
+    "We will give a fuller update at our investor day later this year.",
+)
+
+def company_names(count: int, seed: int = 0) -> list[str]:
+    """Distinct synthetic company names, e.g. "Nova Dynamics Inc."."""
+    rng = random.Random(seed)
+    combos = [(p, r) for p in _PREFIXES for r in _ROOTS]
+    rng.shuffle(combos)
+    names = []
+    for i in range(count):
+        prefix, root = combos[i % len(combos)]
+        number = f" {i // len(combos) + 1}" if i >= len(combos) else ""
+        names.append(f"{prefix} {root}{number} {rng.choice(_SUFFIXES)}")
+    return names
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+
+def _fill(template: str, rng: random.Random, quarter: int) -> str:
+    metric = rng.choice(_METRICS)
+    amount = round(rng.uniform(0.5, 40), 1)
+    return template.format(
+        segment=rng.choice(_SEGMENTS),
+        metric=metric,
+        Metric=metric.capitalize(),
+        pct=rng.randint(2, 45),
+        bps=rng.randint(10, 400),
+        count=rng.randint(2, 9),
+        amount=amount,
+        amount_high=round(amount * 1.05, 1),
+        next=_ORDINALS[quarter % 4],
+    )
+
+def _paragraph(rng: random.Random, templates: tuple, quarter: int, sentences: int) -> str:
+    return " ".join(_fill(rng.choice(templates), rng, quarter) for _ in range(sentences))
+
+def generate_transcript(company: str, fiscal_year: int, quarter: int, words: int = 8000, seed: int = 0) -> str:
+    """
+    One earnings call transcript of roughly ``words`` words.
+
+    Args:
+        company (str): Company name
+        fiscal_year (int): Fiscal year named in the introduction
+        quarter (int): Fiscal quarter, 1-4
+        words (int): Approximate length in words
+        seed (int): Seed for the content
+
+    Returns:
+        str: Transcript text with one speaker turn per paragraph
+    """
+    rng = random.Random(f"{seed}:{company}:{fiscal_year}:{quarter}")
+    ceo, cfo, ir = _person(rng), _person(rng), _person(rng)
+    ordinal = _ORDINALS[quarter - 1]
+    turns = [
+        f"Operator: Good day, and welcome to the {company} {ordinal} quarter fiscal {fiscal_year} earnings "
+        f"conference call. All participants are in a listen-only mode. Please note this event is being recorded.",
+        f"{ir} -- Head of Investor Relations: Thank you, operator. Joining me today are {ceo}, our Chief Executive "
+        f"Officer, and {cfo}, our Chief Financial Officer. Today's remarks include forward-looking statements "
+        f"that are subject to risks and uncertainties described in our filings.",
+        f"{ceo} -- Chief Executive Officer: Thanks, {ir.split()[0]}, and good afternoon everyone. "
+        + _paragraph(rng, _REMARKS, quarter, rng.randint(10, 16)),
+        f"{cfo} -- Chief Financial Officer: Thank you, {ceo.split()[0]}. "
+        + _paragraph(rng, _FIGURES + _REMARKS, quarter, rng.randint(12, 18)),
+        "Operator: We will now begin the question-and-answer session.",
+    ]
+    length = sum(len(turn.split()) for turn in turns)
+    closing = f"Operator: This concludes today's conference call. Thank you for joining {company}'s Q{quarter} {fiscal_year} call."
+    target = words - len(closing.split())
+    while length < target:
+        analyst, bank = _person(rng), rng.choice(_BANKS)
+        exchange = [
+            f"Operator: Our next question comes from {analyst} with {bank}. Please go ahead.",
+            f"{analyst} -- {bank} -- Analyst: " + _paragraph(rng, _QUESTIONS, quarter, rng.randint(1, 3)),
+            f"{rng.choice((ceo, cfo))} -- Executive: " + _paragraph(rng, _ANSWERS + _REMARKS, quarter, rng.randint(4, 12)),
+        ]
+        if rng.random() < 0.4:
+            exchange.append(f"{analyst} -- {bank} -- Analyst: Thank you. " + _fill(rng.choice(_QUESTIONS), rng, quarter))
+            exchange.append(f"{rng.choice((ceo, cfo))} -- Executive: " + _paragraph(rng, _ANSWERS, quarter, rng.randint(2, 6)))
+        turns.extend(exchange)
+        length += sum(len(turn.split()) for turn in exchange)
+    turns.append(closing)
+    return "\n\n".join(turns)
+
+def synthetic_dataset(
+    transcripts: int,
+    companies: int = 50,
+    words: int = 8000,
+    start_year: int = 2014,
+    seed: int = 0,
+) -> Iterator[dict]:
+    """
+    Records in the shape of the notebook's Hugging Face dataset.
+
+    Companies report one call per quarter, starting at ``start_year``, in
+    date order across companies.
+
+    Args:
+        transcripts (int): Number of transcripts
+        companies (int): Number of distinct companies
+        words (int): Approximate words per transcript
+        start_year (int): Fiscal year of the first quarter
+        seed (int): Seed for names and content
+
+    Yields:
+        dict: {"company", "date", "transcript"}
+    """
+    names = company_names(companies, seed)
+    for i in range(transcripts):
+        company = names[i % companies]
+        period = i // companies
+        fiscal_year, quarter = start_year + period // 4, period % 4 + 1
+        # Calls happen a few weeks after the quarter ends
+        call_date = date(fiscal_year, 3 * quarter, 1) + timedelta(days=30 + i % companies % 20)
+        yield {
+            "company": company,
+            "date": call_date.isoformat(),
+            "transcript": generate_transcript(company, fiscal_year, quarter, words, seed),
+        }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transcripts", type=int, default=10)
+    parser.add_argument("--companies", type=int, default=5)
+    parser.add_argument("--words", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for record in synthetic_dataset(args.transcripts, args.companies, args.words, seed=args.seed):
+        print(json.dumps(record))
+
+if __name__ == "__main__":
+    main()
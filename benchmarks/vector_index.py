@@ -0,0 +1,67 @@
+"""
+Benchmark: recall vs latency of VectorIndex search modes.
+
+Builds an index over synthetic clustered embeddings, takes exact blocked
+search as ground truth and reports recall@k and per-query latency for exact
+search and for IVF search at increasing nprobe.
+
+Usage:
+    python -m benchmarks.vector_index [--vectors 200000] [--dim 768] [--queries 200]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from vector_index import VectorIndex
+
+def _synthetic(count: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    # Topical clusters plus noise, closer to real chunk embeddings than uniform noise
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    noise = rng.standard_normal((count, dim)).astype(np.float32)
+    return centers[rng.integers(0, clusters, count)] + 0.6 * noise
+
+def _timed_search(index: VectorIndex, queries: np.ndarray, k: int, **kwargs) -> tuple[np.ndarray, float]:
+    start = time.perf_counter()
+    ids, _ = index.search(queries, k=k, **kwargs)
+    return ids, (time.perf_counter() - start) / len(queries)
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = _synthetic(args.vectors, args.dim, max(1, args.vectors // 500), rng)
+    queries = vectors[rng.integers(0, args.vectors, args.queries)]
+    queries = queries + 0.2 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    index = VectorIndex(args.dim)
+    start = time.perf_counter()
+    index.add(range(args.vectors), vectors)
+    print(f"add: {time.perf_counter() - start:.2f}s for {args.vectors} x {args.dim}")
+
+    start = time.perf_counter()
+    index.train(nlist=args.nlist, seed=args.seed)
+    print(f"train: {time.perf_counter() - start:.2f}s, {len(index.centroids)} lists")
+
+    truth, latency = _timed_search(index, queries, args.k, exact=True)
+    print(f"\n{'mode':>12} {'recall@' + str(args.k):>10} {'ms/query':>10}")
+    print(f"{'exact':>12} {1.0:>10.3f} {latency * 1000:>10.3f}")
+    for nprobe in (1, 2, 4, 8, 16, 32, 64):
+        if nprobe > len(index.centroids):
+            break
+        found, latency = _timed_search(index, queries, args.k, exact=False, nprobe=nprobe)
+        print(f"{'ivf/' + str(nprobe):>12} {_recall(found, truth):>10.3f} {latency * 1000:>10.3f}")
+
+if __name__ == "__main__":
+    main()
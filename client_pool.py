@@ -0,0 +1,206 @@
+"""
+Bounded pool of reusable API clients.
+
+Creating a client (and its HTTP/2 channel or keep-alive session) is the
+expensive part of talking to an external service, and sharing one client
+across dozens of worker threads serializes them on its connection. The pool
+creates clients lazily up to a fixed size, hands each one to a single thread
+at a time and reuses them for the life of the pool, so connections stay warm
+instead of being re-established per request.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+class PoolClosedError(RuntimeError):
+    """Raised when acquiring from a pool that has been closed."""
+
+class ClientPool(Generic[T]):
+    """
+    Thread-safe pool of up to ``size`` clients built by ``factory``.
+
+    Args:
+        factory (Callable): Zero-argument function creating a new client
+        size (int): Maximum number of clients
+        close (Callable, optional): Called on every created client by close()
+    """
+
+    def __init__(self, factory: Callable[[], T], size: int = 8, close: Optional[Callable[[T], None]] = None):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self._close = close
+
+        self._cond = threading.Condition()
+        self._idle: list[T] = []
+        self._all: list[T] = []
+        self._detached: list[T] = []
+        self._closed = False
+
+        self._started = time.monotonic()
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.acquisitions = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.busy_seconds = 0.0
+        self.create_seconds = 0.0
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[T]:
+        """
+        Check a client out of the pool for the duration of a ``with`` block.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free client, None waits forever
+
+        Yields:
+            A client used by no other thread until the block exits
+
+        Raises:
+            TimeoutError: If no client became free within timeout
+            PoolClosedError: If the pool is closed
+        """
+        client = self._checkout(timeout)
+        start = time.monotonic()
+        try:
+            yield client
+        finally:
+            self._checkin(client, time.monotonic() - start)
+
+    def _checkout(self, timeout: Optional[float]) -> T:
+        requested = time.monotonic()
+        with self._cond:
+            waited = False
+            while True:
+                if self._closed:
+                    raise PoolClosedError("client pool is closed")
+                if self._idle:
+                    # LIFO keeps the most recently used (warmest) connections busy
+                    client = self._idle.pop()
+                    break
+                if len(self._all) < self.size:
+                    client = None
+                    break
+                waited = True
+                remaining = None if timeout is None else timeout - (time.monotonic() - requested)
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"no client free after {timeout}s")
+                self._cond.wait(remaining)
+
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.acquisitions += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += time.monotonic() - requested
+            if client is None:
+                # Reserve the slot before releasing the lock to build the client
+                self._all.append(None)
+
+        if client is None:
+            created = time.monotonic()
+            try:
+                client = self.factory()
+            except BaseException:
+                with self._cond:
+                    self._all.remove(None)
+                    self.in_use -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._all[self._all.index(None)] = client
+                self.create_seconds += time.monotonic() - created
+        return client
+
+    def create_detached(self) -> T:
+        """
+        Build a client that stays outside the checkout rotation.
+
+        For a client shared by all coroutines on one event loop, whose async
+        channel multiplexes requests. It does not count against ``size``, but
+        is reported in stats() and closed by close().
+
+        Returns:
+            A new client from ``factory``
+
+        Raises:
+            PoolClosedError: If the pool is closed
+        """
+        with self._cond:
+            if self._closed:
+                raise PoolClosedError("client pool is closed")
+        created = time.monotonic()
+        client = self.factory()
+        with self._cond:
+            self.create_seconds += time.monotonic() - created
+            closed = self._closed
+            if not closed:
+                self._detached.append(client)
+        if closed:
+            if self._close is not None:
+                self._close(client)
+            raise PoolClosedError("client pool is closed")
+        return client
+
+    def _checkin(self, client: T, busy: float) -> None:
+        with self._cond:
+            self.in_use -= 1
+            self.busy_seconds += busy
+            if self._closed:
+                closing = True
+            else:
+                closing = False
+                self._idle.append(client)
+                self._cond.notify()
+        if closing and self._close is not None:
+            self._close(client)
+
+    def stats(self) -> dict:
+        """
+        Report pool utilization.
+
+        Returns:
+            dict: Size, created and detached clients, current and peak
+            checkouts, wait counts and times, and utilization (busy time
+            over capacity time)
+        """
+        with self._cond:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                "size": self.size,
+                "created": len(self._all),
+                "detached": len(self._detached),
+                "idle": len(self._idle),
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "acquisitions": self.acquisitions,
+                "waits": self.waits,
+                "wait_seconds": self.wait_seconds,
+                "create_seconds": self.create_seconds,
+                "utilization": self.busy_seconds / (self.size * elapsed),
+            }
+
+    def close(self) -> None:
+        """Close idle and detached clients now and checked-out clients when they are returned."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = self._idle + self._detached, []
+            self._detached = []
+            self._cond.notify_all()
+        if self._close is not None:
+            for client in idle:
+                self._close(client)
+
+    def __enter__(self) -> "ClientPool[T]":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
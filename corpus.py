@@ -0,0 +1,370 @@
+"""
+Compact, columnar in-memory corpus of transcripts, chunks and statements.
+
+A list of Transcript objects keeps every chunk's text a second time next to
+the transcript text, plus a Pydantic object and a metadata dict per chunk.
+CompactCorpus stores each transcript's text once and everything else in
+NumPy columns: chunks are (transcript_idx, start, end, sentence_count) rows
+whose text is sliced from the transcript on demand, and company names and
+quarters are dictionary-encoded. Chunk and Transcript objects are only built
+when asked for.
+
+Export to Arrow/Parquet needs the optional ``pyarrow`` package; numeric
+columns are shared with Arrow without copying.
+"""
+
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from data_model import RawStatement, StatementType, TemporalType, raw_statements_from_rows
+from gemini_chunker import Chunk, Transcript
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+_STATEMENT_TYPES = list(StatementType)
+_TEMPORAL_TYPES = list(TemporalType)
+
+class _Column:
+    """Growable NumPy column with amortized O(1) appends."""
+
+    def __init__(self, dtype: Any, values: Optional[np.ndarray] = None):
+        self._data = np.asarray(values, dtype=dtype) if values is not None else np.empty(16, dtype=dtype)
+        self._size = len(values) if values is not None else 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, values: Any) -> None:
+        values = np.asarray(values, dtype=self._data.dtype)
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    def append(self, value: Any) -> None:
+        self.extend([value])
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self._size]
+
+class _Dictionary:
+    """Dictionary encoding of a low-cardinality string column; None is code -1."""
+
+    def __init__(self, labels: Optional[list] = None):
+        self.labels: list[str] = list(labels or [])
+        self._codes = {label: i for i, label in enumerate(self.labels)}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.labels)
+            self.labels.append(value)
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        return None if code < 0 else self.labels[code]
+
+class CompactCorpus:
+    """
+    Columnar store for chunked transcripts and their extracted statements.
+
+    Transcripts and chunks are addressed by position. Chunks of transcript i
+    are the contiguous range chunk_range(i).
+    """
+
+    def __init__(self):
+        self.texts: list[str] = []
+        self._ids = _Column("V16")  # raw UUID bytes; "S16" would strip trailing NULs
+        self._company = _Column(np.int32)
+        self._dates = _Column("datetime64[us]")
+        self._quarter = _Column(np.int32)
+        self._first_chunk = _Column(np.int64)
+        self.companies = _Dictionary()
+        self.quarters = _Dictionary()
+
+        self._chunk_transcript = _Column(np.int32)
+        self._chunk_start = _Column(np.int64)
+        self._chunk_end = _Column(np.int64)
+        self._chunk_sentences = _Column(np.int32)
+
+        self.statement_texts: list[str] = []
+        self._statement_chunk = _Column(np.int64)
+        self._statement_type = _Column(np.int8)
+        self._temporal_type = _Column(np.int8)
+
+    # Columns are exposed as NumPy views sized to the stored rows
+    @property
+    def chunk_transcript_idx(self) -> np.ndarray:
+        return self._chunk_transcript.values
+
+    @property
+    def chunk_start(self) -> np.ndarray:
+        return self._chunk_start.values
+
+    @property
+    def chunk_end(self) -> np.ndarray:
+        return self._chunk_end.values
+
+    @property
+    def chunk_sentence_count(self) -> np.ndarray:
+        return self._chunk_sentences.values
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates.values
+
+    @property
+    def company_codes(self) -> np.ndarray:
+        return self._company.values
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self._chunk_start)
+
+    @property
+    def num_statements(self) -> int:
+        return len(self.statement_texts)
+
+    def add_transcript(self, transcript: Transcript) -> int:
+        """
+        Append a chunked transcript. Chunk text is not stored, only its offsets.
+
+        Args:
+            transcript (Transcript): Transcript whose chunks carry start_index,
+                end_index and sentence_count metadata
+
+        Returns:
+            int: Position of the transcript in the corpus
+        """
+        index = len(self.texts)
+        chunks = transcript.chunks or []
+        self.texts.append(transcript.text)
+        self._ids.append(transcript.id.bytes)
+        self._company.append(self.companies.encode(transcript.company))
+        self._dates.append(np.datetime64(transcript.date, "us"))
+        self._quarter.append(self.quarters.encode(transcript.quarter))
+        self._first_chunk.append(self.num_chunks)
+
+        self._chunk_transcript.extend([index] * len(chunks))
+        self._chunk_start.extend([chunk.metadata["start_index"] for chunk in chunks])
+        self._chunk_end.extend([chunk.metadata["end_index"] for chunk in chunks])
+        self._chunk_sentences.extend([chunk.metadata.get("sentence_count", 0) for chunk in chunks])
+        return index
+
+    @classmethod
+    def from_transcripts(cls, transcripts: Iterable[Transcript]) -> "CompactCorpus":
+        """
+        Build a corpus from any iterable of transcripts, e.g. the lazy
+        GeminiChunker.iter_transcripts_and_chunks, without holding them all.
+        """
+        corpus = cls()
+        for transcript in transcripts:
+            corpus.add_transcript(transcript)
+        return corpus
+
+    def chunk_range(self, transcript_idx: int) -> range:
+        """Positions of a transcript's chunks."""
+        first = self._first_chunk.values
+        start = int(first[transcript_idx])
+        end = int(first[transcript_idx + 1]) if transcript_idx + 1 < len(first) else self.num_chunks
+        return range(start, end)
+
+    def chunk_text(self, chunk_idx: int) -> str:
+        """Text of one chunk, sliced from its transcript."""
+        transcript = self.texts[self._chunk_transcript.values[chunk_idx]]
+        return transcript[self._chunk_start.values[chunk_idx]:self._chunk_end.values[chunk_idx]]
+
+    def chunk(self, chunk_idx: int) -> Chunk:
+        """Materialize one chunk as a Chunk."""
+        return Chunk(
+            text=self.chunk_text(chunk_idx),
+            metadata={
+                "start_index": int(self._chunk_start.values[chunk_idx]),
+                "end_index": int(self._chunk_end.values[chunk_idx]),
+                "sentence_count": int(self._chunk_sentences.values[chunk_idx]),
+            },
+        )
+
+    def iter_chunks(self) -> Iterator[Chunk]:
+        """Materialize chunks one at a time, in corpus order."""
+        for i in range(self.num_chunks):
+            yield self.chunk(i)
+
+    def transcript(self, transcript_idx: int, with_chunks: bool = True) -> Transcript:
+        """Materialize one transcript, optionally with its chunks."""
+        return Transcript(
+            id=uuid.UUID(bytes=self._ids.values[transcript_idx].tobytes()),
+            text=self.texts[transcript_idx],
+            company=self.companies.decode(int(self._company.values[transcript_idx])),
+            date=self._dates.values[transcript_idx].astype(datetime),
+            quarter=self.quarters.decode(int(self._quarter.values[transcript_idx])),
+            chunks=[self.chunk(i) for i in self.chunk_range(transcript_idx)] if with_chunks else None,
+        )
+
+    def __getitem__(self, transcript_idx: int) -> Transcript:
+        return self.transcript(transcript_idx)
+
+    def __iter__(self) -> Iterator[Transcript]:
+        for i in range(len(self)):
+            yield self.transcript(i)
+
+    def add_statements(self, chunk_idx: int, statements: Iterable[RawStatement]) -> None:
+        """
+        Append the statements extracted from one chunk.
+
+        Args:
+            chunk_idx (int): Position of the chunk
+            statements (Iterable[RawStatement]): Its statements
+        """
+        statements = list(statements)
+        self.statement_texts.extend(s.statement for s in statements)
+        self._statement_chunk.extend([chunk_idx] * len(statements))
+        self._statement_type.extend([_STATEMENT_TYPES.index(s.statement_type) for s in statements])
+        self._temporal_type.extend([_TEMPORAL_TYPES.index(s.temporal_type) for s in statements])
+
+    def statements_of(self, chunk_idx: int) -> list[RawStatement]:
+        """Materialize the statements of one chunk."""
+        rows = np.flatnonzero(self._statement_chunk.values == chunk_idx)
+        statement_types, temporal_types = self._statement_type.values, self._temporal_type.values
+        return raw_statements_from_rows(
+            (self.statement_texts[i], _STATEMENT_TYPES[statement_types[i]], _TEMPORAL_TYPES[temporal_types[i]])
+            for i in rows
+        )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the corpus, in bytes."""
+        columns = (
+            self._ids, self._company, self._dates, self._quarter, self._first_chunk,
+            self._chunk_transcript, self._chunk_start, self._chunk_end, self._chunk_sentences,
+            self._statement_chunk, self._statement_type, self._temporal_type,
+        )
+        strings = sum(len(text.encode("utf-8")) for text in self.texts)
+        strings += sum(len(text.encode("utf-8")) for text in self.statement_texts)
+        return strings + sum(column.values.nbytes for column in columns)
+
+    def to_arrow(self) -> dict:
+        """
+        Export the corpus as Arrow tables. Requires pyarrow.
+
+        Numeric columns are handed to Arrow without copying.
+
+        Returns:
+            dict: "transcripts", "chunks" and "statements" pyarrow.Tables
+        """
+        _require_pyarrow()
+        transcripts = pa.table({
+            "id": pa.FixedSizeBinaryArray.from_buffers(
+                pa.binary(16), len(self), [None, pa.py_buffer(self._ids.values)]
+            ),
+            "text": pa.array(self.texts, type=pa.large_string()),
+            "company": pa.DictionaryArray.from_arrays(
+                pa.array(self._company.values), pa.array(self.companies.labels, type=pa.string())
+            ),
+            "date": pa.array(self._dates.values),
+            "quarter": pa.DictionaryArray.from_arrays(
+                pa.array(self._quarter.values, mask=self._quarter.values < 0),
+                pa.array(self.quarters.labels, type=pa.string()),
+            ),
+        })
+        chunks = pa.table({
+            "transcript_idx": pa.array(self._chunk_transcript.values),
+            "start_index": pa.array(self._chunk_start.values),
+            "end_index": pa.array(self._chunk_end.values),
+            "sentence_count": pa.array(self._chunk_sentences.values),
+        })
+        statements = pa.table({
+            "chunk_idx": pa.array(self._statement_chunk.values),
+            "statement": pa.array(self.statement_texts, type=pa.large_string()),
+            "statement_type": pa.array(self._statement_type.values),
+            "temporal_type": pa.array(self._temporal_type.values),
+        })
+        return {"transcripts": transcripts, "chunks": chunks, "statements": statements}
+
+    @classmethod
+    def from_arrow(cls, transcripts: Any, chunks: Any, statements: Any = None) -> "CompactCorpus":
+        """
+        Rebuild a corpus from tables produced by to_arrow(). Requires pyarrow.
+
+        Numeric columns are viewed without copying where Arrow's layout
+        allows; text columns become Python strings.
+        """
+        _require_pyarrow()
+        corpus = cls()
+        corpus.texts = transcripts.column("text").to_pylist()
+        corpus._ids = _Column("V16", np.frombuffer(b"".join(transcripts.column("id").to_pylist()), dtype="V16"))
+        corpus._dates = _Column("datetime64[us]", _numpy(transcripts.column("date")).astype("datetime64[us]"))
+        for name, dictionary, column in (
+            ("company", "companies", "_company"),
+            ("quarter", "quarters", "_quarter"),
+        ):
+            encoded = transcripts.column(name).combine_chunks()
+            setattr(corpus, dictionary, _Dictionary(encoded.dictionary.to_pylist()))
+            setattr(corpus, column, _Column(np.int32, encoded.indices.fill_null(-1).to_numpy()))
+
+        for name, column in (
+            ("transcript_idx", "_chunk_transcript"),
+            ("start_index", "_chunk_start"),
+            ("end_index", "_chunk_end"),
+            ("sentence_count", "_chunk_sentences"),
+        ):
+            values = _numpy(chunks.column(name))
+            setattr(corpus, column, _Column(values.dtype, values))
+        first = np.searchsorted(corpus.chunk_transcript_idx, np.arange(len(corpus.texts)))
+        corpus._first_chunk = _Column(np.int64, first)
+
+        if statements is not None:
+            corpus.statement_texts = statements.column("statement").to_pylist()
+            for name, column in (
+                ("chunk_idx", "_statement_chunk"),
+                ("statement_type", "_statement_type"),
+                ("temporal_type", "_temporal_type"),
+            ):
+                values = _numpy(statements.column(name))
+                setattr(corpus, column, _Column(values.dtype, values))
+        return corpus
+
+    def to_parquet(self, path: str) -> None:
+        """
+        Write transcripts.parquet, chunks.parquet and statements.parquet to a directory.
+
+        Args:
+            path (str): Directory to write (created if missing)
+        """
+        os.makedirs(path, exist_ok=True)
+        for name, table in self.to_arrow().items():
+            pq.write_table(table, os.path.join(path, f"{name}.parquet"))
+
+    @classmethod
+    def read_parquet(cls, path: str) -> "CompactCorpus":
+        """Load a corpus written by to_parquet()."""
+        _require_pyarrow()
+        tables = {
+            name: pq.read_table(os.path.join(path, f"{name}.parquet"), memory_map=True)
+            for name in ("transcripts", "chunks", "statements")
+        }
+        return cls.from_arrow(**tables)
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Arrow/Parquet support requires pyarrow: pip install pyarrow")
+
+def _numpy(column: Any) -> np.ndarray:
+    # A single-chunk column without nulls converts to NumPy as a view
+    return column.combine_chunks().to_numpy(zero_copy_only=False)
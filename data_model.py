@@ -2,6 +2,11 @@
 Data model definitions for temporal labeling and episode labeling.
 """
 
+from enum import Enum
+from typing import Annotated, Iterable, Mapping
+
+from pydantic import BaseModel, BeforeValidator, TypeAdapter
+
 LABEL_DEFINITIONS: dict[str, dict[str, dict[str, str]]] = {
     "episode_labelling": {
         "FACT": dict(
@@ -121,3 +126,95 @@ def get_label_definition(label_type: str, label: str):
     if label_type in LABEL_DEFINITIONS and label in LABEL_DEFINITIONS[label_type]:
         return LABEL_DEFINITIONS[label_type][label]
     return None
+
+class TemporalType(Enum):
+    ATEMPORAL = "ATEMPORAL"
+    STATIC = "STATIC"
+    DYNAMIC = "DYNAMIC"
+
+class StatementType(Enum):
+    FACT = "FACT"
+    OPINION = "OPINION"
+    PREDICTION = "PREDICTION"
+
+# Label -> enum tables built once from LABEL_DEFINITIONS
+STATEMENT_TYPE_LOOKUP: dict[str, StatementType] = {
+    label: StatementType(label) for label in LABEL_DEFINITIONS["episode_labelling"]
+}
+TEMPORAL_TYPE_LOOKUP: dict[str, TemporalType] = {
+    label: TemporalType(label) for label in LABEL_DEFINITIONS["temporal_labelling"]
+}
+
+def _llm_label(lookup: Mapping[str, Enum], default: Enum):
+    """Before-validator for labels from the LLM: case-insensitive, None means ``default``."""
+    def parse(value):
+        if value is None:
+            return default
+        if isinstance(value, str):
+            # Unknown labels pass through and fail the enum validation
+            return lookup.get(value.strip().upper(), value)
+        return value
+    return BeforeValidator(parse)
+
+# The enums themselves stay strict; only LLM output gets these defaults
+LLMStatementType = Annotated[StatementType, _llm_label(STATEMENT_TYPE_LOOKUP, StatementType.FACT)]
+LLMTemporalType = Annotated[TemporalType, _llm_label(TEMPORAL_TYPE_LOOKUP, TemporalType.ATEMPORAL)]
+
+class RawStatement(BaseModel):
+    """
+    A labelled statement as returned by the extraction LLM.
+
+    Labels are matched case-insensitively; a missing or null statement_type
+    means FACT and a missing or null temporal_type means ATEMPORAL.
+    """
+    statement: str
+    statement_type: LLMStatementType = StatementType.FACT
+    temporal_type: LLMTemporalType = TemporalType.ATEMPORAL
+
+class RawStatementList(BaseModel):
+    statements: list[RawStatement]
+
+_RAW_STATEMENTS = TypeAdapter(list[RawStatement])
+
+def parse_raw_statements(data: str | bytes) -> list[RawStatement]:
+    """
+    Validate a whole LLM response in one pass.
+
+    Args:
+        data (str | bytes): JSON of a RawStatementList or a bare list of statements
+
+    Returns:
+        list[RawStatement]: Validated statements
+
+    Raises:
+        pydantic.ValidationError: If the JSON does not match the schema
+    """
+    if data.lstrip()[:1] in ("[", b"["):
+        return _RAW_STATEMENTS.validate_json(data)
+    return RawStatementList.model_validate_json(data).statements
+
+_RAW_STATEMENT_FIELDS = tuple(RawStatement.model_fields)
+
+def raw_statements_from_rows(rows: Iterable) -> list[RawStatement]:
+    """
+    Build RawStatements from stored rows in one validation pass.
+
+    Validating the whole list at once is faster than model_construct per
+    row, and the instances are ordinary validated models.
+
+    Args:
+        rows (Iterable): Mappings with statement, statement_type and
+            temporal_type keys, or (statement, statement_type, temporal_type)
+            tuples, e.g. rows of the statements table
+
+    Returns:
+        list[RawStatement]: Validated statements
+
+    Raises:
+        pydantic.ValidationError: If a row does not match the schema
+    """
+    return _RAW_STATEMENTS.validate_python([
+        {field: row[field] for field in _RAW_STATEMENT_FIELDS} if isinstance(row, Mapping)
+        else dict(zip(_RAW_STATEMENT_FIELDS, row))
+        for row in rows
+    ])
@@ -1,8 +1,55 @@
 import sqlite3
 import os
-from typing import Optional, Union
+import logging
+import re
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from enum import Enum
+from itertools import islice
+from typing import Any, Iterable, Mapping, Optional, Union
 
-def make_connection(memory: bool = False, refresh: bool = False, db_path: str = "cookbook.db") -> sqlite3.Connection:
+logger = logging.getLogger(__name__)
+
+# PRAGMA settings applied by make_connection(profile=...). "performance"
+# lets dashboards read while the ingestion pipeline writes: WAL readers never
+# block the writer, NORMAL sync is crash-safe in WAL mode with one fsync per
+# checkpoint instead of per commit, and busy_timeout waits out short write
+# locks instead of failing with "database is locked".
+CONNECTION_PROFILES: dict = {
+    "default": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64 * 1024,  # KiB when negative: 64 MiB page cache
+        "mmap_size": 256 * 1024 * 1024,  # memory-map the first 256 MiB for reads
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,  # milliseconds
+    },
+}
+
+def _connect(
+    database: str,
+    profile: Optional[Union[str, Mapping[str, Any]]] = None,
+    check_same_thread: bool = True,
+) -> sqlite3.Connection:
+    pragmas = CONNECTION_PROFILES[profile] if isinstance(profile, str) else (profile or {})
+    conn = sqlite3.connect(database, check_same_thread=check_same_thread)
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    
+    # Enable foreign keys
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+def make_connection(
+    memory: bool = False,
+    refresh: bool = False,
+    db_path: str = "cookbook.db",
+    profile: Optional[Union[str, Mapping[str, Any]]] = None,
+    check_same_thread: bool = True,
+) -> sqlite3.Connection:
     """
     Create a SQLite database connection.
     
@@ -10,28 +57,110 @@ def make_connection(memory: bool = False, refresh: bool = False, db_path: str =
         memory (bool): If True, use in-memory database. If False, use file-based database.
         refresh (bool): If True, remove existing database file before creating new connection.
         db_path (str): Path to the database file (ignored if memory=True).
+        profile (str or dict, optional): Name of a CONNECTION_PROFILES entry
+            (e.g. "performance") or a dict of PRAGMA settings to apply.
+        check_same_thread (bool): If False, the connection may be used from
+            other threads; the caller must then serialize access to it.
     
     Returns:
         sqlite3.Connection: SQLite database connection
     """
     if memory:
         # In-memory database
-        conn = sqlite3.connect(":memory:")
+        conn = _connect(":memory:", profile, check_same_thread)
         print("Created in-memory SQLite database")
     else:
         # File-based database
         if refresh and os.path.exists(db_path):
             os.remove(db_path)
+            # WAL mode leaves these beside the database file
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
             print(f"Removed existing database: {db_path}")
         
-        conn = sqlite3.connect(db_path)
+        conn = _connect(db_path, profile, check_same_thread)
         print(f"Connected to SQLite database: {db_path}")
     
-    # Enable foreign keys
-    conn.execute("PRAGMA foreign_keys = ON")
-    
     return conn
 
+class ConnectionPool:
+    """
+    Small pool of SQLite connections for worker threads.
+    
+    Each connection is handed to one thread at a time. With the default
+    "performance" profile the database runs in WAL mode, so readers in the
+    pool do not block, and are not blocked by, a concurrent writer.
+    
+    Args:
+        db_path (str): Path to the database file
+        size (int): Maximum number of open connections
+        profile (str or dict): Profile applied to every connection, see make_connection
+    """
+    
+    def __init__(self, db_path: str = "cookbook.db", size: int = 4, profile: Optional[Union[str, Mapping[str, Any]]] = "performance"):
+        self.db_path = db_path
+        self.size = size
+        self.profile = profile
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """
+        Borrow a connection for the duration of a ``with`` block.
+        
+        Args:
+            timeout (float, optional): Seconds to wait for a free connection
+        
+        Yields:
+            sqlite3.Connection: A connection no other thread is using
+        """
+        conn = self._checkout(timeout)
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+    
+    def _checkout(self, timeout: Optional[float]) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return _connect(self.db_path, self.profile, check_same_thread=False)
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"no database connection free after {timeout}s") from None
+    
+    def close(self) -> None:
+        """Close every idle connection and refuse further checkouts."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+    
+    def __enter__(self) -> "ConnectionPool":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 def create_tables(conn: sqlite3.Connection) -> None:
     """
     Create basic tables for the cookbook application.
@@ -81,9 +210,163 @@ def create_tables(conn: sqlite3.Connection) -> None:
         )
     """)
     
+    # Create chunks table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chunks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            transcript_id INTEGER NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            start_index INTEGER,
+            end_index INTEGER,
+            sentence_count INTEGER,
+            text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (transcript_id) REFERENCES transcripts (id)
+        )
+    """)
+    
+    # Create statements table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS statements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chunk_id INTEGER,
+            transcript_id INTEGER,
+            company_id INTEGER,
+            statement TEXT NOT NULL,
+            statement_type TEXT,
+            temporal_type TEXT,
+            valid_at TEXT,
+            invalid_at TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (chunk_id) REFERENCES chunks (id),
+            FOREIGN KEY (transcript_id) REFERENCES transcripts (id),
+            FOREIGN KEY (company_id) REFERENCES companies (id)
+        )
+    """)
+    
+    # Secondary indexes. Transcript listings filter by company and sort by
+    # date; temporal queries filter statements by company, temporal type and
+    # validity interval. idx_statements_company_covering also holds every
+    # column get_statements_valid_at returns (id is the rowid), so those
+    # lookups never touch the table, at the cost of storing statement text
+    # twice. It replaces the earlier, non-covering idx_statements_company_temporal.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_company_date ON transcripts (company_id, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_date ON transcripts (date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_transcript ON chunks (transcript_id, chunk_index)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_statements_chunk ON statements (chunk_id)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_statements_temporal ON statements (temporal_type, valid_at, invalid_at)"
+    )
+    cursor.execute("DROP INDEX IF EXISTS idx_statements_company_temporal")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_statements_company_covering "
+        "ON statements (company_id, temporal_type, valid_at, invalid_at, statement_type, chunk_id, transcript_id, statement)"
+    )
+    
+    # Create entities, entity_aliases and triplets tables: canonical entities
+    # from entity_resolution, every surface form resolved to one, and the
+    # (subject, predicate, object) structure of statements
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS entities (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            normalized_name TEXT NOT NULL UNIQUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS entity_aliases (
+            alias TEXT PRIMARY KEY,
+            entity_id INTEGER NOT NULL,
+            FOREIGN KEY (entity_id) REFERENCES entities (id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS triplets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            statement_id INTEGER,
+            subject_id INTEGER NOT NULL,
+            predicate TEXT NOT NULL,
+            object_id INTEGER,
+            value TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (statement_id) REFERENCES statements (id),
+            FOREIGN KEY (subject_id) REFERENCES entities (id),
+            FOREIGN KEY (object_id) REFERENCES entities (id)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_aliases_entity ON entity_aliases (entity_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_triplets_subject ON triplets (subject_id, predicate)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_triplets_object ON triplets (object_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_triplets_statement ON triplets (statement_id)")
+    
+    _create_search_index(cursor)
+    
+    # Create ingestion_ledger table: one row per processed transcript, keyed by
+    # its content-derived ID, so re-runs can skip work that is already done
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_ledger (
+            transcript_id TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            company TEXT,
+            date TEXT,
+            status TEXT NOT NULL,
+            chunk_count INTEGER,
+            error TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
     conn.commit()
     print("Database tables created successfully")
 
+def _create_search_index(cursor: sqlite3.Cursor) -> None:
+    """
+    Create FTS5 indexes over transcript and chunk text, kept in sync by triggers.
+    
+    Both are external-content tables, so the text is stored once in
+    transcripts/chunks and the index only holds the inverted lists.
+    """
+    try:
+        for table, column in (("transcripts", "transcript_text"), ("chunks", "text")):
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                    {column}, content='{table}', content_rowid='id', tokenize='porter unicode61'
+                )
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {table}_fts (rowid, {column}) VALUES (new.id, new.{column});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {table}_fts ({table}_fts, rowid, {column}) VALUES ('delete', old.id, old.{column});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF {column} ON {table} BEGIN
+                    INSERT INTO {table}_fts ({table}_fts, rowid, {column}) VALUES ('delete', old.id, old.{column});
+                    INSERT INTO {table}_fts (rowid, {column}) VALUES (new.id, new.{column});
+                END
+            """)
+    except sqlite3.OperationalError as e:
+        logger.warning("Full-text search unavailable (SQLite built without FTS5?): %s", e)
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    """
+    Rebuild the full-text indexes from the transcripts and chunks tables.
+    
+    Only needed for rows written before the indexes existed; the triggers
+    keep them in sync afterwards.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+    """
+    conn.execute("INSERT INTO transcripts_fts (transcripts_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO chunks_fts (chunks_fts) VALUES ('rebuild')")
+    conn.commit()
+
 def insert_company(conn: sqlite3.Connection, name: str, ticker: Optional[str] = None, sector: Optional[str] = None) -> int:
     """
     Insert a new company into the database.
@@ -105,7 +388,7 @@ def insert_company(conn: sqlite3.Connection, name: str, ticker: Optional[str] =
     
     company_id = cursor.lastrowid
     conn.commit()
-    print(f"Inserted company: {name} (ID: {company_id})")
+    logger.debug("Inserted company: %s (ID: %s)", name, company_id)
     return company_id
 
 def insert_transcript(conn: sqlite3.Connection, company_id: int, date: str, transcript_text: str, sentiment_score: Optional[float] = None) -> int:
@@ -130,9 +413,329 @@ def insert_transcript(conn: sqlite3.Connection, company_id: int, date: str, tran
     
     transcript_id = cursor.lastrowid
     conn.commit()
-    print(f"Inserted transcript for company ID {company_id} on {date}")
+    logger.debug("Inserted transcript for company ID %s on %s", company_id, date)
     return transcript_id
 
+def as_timestamp(value: Any) -> str:
+    """
+    Format a date or time the way the statements and transcripts tables store it.
+
+    Values are ISO-8601 text with a space between date and time, the format of
+    SQLite's datetime() and CURRENT_TIMESTAMP, so they sort chronologically
+    and compare correctly as strings. Every write and range query goes through
+    this function; ISO strings with a "T" separator are normalized too.
+
+    Args:
+        value (str, date or datetime): Point in time
+
+    Returns:
+        str: "YYYY-MM-DD" for dates, "YYYY-MM-DD HH:MM:SS[.ffffff][+HH:MM]" for times
+    """
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    value = str(value)
+    if len(value) > 10 and value[10] == "T" and value[4] == "-" and value[7] == "-":
+        return f"{value[:10]} {value[11:]}"
+    return value
+
+def _batches(rows: Iterable, batch_size: int):
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+def _column_value(value: Any) -> Any:
+    # Store enums (StatementType, TemporalType, ...) by their value, and dates
+    # in the format range queries compare against
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return as_timestamp(value)
+    return value
+
+def _bulk_insert(
+    conn: sqlite3.Connection, table: str, columns: tuple, rows: Iterable[Mapping], batch_size: int, commit: bool = True
+) -> list:
+    """
+    Insert rows with executemany inside one transaction and return their IDs.
+    
+    Every table inserted into here uses AUTOINCREMENT and SQLite allows a
+    single writer, so the rows of one executemany call get consecutive IDs
+    ending at last_insert_rowid(). With commit=False the transaction is
+    left open for the caller to commit or roll back.
+    """
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    ids = []
+    try:
+        for batch in _batches(rows, batch_size):
+            conn.executemany(sql, [tuple(_column_value(row.get(c)) for c in columns) for row in batch])
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids.extend(range(last_id - len(batch) + 1, last_id + 1))
+        if commit:
+            conn.commit()
+    except Exception:
+        if commit:
+            conn.rollback()
+        raise
+    logger.debug("Inserted %d rows into %s", len(ids), table)
+    return ids
+
+def insert_companies_bulk(
+    conn: sqlite3.Connection,
+    companies: Iterable[Mapping],
+    batch_size: int = 1000,
+    upsert: bool = True,
+) -> list:
+    """
+    Insert many companies in a single transaction.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        companies (Iterable[Mapping]): Rows with "name" and optional "ticker" and "sector"
+        batch_size (int): Rows sent per executemany call
+        upsert (bool): If True, an existing company with the same name is kept
+            (its ticker/sector filled in where given) instead of raising
+            sqlite3.IntegrityError
+    
+    Returns:
+        list: Company ID for each input row, in input order
+    """
+    sql = "INSERT INTO companies (name, ticker, sector) VALUES (?, ?, ?)"
+    if upsert:
+        sql += """
+            ON CONFLICT (name) DO UPDATE SET
+                ticker = COALESCE(excluded.ticker, companies.ticker),
+                sector = COALESCE(excluded.sector, companies.sector)
+        """
+    
+    ids = []
+    try:
+        for batch in _batches(companies, batch_size):
+            conn.executemany(sql, [(c["name"], c.get("ticker"), c.get("sector")) for c in batch])
+            # Upserted rows keep their existing IDs, so look every name up
+            names = list(dict.fromkeys(c["name"] for c in batch))
+            id_by_name = {}
+            for i in range(0, len(names), 500):
+                chunk = names[i:i + 500]
+                id_by_name.update(conn.execute(
+                    f"SELECT name, id FROM companies WHERE name IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            ids.extend(id_by_name[c["name"]] for c in batch)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    logger.debug("Inserted or updated %d companies", len(ids))
+    return ids
+
+def insert_transcripts_bulk(conn: sqlite3.Connection, transcripts: Iterable[Mapping], batch_size: int = 1000) -> list:
+    """
+    Insert many transcripts in a single transaction.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        transcripts (Iterable[Mapping]): Rows with "company_id", "date",
+            "transcript_text" and optional "sentiment_score"
+        batch_size (int): Rows sent per executemany call
+    
+    Returns:
+        list: Transcript ID for each input row, in input order
+    """
+    return _bulk_insert(
+        conn, "transcripts", ("company_id", "date", "transcript_text", "sentiment_score"), transcripts, batch_size
+    )
+
+def insert_chunks_bulk(conn: sqlite3.Connection, chunks: Iterable[Mapping], batch_size: int = 5000) -> list:
+    """
+    Insert many chunks in a single transaction.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        chunks (Iterable[Mapping]): Rows with "transcript_id", "chunk_index",
+            "start_index", "end_index", "sentence_count" and "text"
+        batch_size (int): Rows sent per executemany call
+    
+    Returns:
+        list: Chunk ID for each input row, in input order
+    """
+    return _bulk_insert(
+        conn,
+        "chunks",
+        ("transcript_id", "chunk_index", "start_index", "end_index", "sentence_count", "text"),
+        chunks,
+        batch_size,
+    )
+
+def insert_statements_bulk(conn: sqlite3.Connection, statements: Iterable[Mapping], batch_size: int = 5000) -> list:
+    """
+    Insert many extracted statements in a single transaction.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        statements (Iterable[Mapping]): Rows with "statement" and optional
+            "chunk_id", "transcript_id", "company_id", "statement_type",
+            "temporal_type", "valid_at" and "invalid_at". Enum labels are
+            stored by value.
+        batch_size (int): Rows sent per executemany call
+    
+    Returns:
+        list: Statement ID for each input row, in input order
+    """
+    return _bulk_insert(
+        conn,
+        "statements",
+        (
+            "chunk_id", "transcript_id", "company_id", "statement",
+            "statement_type", "temporal_type", "valid_at", "invalid_at",
+        ),
+        statements,
+        batch_size,
+    )
+
+def update_statements_invalid_at(
+    conn: sqlite3.Connection,
+    updates: Union[Mapping[int, Any], Iterable[tuple]],
+    batch_size: int = 5000,
+) -> int:
+    """
+    Set invalid_at on many statements in a single transaction.
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        updates (Mapping or Iterable[tuple]): invalid_at per statement ID, as a
+            mapping or (statement_id, invalid_at) pairs; None reopens a statement
+        batch_size (int): Rows sent per executemany call
+
+    Returns:
+        int: Number of statements updated
+    """
+    pairs = updates.items() if isinstance(updates, Mapping) else updates
+    sql = "UPDATE statements SET invalid_at = ? WHERE id = ?"
+    updated = 0
+    try:
+        for batch in _batches(pairs, batch_size):
+            cursor = conn.executemany(
+                sql, [(None if invalid_at is None else as_timestamp(invalid_at), statement_id) for statement_id, invalid_at in batch]
+            )
+            updated += cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    logger.debug("Updated invalid_at of %d statements", updated)
+    return updated
+
+def save_entities(
+    conn: sqlite3.Connection,
+    entities: Iterable[Mapping],
+    aliases: Iterable[Mapping] = (),
+    batch_size: int = 5000,
+    commit: bool = True,
+) -> None:
+    """
+    Store resolved entities and their aliases in a single transaction.
+    
+    Entities keep the IDs assigned by the resolver; rows that already
+    exist are left unchanged, and an alias is repointed to its new entity.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        entities (Iterable[Mapping]): Rows with "id", "name" and "normalized_name"
+        aliases (Iterable[Mapping]): Rows with "alias" and "entity_id"
+        batch_size (int): Rows sent per executemany call
+        commit (bool): Commit when done; False leaves the transaction open
+            so the caller can commit it together with other writes
+    """
+    try:
+        for batch in _batches(entities, batch_size):
+            conn.executemany(
+                "INSERT OR IGNORE INTO entities (id, name, normalized_name) VALUES (?, ?, ?)",
+                [(row["id"], row["name"], row["normalized_name"]) for row in batch],
+            )
+        for batch in _batches(aliases, batch_size):
+            conn.executemany(
+                "INSERT OR REPLACE INTO entity_aliases (alias, entity_id) VALUES (?, ?)",
+                [(row["alias"], row["entity_id"]) for row in batch],
+            )
+        if commit:
+            conn.commit()
+    except Exception:
+        if commit:
+            conn.rollback()
+        raise
+
+def get_entities(conn: sqlite3.Connection) -> list:
+    """
+    Get all resolved entities with their aliases.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+    
+    Returns:
+        list: Dictionaries with id, name, normalized_name and a list of aliases
+    """
+    entities = {
+        row[0]: {"id": row[0], "name": row[1], "normalized_name": row[2], "aliases": []}
+        for row in conn.execute("SELECT id, name, normalized_name FROM entities ORDER BY id")
+    }
+    for alias, entity_id in conn.execute("SELECT alias, entity_id FROM entity_aliases"):
+        if entity_id in entities:
+            entities[entity_id]["aliases"].append(alias)
+    return list(entities.values())
+
+def insert_triplets_bulk(
+    conn: sqlite3.Connection, triplets: Iterable[Mapping], batch_size: int = 5000, commit: bool = True
+) -> list:
+    """
+    Insert many (subject, predicate, object) triplets in a single transaction.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        triplets (Iterable[Mapping]): Rows with "subject_id" and "predicate",
+            and optional "statement_id", "object_id" (an entity) and "value"
+            (a literal object)
+        batch_size (int): Rows sent per executemany call
+        commit (bool): Commit when done; False leaves the transaction open
+            so the caller can commit it together with other writes
+    
+    Returns:
+        list: Triplet ID for each input row, in input order
+    """
+    return _bulk_insert(
+        conn,
+        "triplets",
+        ("statement_id", "subject_id", "predicate", "object_id", "value"),
+        triplets,
+        batch_size,
+        commit,
+    )
+
+def iter_temporal_edges(conn: sqlite3.Connection, batch_size: int = 100_000):
+    """
+    Stream entity-to-entity triplets with the validity interval of their statement.
+
+    Triplets with a literal object (no object_id) are skipped.
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        batch_size (int): Rows fetched per batch
+
+    Yields:
+        list: Batches of (triplet_id, subject_id, object_id, predicate,
+        valid_at, invalid_at) tuples
+    """
+    cursor = conn.execute("""
+        SELECT tr.id, tr.subject_id, tr.object_id, tr.predicate, s.valid_at, s.invalid_at
+        FROM triplets tr LEFT JOIN statements s ON s.id = tr.statement_id
+        WHERE tr.object_id IS NOT NULL
+    """)
+    try:
+        while batch := cursor.fetchmany(batch_size):
+            yield batch
+    finally:
+        cursor.close()
+
 def get_companies(conn: sqlite3.Connection) -> list:
     """
     Get all companies from the database.
@@ -189,4 +792,408 @@ def get_transcripts(conn: sqlite3.Connection, company_id: Optional[int] = None)
     for row in cursor.fetchall():
         transcripts.append(dict(zip(columns, row)))
     
-    return transcripts 
\ No newline at end of file
+    return transcripts 
+
+COMPANY_COLUMNS = ("id", "name", "ticker", "sector", "created_at")
+TRANSCRIPT_COLUMNS = ("id", "company_id", "date", "transcript_text", "sentiment_score", "created_at", "company_name")
+# Everything except the transcript text, for listings that only need metadata
+TRANSCRIPT_METADATA_COLUMNS = ("id", "company_id", "company_name", "date", "sentiment_score", "created_at")
+
+def _projection(columns: Optional[Iterable[str]], allowed: tuple, required: tuple = ()) -> list:
+    columns = list(columns) if columns is not None else list(allowed)
+    unknown = [c for c in columns if c not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+    return columns + [c for c in required if c not in columns]
+
+def _stream_rows(cursor: sqlite3.Cursor, batch_size: int, row_factory: str):
+    """Yield rows from cursor in fetchmany batches as dicts, tuples or sqlite3.Row objects."""
+    if row_factory == "row":
+        cursor.row_factory = sqlite3.Row
+    elif row_factory not in ("dict", "tuple"):
+        raise ValueError(f"row_factory must be 'dict', 'tuple' or 'row', not {row_factory!r}")
+    names = [description[0] for description in cursor.description]
+    
+    while rows := cursor.fetchmany(batch_size):
+        if row_factory == "dict":
+            for row in rows:
+                yield dict(zip(names, row))
+        else:
+            yield from rows
+
+def iter_companies(
+    conn: sqlite3.Connection,
+    columns: Optional[Iterable[str]] = None,
+    batch_size: int = 500,
+    row_factory: str = "dict",
+):
+    """
+    Stream companies ordered by name without loading them all at once.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        columns (Iterable[str], optional): Columns to select, from COMPANY_COLUMNS
+        batch_size (int): Rows fetched from SQLite per fetchmany call
+        row_factory (str): "dict", "tuple" (cheapest) or "row" (sqlite3.Row)
+    
+    Yields:
+        One company per row in the requested form
+    """
+    projection = _projection(columns, COMPANY_COLUMNS)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(projection)} FROM companies ORDER BY name")
+    yield from _stream_rows(cursor, batch_size, row_factory)
+
+def _transcripts_query(company_id: Optional[int], projection: list, after: Optional[tuple], limit: Optional[int]) -> tuple:
+    select = ", ".join("c.name AS company_name" if c == "company_name" else f"t.{c}" for c in projection)
+    where, params = [], []
+    if company_id:
+        where.append("t.company_id = ?")
+        params.append(company_id)
+    if after is not None:
+        # Keyset pagination: resume strictly after the last (date, id) seen
+        where.append("(t.date, t.id) < (?, ?)")
+        params.extend(after)
+    sql = f"""
+        SELECT {select}
+        FROM transcripts t
+        JOIN companies c ON t.company_id = c.id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY t.date DESC, t.id DESC
+    """
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, params
+
+def iter_transcripts(
+    conn: sqlite3.Connection,
+    company_id: Optional[int] = None,
+    columns: Optional[Iterable[str]] = None,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+    batch_size: int = 500,
+    row_factory: str = "dict",
+):
+    """
+    Stream transcripts newest first, in constant memory.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        company_id (int, optional): Filter by company ID
+        columns (Iterable[str], optional): Columns to select, from
+            TRANSCRIPT_COLUMNS; TRANSCRIPT_METADATA_COLUMNS skips the text
+        after (tuple, optional): (date, id) of the last row already seen
+        limit (int, optional): Maximum number of rows
+        batch_size (int): Rows fetched from SQLite per fetchmany call
+        row_factory (str): "dict", "tuple" (cheapest) or "row" (sqlite3.Row)
+    
+    Yields:
+        One transcript per row in the requested form
+    """
+    projection = _projection(columns, TRANSCRIPT_COLUMNS)
+    sql, params = _transcripts_query(company_id, projection, after, limit)
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    yield from _stream_rows(cursor, batch_size, row_factory)
+
+def get_transcripts_page(
+    conn: sqlite3.Connection,
+    company_id: Optional[int] = None,
+    columns: Optional[Iterable[str]] = None,
+    after: Optional[tuple] = None,
+    page_size: int = 100,
+    row_factory: str = "dict",
+) -> tuple:
+    """
+    Get one page of transcripts, newest first, using keyset pagination.
+    
+    Unlike OFFSET paging, each page costs the same however deep into the
+    corpus it is. "date" and "id" are always selected because they form the
+    page cursor.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        company_id (int, optional): Filter by company ID
+        columns (Iterable[str], optional): Columns to select, from TRANSCRIPT_COLUMNS
+        after (tuple, optional): Cursor returned with the previous page
+        page_size (int): Maximum number of rows in the page
+        row_factory (str): "dict", "tuple" or "row"
+    
+    Returns:
+        tuple: (rows, next_cursor), where next_cursor is None on the last page
+    """
+    projection = _projection(columns, TRANSCRIPT_COLUMNS, required=("date", "id"))
+    sql, params = _transcripts_query(company_id, projection, after, page_size)
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    rows = list(_stream_rows(cursor, page_size, row_factory))
+    
+    if len(rows) < page_size:
+        return rows, None
+    last = rows[-1]
+    if row_factory == "tuple":
+        return rows, (last[projection.index("date")], last[projection.index("id")])
+    return rows, (last["date"], last["id"])
+
+def _add_date_range(where: list, params: list, column: str, date_range: Optional[tuple]) -> None:
+    # Inclusive (start, end) bounds; either end may be None
+    if date_range is None:
+        return
+    start, end = date_range
+    if start is not None:
+        where.append(f"{column} >= ?")
+        params.append(as_timestamp(start))
+    if end is not None:
+        where.append(f"{column} <= ?")
+        params.append(as_timestamp(end))
+
+def get_chunk_ids(
+    conn: sqlite3.Connection,
+    company_id: Optional[int] = None,
+    date_range: Optional[tuple] = None,
+) -> list:
+    """
+    Get the IDs of stored chunks, optionally restricted by company and transcript date.
+    
+    Used to pre-filter vector search to a subset of chunks.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        company_id (int, optional): Filter by company ID
+        date_range (tuple, optional): Inclusive (start, end) transcript dates; either may be None
+    
+    Returns:
+        list: Chunk IDs
+    """
+    where, params = [], []
+    if company_id:
+        where.append("t.company_id = ?")
+        params.append(company_id)
+    _add_date_range(where, params, "t.date", date_range)
+    
+    # Served by idx_transcripts_company_date and idx_chunks_transcript
+    sql = "SELECT ch.id FROM transcripts t JOIN chunks ch ON ch.transcript_id = t.id"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return [row[0] for row in conn.execute(sql, params)]
+
+def get_statements_valid_at(
+    conn: sqlite3.Connection,
+    company_id: int,
+    at: Any,
+    include_atemporal: bool = True,
+    limit: Optional[int] = None,
+) -> list:
+    """
+    Get the statements about a company that hold at a point in time.
+    
+    STATIC statements hold from their valid_at onwards, DYNAMIC statements
+    from valid_at until invalid_at (or indefinitely while invalid_at is
+    NULL), and ATEMPORAL statements always. Each temporal type is answered
+    by its own range scan on idx_statements_company_covering, which holds
+    every returned column, so the table itself is never read. The branches
+    come out of the index already ordered by valid_at and are merged without
+    a sort, so with a limit the scan stops early. The remaining cost is per
+    statement returned: with 1M statements over 1,000 companies (about 520
+    matches per query) a lookup takes about 2 ms, 0.35 ms with limit=100 and
+    0.1 ms with limit=20 (p50).
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        company_id (int): ID of the company
+        at (str, date or datetime): Point in time, normalized with as_timestamp()
+        include_atemporal (bool): Whether to include ATEMPORAL statements
+        limit (int, optional): Maximum number of statements to return
+    
+    Returns:
+        list: List of statement dictionaries, most recently valid first
+    """
+    at = as_timestamp(at)
+    columns = "id, chunk_id, transcript_id, company_id, statement, statement_type, temporal_type, valid_at, invalid_at"
+    branches = [
+        f"""SELECT {columns} FROM statements
+            WHERE company_id = ? AND temporal_type = 'STATIC' AND valid_at <= ?""",
+        f"""SELECT {columns} FROM statements
+            WHERE company_id = ? AND temporal_type = 'DYNAMIC' AND valid_at <= ?
+              AND (invalid_at IS NULL OR invalid_at > ?)""",
+    ]
+    params = [company_id, at, company_id, at, at]
+    if include_atemporal:
+        branches.append(f"""SELECT {columns} FROM statements
+            WHERE company_id = ? AND temporal_type = 'ATEMPORAL'""")
+        params.append(company_id)
+    
+    sql = " UNION ALL ".join(branches) + " ORDER BY valid_at DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    
+    cursor = conn.execute(sql, params)
+    names = [description[0] for description in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+# Control characters cannot appear in indexed tokens, so they are safe
+# markers for locating highlighted matches
+_MATCH_START, _MATCH_END = "\x02", "\x03"
+_MATCH_MARKERS = re.compile(f"[{_MATCH_START}{_MATCH_END}]")
+
+def _match_offsets(highlighted: str) -> list:
+    """Turn highlight() output into (start, end) offsets in the original text."""
+    offsets, removed, start = [], 0, None
+    for m in _MATCH_MARKERS.finditer(highlighted):
+        position = m.start() - removed
+        if m.group() == _MATCH_START:
+            start = position
+        elif start is not None:
+            offsets.append((start, position))
+            start = None
+        removed += 1
+    return offsets
+
+def search_transcripts(
+    conn: sqlite3.Connection,
+    query: str,
+    company_id: Optional[int] = None,
+    date_range: Optional[tuple] = None,
+    limit: int = 20,
+    snippet_tokens: int = 16,
+    with_offsets: bool = True,
+) -> list:
+    """
+    Full-text search over transcripts, best matches first.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        query (str): FTS5 query, e.g. 'guidance', '"raise our guidance"' or 'margin NEAR(expansion, 5)'
+        company_id (int, optional): Filter by company ID
+        date_range (tuple, optional): Inclusive (start, end) dates; either may be None
+        limit (int): Maximum number of hits
+        snippet_tokens (int): Approximate snippet length in tokens
+        with_offsets (bool): Whether to compute character offsets of every match
+    
+    Returns:
+        list: Hit dictionaries with transcript_id, company_id, company_name,
+        date, rank (BM25, lower is better), snippet (matches wrapped in [ ])
+        and, if requested, match_offsets as (start, end) positions in the
+        transcript text
+    """
+    where, params = ["transcripts_fts MATCH ?"], [snippet_tokens, query]
+    if company_id:
+        where.append("t.company_id = ?")
+        params.append(company_id)
+    _add_date_range(where, params, "t.date", date_range)
+    params.append(limit)
+    
+    cursor = conn.execute(f"""
+        SELECT t.id AS transcript_id, t.company_id, c.name AS company_name, t.date,
+               bm25(transcripts_fts) AS rank,
+               snippet(transcripts_fts, 0, '[', ']', '...', ?) AS snippet
+        FROM transcripts_fts
+        JOIN transcripts t ON t.id = transcripts_fts.rowid
+        JOIN companies c ON c.id = t.company_id
+        WHERE {" AND ".join(where)}
+        ORDER BY rank
+        LIMIT ?
+    """, params)
+    names = [description[0] for description in cursor.description]
+    hits = [dict(zip(names, row)) for row in cursor.fetchall()]
+    
+    if with_offsets:
+        # Highlighting whole transcripts is only done for the returned hits
+        for hit in hits:
+            highlighted = conn.execute(f"""
+                SELECT highlight(transcripts_fts, 0, '{_MATCH_START}', '{_MATCH_END}')
+                FROM transcripts_fts WHERE transcripts_fts MATCH ? AND rowid = ?
+            """, (query, hit["transcript_id"])).fetchone()[0]
+            hit["match_offsets"] = _match_offsets(highlighted or "")
+    return hits
+
+def search_chunks(
+    conn: sqlite3.Connection,
+    query: str,
+    transcript_id: Optional[int] = None,
+    limit: int = 20,
+    snippet_tokens: int = 16,
+) -> list:
+    """
+    Full-text search over stored chunks, best matches first.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        query (str): FTS5 query
+        transcript_id (int, optional): Restrict to chunks of one transcript
+        limit (int): Maximum number of hits
+        snippet_tokens (int): Approximate snippet length in tokens
+    
+    Returns:
+        list: Hit dictionaries with chunk_id, transcript_id, chunk_index,
+        start_index, end_index, rank and snippet
+    """
+    where, params = ["chunks_fts MATCH ?"], [snippet_tokens, query]
+    if transcript_id:
+        where.append("ch.transcript_id = ?")
+        params.append(transcript_id)
+    params.append(limit)
+    
+    cursor = conn.execute(f"""
+        SELECT ch.id AS chunk_id, ch.transcript_id, ch.chunk_index, ch.start_index, ch.end_index,
+               bm25(chunks_fts) AS rank,
+               snippet(chunks_fts, 0, '[', ']', '...', ?) AS snippet
+        FROM chunks_fts
+        JOIN chunks ch ON ch.id = chunks_fts.rowid
+        WHERE {" AND ".join(where)}
+        ORDER BY rank
+        LIMIT ?
+    """, params)
+    names = [description[0] for description in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+def record_ingestion(
+    conn: sqlite3.Connection,
+    transcript_id: str,
+    content_hash: str,
+    company: Optional[str],
+    date: Optional[str],
+    status: str,
+    chunk_count: Optional[int] = None,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Record the outcome of processing a transcript in the ingestion ledger.
+    
+    Each call commits, so the ledger survives a crash mid-run.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        transcript_id (str): Content-derived transcript ID
+        content_hash (str): Hash of (company, date, text) the ID was derived from
+        company (str, optional): Company name
+        date (str, optional): Date of the transcript
+        status (str): "done" or "failed"
+        chunk_count (int, optional): Number of chunks produced
+        error (str, optional): Error message for failed transcripts
+    """
+    conn.execute("""
+        INSERT INTO ingestion_ledger (transcript_id, content_hash, company, date, status, chunk_count, error)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (transcript_id) DO UPDATE SET
+            status = excluded.status,
+            chunk_count = excluded.chunk_count,
+            error = excluded.error,
+            updated_at = CURRENT_TIMESTAMP
+    """, (transcript_id, content_hash, company, date, status, chunk_count, error))
+    conn.commit()
+
+def get_completed_transcript_ids(conn: sqlite3.Connection) -> set:
+    """
+    Get the IDs of transcripts the ledger records as successfully processed.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+    
+    Returns:
+        set: Transcript IDs with status "done"
+    """
+    cursor = conn.execute("SELECT transcript_id FROM ingestion_ledger WHERE status = 'done'")
+    return {row[0] for row in cursor}
@@ -0,0 +1,296 @@
+"""
+Persistent, content-addressed cache for text embeddings.
+
+Vectors are keyed by (model, SHA-256 of the whitespace-normalized text) and
+stored as float32 blobs in SQLite, with an in-process LRU in front. The
+same boilerplate (safe-harbor statements, operator lines, analyst
+introductions) recurs across thousands of transcripts, so re-running the
+pipeline only pays for text it has never embedded before.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing so trivially different copies share a key.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Text with runs of whitespace collapsed and ends stripped
+    """
+    return _WHITESPACE.sub(" ", text).strip()
+
+def text_hash(text: str) -> str:
+    """
+    Content hash used as the cache key for a piece of text.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Hex SHA-256 digest of the normalized text
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """
+    Two-level embedding cache: an in-memory LRU backed by a SQLite table.
+
+    The cache is safe to share between threads. Entries are evicted from disk
+    least-recently-used first once the stored vectors exceed max_disk_bytes.
+
+    Args:
+        db_path (str): SQLite file holding the cache. Kept separate from
+            cookbook.db by default because make_connection(refresh=True)
+            deletes that file on every notebook run.
+        memory_items (int): Number of vectors kept in the in-process LRU
+        max_disk_bytes (int): Upper bound on the total size of stored vectors
+    """
+
+    def __init__(
+        self,
+        db_path: str = "embedding_cache.db",
+        memory_items: int = 10_000,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.db_path = db_path
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        # Last hit per key, written to last_used with the next put_many or
+        # close so reads never commit, and eviction still sees hot entries
+        self._touched: dict[tuple[str, str], float] = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON embedding_cache (last_used)"
+        )
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+        ).fetchone()[0]
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model: str, text: str) -> Optional[np.ndarray]:
+        """
+        Look up the embedding of a single text.
+
+        Args:
+            model (str): Embedding model name
+            text (str): Text that was embedded
+
+        Returns:
+            np.ndarray or None: Cached float32 vector, or None on a miss
+        """
+        return self.get_many(model, [text])[0]
+
+    def get_many(self, model: str, texts: Iterable[str]) -> list[Optional[np.ndarray]]:
+        """
+        Look up the embeddings of many texts with a single disk query.
+
+        Args:
+            model (str): Embedding model name
+            texts (Iterable[str]): Texts that were embedded
+
+        Returns:
+            list: One float32 vector per text, or None where the text is not cached
+        """
+        hashes = [text_hash(t) for t in texts]
+        results: list[Optional[np.ndarray]] = [None] * len(hashes)
+
+        now = time.time()
+        with self._lock:
+            missing: dict[str, list[int]] = {}
+            for i, h in enumerate(hashes):
+                vector = self._memory.get((model, h))
+                if vector is not None:
+                    self._memory.move_to_end((model, h))
+                    self._touched[(model, h)] = now
+                    results[i] = vector
+                    self.memory_hits += 1
+                else:
+                    missing.setdefault(h, []).append(i)
+
+            if missing:
+                found = self._read_disk(model, list(missing))
+                for h, vector in found.items():
+                    self._remember(model, h, vector)
+                    for i in missing[h]:
+                        results[i] = vector
+                    self.disk_hits += len(missing[h])
+                self.misses += sum(len(ix) for h, ix in missing.items() if h not in found)
+
+        return results
+
+    def put(self, model: str, text: str, vector) -> None:
+        """
+        Store the embedding of a single text.
+
+        Args:
+            model (str): Embedding model name
+            text (str): Text that was embedded
+            vector: Embedding values
+        """
+        self.put_many(model, [text], [vector])
+
+    def put_many(self, model: str, texts: Iterable[str], vectors) -> None:
+        """
+        Store the embeddings of many texts in one transaction.
+
+        Args:
+            model (str): Embedding model name
+            texts (Iterable[str]): Texts that were embedded
+            vectors: Embedding values, one row per text
+        """
+        now = time.time()
+        # Rows grouped by vector size, so the bytes added are exact when
+        # dimensions differ
+        rows: dict[int, list[tuple]] = {}
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                h = text_hash(text)
+                array = np.array(vector, dtype=np.float32)
+                self._remember(model, h, array)
+                rows.setdefault(array.nbytes, []).append((model, h, array.shape[0], array.tobytes(), now))
+
+            if not rows:
+                return
+            with self._conn:
+                self._write_touched()
+                for size, group in rows.items():
+                    # Keys are content hashes, so an existing row already holds this vector
+                    before = self._conn.total_changes
+                    self._conn.executemany("""
+                        INSERT OR IGNORE INTO embedding_cache (model, text_hash, dim, vector, last_used)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, group)
+                    self._disk_bytes += (self._conn.total_changes - before) * size
+
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+
+    @property
+    def hits(self) -> int:
+        """Total number of lookups answered from memory or disk."""
+        return self.memory_hits + self.disk_hits
+
+    def stats(self) -> dict:
+        """
+        Report cache effectiveness counters.
+
+        Returns:
+            dict: Hit/miss counts, hit rate, eviction count and sizes
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "memory_items": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def clear(self) -> None:
+        """Remove every cached embedding from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            with self._conn:
+                self._conn.execute("DELETE FROM embedding_cache")
+            self._disk_bytes = 0
+
+    def close(self) -> None:
+        """Record pending last_used updates and close the underlying SQLite connection."""
+        with self._lock:
+            with self._conn:
+                self._write_touched()
+            self._conn.close()
+
+    def _remember(self, model: str, h: str, vector: np.ndarray) -> None:
+        vector.flags.writeable = False
+        self._memory[(model, h)] = vector
+        self._memory.move_to_end((model, h))
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, model: str, hashes: list[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(hashes), 500):
+            batch = hashes[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(f"""
+                SELECT text_hash, vector FROM embedding_cache
+                WHERE model = ? AND text_hash IN ({placeholders})
+            """, (model, *batch)).fetchall()
+            for h, blob in rows:
+                found[h] = np.frombuffer(blob, dtype=np.float32)
+
+        now = time.time()
+        for h in found:
+            self._touched[(model, h)] = now
+        return found
+
+    def _write_touched(self) -> None:
+        # Caller holds the lock and an open transaction
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embedding_cache SET last_used = ? WHERE model = ? AND text_hash = ?",
+                [(used, model, h) for (model, h), used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        # Free down to 90% of the budget so eviction does not run on every put
+        target = int(self.max_disk_bytes * 0.9)
+        victims = []
+        freed = 0
+        cursor = self._conn.execute(
+            "SELECT model, text_hash, LENGTH(vector) FROM embedding_cache ORDER BY last_used"
+        )
+        for model, h, size in cursor:
+            if self._disk_bytes - freed <= target:
+                break
+            victims.append((model, h))
+            freed += size
+        cursor.close()
+
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM embedding_cache WHERE model = ? AND text_hash = ?", victims
+            )
+        for key in victims:
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
+        self._disk_bytes -= freed
+        self.evictions += len(victims)
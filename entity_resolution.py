@@ -0,0 +1,349 @@
+"""
+Entity resolution for statement subjects and objects.
+
+The extraction prompt asks the model to write full entity names, but the
+same company still appears as "TechNova Inc", "TechNova" and "TechNova
+Inc.". EntityResolver maps every mention to a canonical entity without
+comparing all pairs:
+
+1. Mentions are deduplicated by their exact text, so a name repeated
+   across millions of statements is resolved once.
+2. Names are normalized (case, accents, punctuation, "&", legal suffixes
+   such as Inc, Corp or Ltd). Names with the same normalized key are the
+   same entity without any comparison.
+3. Other names look up candidates in an inverted index of character
+   trigrams. Shared trigram counts for all candidates are computed at once
+   with NumPy, and only the best few are scored exactly (Dice coefficient).
+4. With an embedding model, scores just below the threshold are settled
+   by the cosine similarity of the two names' embeddings, in batches.
+
+Entities and aliases are persisted in the ``entities`` and
+``entity_aliases`` tables, so IDs stay stable across runs.
+
+Example:
+    resolver = EntityResolver.from_db(conn)
+    entity_ids = resolver.resolve_many(["TechNova Inc", "TechNova", "Technova Inc."])
+    resolver.save(conn)
+"""
+
+import re
+import unicodedata
+from array import array
+from typing import Any, Iterable, Mapping, Optional
+
+import numpy as np
+
+from db_interface import get_entities, insert_triplets_bulk, save_entities
+
+# Legal forms dropped from the end of names, repeatedly ("Acme Holdings Co Ltd")
+LEGAL_SUFFIXES = frozenset({
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd",
+    "limited", "llc", "lp", "llp", "plc", "sa", "ag", "nv", "se", "gmbh",
+    "holdings", "group",
+})
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_entity_name(name: str) -> str:
+    """
+    Normalized form used to compare entity names.
+
+    Args:
+        name (str): Entity name as written
+
+    Returns:
+        str: Lowercase ASCII words without punctuation or trailing legal
+        suffixes, e.g. "technova" for "TechNova, Inc."
+    """
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.casefold().replace("&", " and ")
+    # Dotted abbreviations ("N.V.", "S.A.") collapse into one word
+    text = _NON_WORD.sub(lambda m: "" if m.group() == "." else " ", text)
+    words = _WHITESPACE.split(text.strip())
+    if words and words[0] == "the" and len(words) > 1:
+        words = words[1:]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+def _block_key(normalized: str) -> str:
+    # "tech nova" and "technova" share a block
+    return normalized.replace(" ", "")
+
+def _trigrams(normalized: str) -> set[str]:
+    padded = f" {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class EntityResolver:
+    """
+    Incremental resolver from entity mentions to canonical entity IDs.
+
+    Args:
+        threshold (float): Minimum trigram Dice similarity for a match
+        embeddings (optional): Object with ``embed_documents(texts)``, such
+            as GeminiEmbeddings, used for borderline matches
+        embedding_margin (float): Scores within this margin below the
+            threshold are checked with embeddings
+        embedding_threshold (float): Minimum cosine similarity of the
+            embeddings for a borderline match
+        max_postings (int): Trigrams in more entities than this are too
+            common to propose candidates and are only used for scoring
+        max_candidates (int): Candidates scored exactly per name
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        embeddings: Any = None,
+        embedding_margin: float = 0.15,
+        embedding_threshold: float = 0.9,
+        max_postings: int = 5000,
+        max_candidates: int = 16,
+    ):
+        self.threshold = threshold
+        self.embeddings = embeddings
+        self.embedding_margin = embedding_margin
+        self.embedding_threshold = embedding_threshold
+        self.max_postings = max_postings
+        self.max_candidates = max_candidates
+
+        # Entities by dense index; IDs are what is persisted
+        self._ids: list[int] = []
+        self._index: dict[int, int] = {}
+        self._names: list[str] = []
+        self._normalized: list[str] = []
+        self._grams: list[frozenset] = []
+        self._gram_counts = array("i")
+        self._postings: dict[str, array] = {}
+        self._by_block: dict[str, int] = {}
+        self._by_alias: dict[str, int] = {}
+        self._next_id = 1
+
+        # Rows not yet written by save()
+        self._new_entities: list[int] = []
+        self._new_aliases: dict[str, int] = {}
+
+        self.comparisons = 0
+        self.embedding_checks = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @classmethod
+    def from_db(cls, conn, **kwargs) -> "EntityResolver":
+        """
+        Resolver preloaded with the entities and aliases stored in the database.
+
+        Args:
+            conn (sqlite3.Connection): Database connection
+            **kwargs: EntityResolver arguments
+
+        Returns:
+            EntityResolver: Resolver that extends the stored entities
+        """
+        resolver = cls(**kwargs)
+        for entity in get_entities(conn):
+            index = resolver._add_entity(entity["name"], entity["normalized_name"], entity["id"])
+            for alias in entity["aliases"]:
+                resolver._by_alias[alias] = index
+        resolver._new_entities.clear()
+        return resolver
+
+    def _add_entity(self, name: str, normalized: str, entity_id: Optional[int] = None) -> int:
+        index = len(self._ids)
+        if entity_id is None:
+            entity_id = self._next_id
+        self._next_id = max(self._next_id, entity_id + 1)
+        grams = frozenset(_trigrams(normalized))
+
+        self._ids.append(entity_id)
+        self._index[entity_id] = index
+        self._names.append(name)
+        self._normalized.append(normalized)
+        self._grams.append(grams)
+        self._gram_counts.append(len(grams))
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("i")
+            postings.append(index)
+        self._by_block.setdefault(_block_key(normalized), index)
+        self._new_entities.append(index)
+        return index
+
+    def _best_match(self, normalized: str) -> tuple[int, float]:
+        """Most similar known entity and its Dice score, (-1, 0.0) if none shares a trigram."""
+        grams = _trigrams(normalized)
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings:
+            return -1, 0.0
+        selective = [p for p in postings if len(p) <= self.max_postings]
+        if not selective:
+            selective = sorted(postings, key=len)[:3]
+
+        # Shared trigram counts of every candidate in one pass
+        candidates, shared = np.unique(
+            np.concatenate([np.frombuffer(p, dtype=np.int32) for p in selective]), return_counts=True
+        )
+        counts = np.frombuffer(self._gram_counts, dtype=np.int32)[candidates]
+        approx = 2.0 * shared / (len(grams) + counts)
+        if len(candidates) > self.max_candidates:
+            top = np.argpartition(approx, -self.max_candidates)[-self.max_candidates:]
+            candidates = candidates[top]
+
+        # Exact scores, including trigrams too common to propose candidates
+        best, best_score = -1, 0.0
+        for index in candidates.tolist():
+            self.comparisons += 1
+            score = 2.0 * len(grams & self._grams[index]) / (len(grams) + self._gram_counts[index])
+            if score > best_score:
+                best, best_score = index, score
+        return best, best_score
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def resolve_many(self, names: Iterable[str]) -> list[Optional[int]]:
+        """
+        Resolve mentions to canonical entity IDs, creating entities as needed.
+
+        Args:
+            names (Iterable[str]): Entity mentions; None or blank mentions resolve to None
+
+        Returns:
+            list: Entity ID for each mention, in input order
+        """
+        names = list(names)
+        resolved: dict[str, int] = {}
+        borderline: list[tuple[str, str, int]] = []
+        for name in dict.fromkeys(name.strip() for name in names if name and name.strip()):
+            index = self._by_alias.get(name)
+            if index is None:
+                normalized = normalize_entity_name(name) or name.casefold()
+                index = self._by_block.get(_block_key(normalized))
+                if index is None:
+                    match, score = self._best_match(normalized)
+                    if score >= self.threshold:
+                        index = match
+                    elif self.embeddings is not None and score >= self.threshold - self.embedding_margin:
+                        borderline.append((name, normalized, match))
+                        continue
+                    else:
+                        index = self._add_entity(name, normalized)
+                self._alias(name, index)
+            resolved[name] = index
+
+        if borderline:
+            # One embedding request for every borderline mention and its candidate
+            mentions = self._embed([name for name, _, _ in borderline])
+            candidates = self._embed([self._names[match] for _, _, match in borderline])
+            similarities = np.einsum("ij,ij->i", mentions, candidates)
+            self.embedding_checks += len(borderline)
+            for (name, normalized, match), similarity in zip(borderline, similarities.tolist()):
+                index = self._by_block.get(_block_key(normalized))
+                if index is None:
+                    index = match if similarity >= self.embedding_threshold else self._add_entity(name, normalized)
+                self._alias(name, index)
+                resolved[name] = index
+
+        return [self._ids[resolved[name.strip()]] if name and name.strip() else None for name in names]
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Canonical entity ID of one mention, see resolve_many."""
+        return self.resolve_many([name])[0]
+
+    def _alias(self, name: str, index: int) -> None:
+        if self._by_alias.get(name) != index:
+            self._by_alias[name] = index
+            self._new_aliases[name] = index
+
+    def canonical_name(self, entity_id: int) -> str:
+        """Name of an entity as first seen."""
+        return self._names[self._index[entity_id]]
+
+    def save(self, conn, commit: bool = True) -> None:
+        """
+        Write entities and aliases created since the last save.
+
+        Args:
+            conn (sqlite3.Connection): Database connection
+            commit (bool): Commit when done. With False the caller commits,
+                then calls _mark_saved(); until then the rows are written
+                again by the next save
+        """
+        save_entities(
+            conn,
+            (
+                {"id": self._ids[i], "name": self._names[i], "normalized_name": self._normalized[i]}
+                for i in self._new_entities
+            ),
+            ({"alias": alias, "entity_id": self._ids[i]} for alias, i in self._new_aliases.items()),
+            commit=commit,
+        )
+        if commit:
+            self._mark_saved()
+
+    def _mark_saved(self) -> None:
+        self._new_entities.clear()
+        self._new_aliases.clear()
+
+    def stats(self) -> dict:
+        """
+        Report index size and work done.
+
+        Returns:
+            dict: Entities, aliases, indexed trigrams, exact comparisons and
+            embedding checks made
+        """
+        return {
+            "entities": len(self._ids),
+            "aliases": len(self._by_alias),
+            "trigrams": len(self._postings),
+            "comparisons": self.comparisons,
+            "embedding_checks": self.embedding_checks,
+        }
+
+def store_triplets(conn, resolver: EntityResolver, triplets: Iterable[Mapping], batch_size: int = 5000) -> list:
+    """
+    Resolve the entities of extracted triplets and store them.
+
+    New entities, aliases and the triplets are written in one transaction,
+    so a failure leaves neither behind.
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        resolver (EntityResolver): Resolver for subjects and objects
+        triplets (Iterable[Mapping]): Rows with "subject", "predicate" and
+            optional "statement_id", "object" (an entity name) and "value"
+            (a literal object)
+        batch_size (int): Rows sent per executemany call
+
+    Returns:
+        list: Triplet ID for each input row, in input order
+    """
+    triplets = list(triplets)
+    subjects = resolver.resolve_many(t["subject"] for t in triplets)
+    objects = resolver.resolve_many(t.get("object") for t in triplets)
+    rows = (
+        {
+            "statement_id": t.get("statement_id"),
+            "subject_id": subject_id,
+            "predicate": t["predicate"],
+            "object_id": object_id,
+            "value": t.get("value"),
+        }
+        for t, subject_id, object_id in zip(triplets, subjects, objects)
+    )
+    try:
+        resolver.save(conn, commit=False)
+        ids = insert_triplets_bulk(conn, rows, batch_size, commit=False)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    resolver._mark_saved()
+    return ids
@@ -0,0 +1,266 @@
+"""
+Persistent cache of LLM statement extractions, with single-flight requests.
+
+Boilerplate disclaimers, operator scripts and re-ingested transcripts send
+the same chunk to the extraction LLM again and again. Validated statements
+are stored in SQLite under a hash of (prompt version, model, normalized chunk
+text, prompt inputs), so repeated chunks and re-runs are answered locally.
+Concurrent requests for a key that is already being extracted wait for that
+extraction instead of issuing their own.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Iterable, Mapping, Optional
+
+from pydantic import TypeAdapter
+
+from data_model import RawStatement, raw_statements_from_rows
+from embedding_cache import normalize_text
+
+_STATEMENT_LIST = TypeAdapter(list[RawStatement])
+
+def extraction_key(prompt_version: str, model: str, text: str, inputs: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Cache key for one chunk's extraction.
+
+    Args:
+        prompt_version (str): PromptBuilder.version of the prompt used
+        model (str): LLM model name
+        text (str): Chunk text
+        inputs (Mapping, optional): Prompt inputs for the chunk
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, normalize_text(text), json.dumps(inputs or {}, sort_keys=True, default=str)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """
+    SQLite-backed cache of validated RawStatement lists, safe to share between threads.
+
+    Args:
+        db_path (str): SQLite file holding the cache, separate from cookbook.db
+            because make_connection(refresh=True) deletes that file
+        ttl_seconds (float, optional): Entries older than this are treated as
+            missing and removed; None keeps them until evicted for size
+        max_disk_bytes (int): Upper bound on stored statement JSON, least
+            recently used entries are evicted first
+    """
+
+    def __init__(
+        self,
+        db_path: str = "extraction_cache.db",
+        ttl_seconds: Optional[float] = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS extraction_cache (
+                key TEXT PRIMARY KEY,
+                statements TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_used ON extraction_cache (last_used)"
+        )
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(statements)), 0) FROM extraction_cache"
+        ).fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, list[RawStatement]]:
+        """
+        Look up cached extractions.
+
+        Args:
+            keys (Iterable[str]): Keys from extraction_key
+
+        Returns:
+            dict: Statements for every key found and not expired
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found: dict[str, list[RawStatement]] = {}
+        stale: list[tuple[str, int]] = []
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(f"""
+                    SELECT key, statements, created_at FROM extraction_cache WHERE key IN ({placeholders})
+                """, batch).fetchall()
+                for key, statements, created_at in rows:
+                    if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                        stale.append((key, len(statements)))
+                    else:
+                        # Validated before they were stored
+                        found[key] = raw_statements_from_rows(json.loads(statements))
+
+            with self._conn:
+                if found:
+                    self._conn.executemany(
+                        "UPDATE extraction_cache SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+                    )
+                if stale:
+                    self._conn.executemany("DELETE FROM extraction_cache WHERE key = ?", [(key,) for key, _ in stale])
+            self._disk_bytes -= sum(size for _, size in stale)
+            self.expired += len(stale)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Mapping[str, list[RawStatement]]) -> None:
+        """
+        Store validated extractions, replacing existing entries.
+
+        Args:
+            entries (Mapping): Statements per key
+        """
+        if not entries:
+            return
+        now = time.time()
+        rows = [
+            (key, _STATEMENT_LIST.dump_json(statements).decode("utf-8"), now, now)
+            for key, statements in entries.items()
+        ]
+        with self._lock:
+            with self._conn:
+                replaced = self._stored_bytes([row[0] for row in rows])
+                self._conn.executemany("""
+                    INSERT OR REPLACE INTO extraction_cache (key, statements, created_at, last_used)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
+            self._disk_bytes += sum(len(row[1]) for row in rows) - replaced
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+
+    def _stored_bytes(self, keys: list[str]) -> int:
+        total = 0
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            total += self._conn.execute(
+                f"SELECT COALESCE(SUM(LENGTH(statements)), 0) FROM extraction_cache WHERE key IN ({placeholders})",
+                batch,
+            ).fetchone()[0]
+        return total
+
+    def claim(self, keys: Iterable[str]) -> tuple[list[str], dict[str, Future]]:
+        """
+        Register intent to extract keys, collapsing duplicate in-flight work.
+
+        Every claimed key must later be passed to resolve() or abandon().
+
+        Args:
+            keys (Iterable[str]): Keys missing from the cache
+
+        Returns:
+            tuple: (keys the caller now owns and must extract, futures for
+            keys another caller is already extracting)
+        """
+        owned, waiting = [], {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                future = self._inflight.get(key)
+                if future is not None:
+                    waiting[key] = future
+                    self.joined += 1
+                else:
+                    self._inflight[key] = Future()
+                    owned.append(key)
+        return owned, waiting
+
+    def resolve(self, entries: Mapping[str, list[RawStatement]]) -> None:
+        """Store extractions for claimed keys and wake callers waiting on them."""
+        self.put_many(entries)
+        with self._lock:
+            futures = [(self._inflight.pop(key, None), statements) for key, statements in entries.items()]
+        for future, statements in futures:
+            if future is not None:
+                future.set_result(statements)
+
+    def abandon(self, keys: Iterable[str], error: BaseException) -> None:
+        """Release claimed keys after a failed extraction, failing their waiters."""
+        with self._lock:
+            futures = [self._inflight.pop(key, None) for key in keys]
+        for future in futures:
+            if future is not None:
+                future.set_exception(error)
+
+    def stats(self) -> dict:
+        """
+        Report cache effectiveness counters.
+
+        Returns:
+            dict: Hits, misses, hit rate, single-flight joins, expired and
+            evicted entries, stored entries and bytes
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "joined": self.joined,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": entries,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self) -> None:
+        """Remove every cached extraction."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM extraction_cache")
+            self._disk_bytes = 0
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        # Free down to 90% of the budget so eviction does not run on every put
+        target = int(self.max_disk_bytes * 0.9)
+        victims = []
+        freed = 0
+        cursor = self._conn.execute(
+            "SELECT key, LENGTH(statements) FROM extraction_cache ORDER BY last_used"
+        )
+        for key, size in cursor:
+            if self._disk_bytes - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        cursor.close()
+
+        with self._conn:
+            self._conn.executemany("DELETE FROM extraction_cache WHERE key = ?", victims)
+        self._disk_bytes -= freed
+        self.evictions += len(victims)
@@ -0,0 +1,236 @@
+"""
+Local stand-ins for the external services used by the pipeline.
+
+These fakes mimic the call signatures of the Gemini SDK and the extraction
+LLM closely enough to be passed wherever a real client is accepted, and inject latency and
+rate-limit/server errors so throughput, retry and backoff behaviour can be
+exercised without an API key or network access.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+class FakeServiceError(Exception):
+    """
+    Error raised by the fakes, carrying an HTTP-style status code.
+
+    Args:
+        code (int): Status code, e.g. 429 for rate limiting or 503 for unavailable
+        message (str): Error message
+    """
+
+    def __init__(self, code: int, message: str = ""):
+        super().__init__(message or f"fake service error {code}")
+        self.code = code
+
+class FakeEmbeddingClient:
+    """
+    Drop-in replacement for ``google.generativeai`` embedding calls.
+
+    Vectors are derived from a hash of the text, so identical texts always
+    get identical embeddings and runs are reproducible.
+
+    Args:
+        dim (int): Embedding dimension
+        latency (float): Seconds each request takes
+        jitter (float): Extra uniformly random latency in seconds
+        rate_limit_rate (float): Probability a request fails with 429
+        error_rate (float): Probability a request fails with 503
+        max_batch_size (int): Largest batch accepted, larger batches fail with 400
+        seed (int): Seed for the latency and error draws
+    """
+
+    def __init__(
+        self,
+        dim: int = 768,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        max_batch_size: int = 100,
+        seed: int = 0,
+    ):
+        self.dim = dim
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.max_batch_size = max_batch_size
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.texts_embedded = 0
+        self.failures = 0
+
+    def vector(self, text: str) -> list[float]:
+        """Deterministic unit vector for a text."""
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        v = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return (v / np.linalg.norm(v)).tolist()
+
+    def _draw(self) -> tuple[float, Optional[int]]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return delay, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, 503
+        return delay, None
+
+    def _respond(self, content: Union[str, Iterable[str]]) -> dict:
+        if isinstance(content, str):
+            with self._lock:
+                self.texts_embedded += 1
+            return {"embedding": self.vector(content)}
+        texts = list(content)
+        if len(texts) > self.max_batch_size:
+            raise FakeServiceError(400, f"batch of {len(texts)} exceeds {self.max_batch_size}")
+        with self._lock:
+            self.texts_embedded += len(texts)
+        return {"embedding": [self.vector(t) for t in texts]}
+
+    def _fail(self, code: int) -> None:
+        with self._lock:
+            self.failures += 1
+        raise FakeServiceError(code)
+
+    def embed_content(self, model: str, content: Union[str, Iterable[str]], **kwargs) -> dict:
+        """Same shape as ``genai.embed_content``: ``{"embedding": vector or [vectors]}``."""
+        delay, error = self._draw()
+        if delay:
+            time.sleep(delay)
+        if error:
+            self._fail(error)
+        return self._respond(content)
+
+    async def embed_content_async(self, model: str, content: Union[str, Iterable[str]], **kwargs) -> dict:
+        """Same shape as ``genai.embed_content_async``."""
+        delay, error = self._draw()
+        if delay:
+            await asyncio.sleep(delay)
+        if error:
+            self._fail(error)
+        return self._respond(content)
+
+    def stats(self) -> dict:
+        """Request, text and failure counters."""
+        return {
+            "requests": self.requests,
+            "texts_embedded": self.texts_embedded,
+            "failures": self.failures,
+        }
+
+_CHUNK_SECTION = re.compile(r'<chunk id="([^"]*)">\n(.*?)\n</chunk>', re.S)
+_FAKE_SENTENCE = re.compile(r"[^.!?\n]+[.!?]")
+
+class FakeLLM:
+    """
+    Stand-in for the statement extraction LLM (a prompt -> text callable).
+
+    Answers batched extraction prompts with one statement per sentence of
+    every ``<chunk id="...">`` section, labelled deterministically from a
+    hash of the sentence, in the BatchedStatements JSON format.
+
+    Args:
+        latency (float): Seconds each request takes
+        latency_per_1k_tokens (float): Extra seconds per 1,000 prompt tokens
+        rate_limit_rate (float): Probability a request fails with 429
+        error_rate (float): Probability a request fails with 503
+        drop_rate (float): Probability each chunk is left out of the response
+        context_tokens (int, optional): Prompts longer than this fail with 400
+        seed (int): Seed for the latency, error and drop draws
+    """
+
+    STATEMENT_TYPES = ("FACT", "OPINION", "PREDICTION")
+    TEMPORAL_TYPES = ("STATIC", "DYNAMIC", "ATEMPORAL")
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_per_1k_tokens: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        context_tokens: Optional[int] = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.context_tokens = context_tokens
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.chunks_answered = 0
+        self.failures = 0
+
+    def statements(self, text: str) -> list[dict]:
+        """Deterministic statements for a chunk's text."""
+        statements = []
+        for sentence in _FAKE_SENTENCE.findall(text):
+            sentence = sentence.strip()
+            digest = hashlib.sha256(sentence.encode("utf-8")).digest()
+            statements.append({
+                "statement": sentence,
+                "statement_type": self.STATEMENT_TYPES[digest[0] % 3],
+                "temporal_type": self.TEMPORAL_TYPES[digest[1] % 3],
+            })
+        return statements
+
+    def __call__(self, prompt: str) -> str:
+        tokens = max(1, len(prompt) // 4)
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += tokens
+            delay = self.latency + self.latency_per_1k_tokens * tokens / 1000
+            roll = self._rng.random()
+            dropped = [self._rng.random() < self.drop_rate for _ in _CHUNK_SECTION.finditer(prompt)]
+        if delay:
+            time.sleep(delay)
+
+        error = None
+        if self.context_tokens is not None and tokens > self.context_tokens:
+            error = 400
+        elif roll < self.rate_limit_rate:
+            error = 429
+        elif roll < self.rate_limit_rate + self.error_rate:
+            error = 503
+        if error:
+            with self._lock:
+                self.failures += 1
+            raise FakeServiceError(error)
+
+        results = []
+        for drop, match in zip(dropped, _CHUNK_SECTION.finditer(prompt)):
+            if drop:
+                continue
+            # Skip the "- key: value" input lines before the blank line
+            text = match.group(2).split("\n\n", 1)[-1]
+            results.append({"chunk_id": match.group(1), "statements": self.statements(text)})
+        with self._lock:
+            self.chunks_answered += len(results)
+        return json.dumps({"results": results})
+
+    def stats(self) -> dict:
+        """Request, token, chunk and failure counters."""
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "chunks_answered": self.chunks_answered,
+            "failures": self.failures,
+        }
@@ -1,9 +1,24 @@
 import re
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Iterable, Iterator
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
 from tqdm import tqdm
 
+from client_pool import ClientPool
+from db_interface import get_completed_transcript_ids, record_ingestion
+from embedding_cache import EmbeddingCache, normalize_text
+from rate_limit import RateLimiter, call_with_retry, call_with_retry_async, estimate_tokens
+from transcript_metadata import find_fiscal_quarter, quarter_label
+
 # Install and import Google Generative AI
 try:
     import google.generativeai as genai
@@ -13,94 +28,492 @@ except ImportError:
     subprocess.check_call(["pip", "install", "google-generativeai"])
     import google.generativeai as genai
 
+# Largest number of texts accepted by one batchEmbedContents request
+EMBEDDING_MAX_BATCH_SIZE = 100
+
+class EmbeddingError(RuntimeError):
+    """Raised when embeddings cannot be generated after all retries"""
+
+class GeminiClient:
+    """One Gemini API connection for the embedding endpoints
+
+    Wraps a dedicated GenerativeServiceClient configured with the API key, so
+    pooled instances never touch the process-wide ``genai.configure`` state
+    and each keeps its own persistent (keep-alive) channel.
+    """
+    def __init__(self, api_key: str, transport: str | None = None):
+        from google.ai import generativelanguage as glm
+
+        self._api_key = api_key
+        self._transport = transport
+        self._service = glm.GenerativeServiceClient(
+            client_options={"api_key": api_key}, transport=transport
+        )
+        self._async_service = None
+
+    def embed_content(self, model: str, content: Any, **kwargs) -> dict:
+        return genai.embed_content(model=model, content=content, client=self._service, **kwargs)
+
+    async def embed_content_async(self, model: str, content: Any, **kwargs) -> dict:
+        if self._async_service is None:
+            from google.ai import generativelanguage as glm
+
+            # The async channel binds to the running event loop, so it is
+            # created on first use from inside that loop
+            self._async_service = glm.GenerativeServiceAsyncClient(
+                client_options={"api_key": self._api_key}
+            )
+        return await genai.embed_content_async(
+            model=model, content=content, client=self._async_service, **kwargs
+        )
+
+    def close(self) -> None:
+        self._service.transport.close()
+
 class GeminiEmbeddings:
-    """Custom embeddings class to work with Gemini API"""
-    def __init__(self, api_key: str = None, model: str = "models/embedding-001"):
-        if api_key:
-            genai.configure(api_key=api_key)
-        elif os.getenv("GOOGLE_API_KEY"):
-            genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    """Custom embeddings class to work with Gemini API
+
+    Requests go through a pool of up to ``pool_size`` GeminiClient
+    connections. Pass ``client`` (anything with a
+    ``genai.embed_content``-compatible ``embed_content`` method, such as
+    ``fake_services.FakeEmbeddingClient``) to run without an API key; it is
+    shared by every pool slot.
+    """
+    def __init__(
+        self,
+        api_key: str = None,
+        model: str = "models/embedding-001",
+        cache: EmbeddingCache | None = None,
+        client: Any = None,
+        batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+        max_concurrency: int = 8,
+        requests_per_minute: float | None = 1500,
+        tokens_per_minute: float | None = None,
+        max_attempts: int = 6,
+        pool_size: int = 16,
+        transport: str | None = None,
+    ):
+        if client is None:
+            api_key = api_key or os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("Please provide GOOGLE_API_KEY environment variable or pass api_key parameter")
+            self._client_factory = lambda: GeminiClient(api_key, transport=transport)
+            close = GeminiClient.close
         else:
-            raise ValueError("Please provide GOOGLE_API_KEY environment variable or pass api_key parameter")
+            self._client_factory = lambda: client
+            close = None
         
         self.model = model
-        self.embedding_model = genai.GenerativeModel(model)
+        self.pool = ClientPool(self._client_factory, size=pool_size, close=close)
+        self.cache = cache
+        self.batch_size = min(batch_size, EMBEDDING_MAX_BATCH_SIZE)
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_attempts = max_attempts
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self._async_client = None
+        self._async_loop = None
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+        self.pool.close()
+
+    def __enter__(self) -> "GeminiEmbeddings":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
     
     def embed_query(self, text: str) -> list[float]:
         """Generate embeddings for a text query"""
+        return self.embed_documents([text])[0].tolist()
+
+    def embed_documents(self, texts: list[str]) -> np.ndarray:
+        """Generate embeddings for many texts, only sending cache misses to the API
+
+        Uncached texts are packed into batches of up to ``batch_size`` that run
+        concurrently under the request/token rate limits. Raises
+        EmbeddingError if any batch still fails after retrying.
+        """
+        vectors, missing = self._lookup(texts)
+        if missing:
+            batches = self._batches(missing)
+            if len(batches) == 1:
+                results = [self._embed_batch(batches[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                    results = list(pool.map(self._embed_batch, batches))
+            vectors = self._merge(texts, vectors, missing, results)
+        return self._as_matrix(vectors)
+
+    async def aembed_documents(self, texts: list[str], semaphore: asyncio.Semaphore | None = None) -> np.ndarray:
+        """Async variant of embed_documents
+
+        Batches are awaited concurrently; ``semaphore`` bounds how many
+        requests are in flight and can be shared across calls so a whole
+        pipeline respects one limit for the embedding service.
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        vectors, missing = self._lookup(texts)
+        if missing:
+            results = await asyncio.gather(
+                *(self._aembed_batch(b, semaphore) for b in self._batches(missing))
+            )
+            vectors = self._merge(texts, vectors, missing, results)
+        return self._as_matrix(vectors)
+
+    def _lookup(self, texts: list[str]) -> tuple[list, list[str]]:
+        """Cached vectors (None where missing) and the distinct texts still to embed"""
+        vectors = self.cache.get_many(self.model, texts) if self.cache is not None else [None] * len(texts)
+        # Embed each distinct uncached text once; copies that differ only in
+        # whitespace share a cache key, so they share the API call too
+        missing = list(dict.fromkeys(normalize_text(t) for t, v in zip(texts, vectors) if v is None))
+        return vectors, missing
+
+    def _batches(self, missing: list[str]) -> list[list[str]]:
+        return [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+
+    def _merge(self, texts: list[str], vectors: list, missing: list[str], results: list) -> list:
+        """Fill cache misses from the batch results and store them in the cache"""
+        embedded = [v for batch in results for v in batch]
+        if self.cache is not None:
+            self.cache.put_many(self.model, missing, embedded)
+        lookup = dict(zip(missing, embedded))
+        return [lookup[normalize_text(t)] if v is None else v for t, v in zip(texts, vectors)]
+
+    @staticmethod
+    def _as_matrix(vectors: list) -> np.ndarray:
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.asarray(vectors, dtype=np.float32)
+
+    async def _aembed_batch(self, batch: list[str], semaphore: asyncio.Semaphore) -> list[list[float]]:
+        """Async counterpart of _embed_batch using the client's embed_content_async"""
+        async def attempt():
+            async with semaphore:
+                await self.rate_limiter.acquire_async(sum(estimate_tokens(t) for t in batch))
+                result = await self._get_async_client().embed_content_async(model=self.model, content=batch)
+            return result["embedding"]
+
         try:
-            result = self.embedding_model.embed_content(text)
-            return result.embedding
+            embedded = await call_with_retry_async(attempt, max_attempts=self.max_attempts)
         except Exception as e:
-            print(f"Error generating embedding: {e}")
-            # Return a default embedding vector (you might want to handle this differently)
-            return [0.0] * 768  # Default dimension
+            raise EmbeddingError(f"Failed to embed batch of {len(batch)} texts: {e}") from e
+        if len(embedded) != len(batch):
+            raise EmbeddingError(f"Expected {len(batch)} embeddings, got {len(embedded)}")
+        return embedded
+
+    def _get_async_client(self) -> Any:
+        """Client shared by all coroutines on the running loop; async channels multiplex requests
+
+        Created through the pool, so it shows up in pool stats and is closed with it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = self.pool.create_detached()
+            self._async_loop = loop
+        return self._async_client
+
+    def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        """Embed one batch under the rate limiter, retrying 429/5xx with jittered backoff"""
+        def attempt():
+            self.rate_limiter.acquire(sum(estimate_tokens(t) for t in batch))
+            with self.pool.acquire() as client:
+                return client.embed_content(model=self.model, content=batch)["embedding"]
+
+        try:
+            embedded = call_with_retry(attempt, max_attempts=self.max_attempts)
+        except Exception as e:
+            raise EmbeddingError(f"Failed to embed batch of {len(batch)} texts: {e}") from e
+        if len(embedded) != len(batch):
+            raise EmbeddingError(f"Expected {len(batch)} embeddings, got {len(embedded)}")
+        return embedded
+
+# A sentence runs from its first non-space character through its closing
+# punctuation; text between terminators that is only whitespace is skipped
+SENTENCE_PATTERN = re.compile(r"[^.!?\s](?:[^.!?]*[^.!?\s])?[.!?]*")
+
+def windowed_similarities(vectors: np.ndarray, window_size: int = 1) -> np.ndarray:
+    """Cosine similarity across every gap between consecutive sentences.
+
+    Entry ``i`` compares the mean embedding of the ``window_size`` sentences
+    ending at ``i`` with the mean of the ``window_size`` sentences starting at
+    ``i + 1``. All gaps are computed at once from a cumulative sum, so the cost
+    is a handful of array operations regardless of the number of sentences.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    n = vectors.shape[0]
+    if n < 2:
+        return np.empty(0, dtype=np.float32)
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    prefix = np.zeros((n + 1, unit.shape[1]), dtype=np.float32)
+    np.cumsum(unit, axis=0, out=prefix[1:])
+
+    w = max(int(window_size), 1)
+    gap = np.arange(1, n)  # the right window starts at sentence `gap`
+    left = prefix[gap] - prefix[np.maximum(gap - w, 0)]
+    right = prefix[np.minimum(gap + w, n)] - prefix[gap]
+
+    dots = np.einsum("ij,ij->i", left, right)
+    denom = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    return np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
 
 class SimpleSemanticChunker:
-    """Simplified semantic chunker that works with Gemini embeddings"""
-    def __init__(self, embedding_model, threshold: float = 0.7, min_sentences: int = 3):
+    """Semantic chunker that splits where Gemini embeddings of neighbouring sentences diverge.
+
+    Without an embedding model it falls back to cutting every ~500 characters.
+    """
+    def __init__(
+        self,
+        embedding_model,
+        threshold: float = 0.7,
+        min_sentences: int = 3,
+        window_size: int = 1,
+        max_chunk_length: int = 2000,
+    ):
         self.embedding_model = embedding_model
         self.threshold = threshold
         self.min_sentences = min_sentences
-    
-    def chunk(self, text: str) -> list:
-        """Simple chunking based on sentence boundaries and length"""
-        # Split into sentences (simple approach)
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
+        self.window_size = window_size
+        self.max_chunk_length = max_chunk_length
+
+    def find_breakpoints(self, sentences: list[str]) -> np.ndarray:
+        """Flag each sentence that is followed by a drop in similarity below the threshold"""
+        if len(sentences) < 2:
+            return np.zeros(len(sentences), dtype=bool)
+        # One batched embedding call for the whole transcript
+        return self._breakpoints(self.embedding_model.embed_documents(sentences))
+
+    async def afind_breakpoints(self, sentences: list[str], semaphore: asyncio.Semaphore | None = None) -> np.ndarray:
+        """Async variant of find_breakpoints"""
+        if len(sentences) < 2:
+            return np.zeros(len(sentences), dtype=bool)
+        return self._breakpoints(await self.embedding_model.aembed_documents(sentences, semaphore=semaphore))
+
+    def _breakpoints(self, vectors: np.ndarray) -> np.ndarray:
+        breakpoints = np.zeros(len(vectors), dtype=bool)
+        breakpoints[:-1] = windowed_similarities(vectors, self.window_size) < self.threshold
+        return breakpoints
+
+    def sentence_spans(self, text: str) -> list[tuple[int, int]]:
+        """Character spans of each sentence in text, including its closing punctuation"""
+        return [m.span() for m in SENTENCE_PATTERN.finditer(text)]
+
+    def chunk_spans(self, text: str) -> list[tuple[int, int, int]]:
+        """Chunk text into (start_index, end_index, sentence_count) spans over the original string.
+
+        Offsets are real positions in text, so text[start:end] is the chunk. A
+        single pass over the sentence spans keeps this linear in text length.
+        """
+        return self.spans_from_sentences(text, self.sentence_spans(text))
+
+    def spans_from_sentences(self, text: str, spans: list[tuple[int, int]]) -> list[tuple[int, int, int]]:
+        """chunk_spans for sentence spans computed elsewhere, e.g. in a worker process"""
+        breakpoints = None
+        if self.embedding_model is not None:
+            breakpoints = self.find_breakpoints([text[s:e] for s, e in spans])
+        return self._assemble(spans, breakpoints)
+
+    async def achunk_spans(self, text: str, semaphore: asyncio.Semaphore | None = None) -> list[tuple[int, int, int]]:
+        """Async variant of chunk_spans that awaits the sentence embeddings"""
+        spans = self.sentence_spans(text)
+        breakpoints = None
+        if self.embedding_model is not None:
+            breakpoints = await self.afind_breakpoints([text[s:e] for s, e in spans], semaphore=semaphore)
+        return self._assemble(spans, breakpoints)
+
+    def _assemble(self, spans: list[tuple[int, int]], breakpoints: np.ndarray | None) -> list[tuple[int, int, int]]:
+        """Group sentence spans into chunk spans; breakpoints=None means length-based cuts"""
         chunks = []
-        current_chunk = []
+        chunk_start = 0  # index into spans of the first sentence in the current chunk
         current_length = 0
-        
-        for i, sentence in enumerate(sentences):
-            current_chunk.append(sentence)
-            current_length += len(sentence)
-            
+
+        for i, (start, end) in enumerate(spans):
+            current_length += end - start
+            sentence_count = i - chunk_start + 1
+
+            if breakpoints is not None:
+                natural_break = breakpoints[i] or current_length > self.max_chunk_length
+            else:
+                natural_break = current_length > 500
+
             # Create chunk if we have enough sentences or reach a natural break
-            if (len(current_chunk) >= self.min_sentences and 
-                (current_length > 500 or i == len(sentences) - 1)):
-                
-                chunk_text = ' '.join(current_chunk)
-                chunks.append({
-                    "text": chunk_text,
-                    "metadata": {
-                        "start_index": len(' '.join(sentences[:i-len(current_chunk)+1])),
-                        "end_index": len(' '.join(sentences[:i+1])),
-                        "sentence_count": len(current_chunk)
-                    }
-                })
-                
-                current_chunk = []
+            if (sentence_count >= self.min_sentences and
+                (natural_break or i == len(spans) - 1)):
+                chunks.append((spans[chunk_start][0], end, sentence_count))
+                chunk_start = i + 1
                 current_length = 0
-        
+
         # Handle any remaining text
-        if current_chunk:
-            chunk_text = ' '.join(current_chunk)
-            chunks.append({
-                "text": chunk_text,
+        if chunk_start < len(spans):
+            chunks.append((spans[chunk_start][0], spans[-1][1], len(spans) - chunk_start))
+
+        return chunks
+
+    def chunk(self, text: str) -> list:
+        """Chunk text at semantic boundaries between sentences"""
+        return self._to_dicts(text, self.chunk_spans(text))
+
+    async def achunk(self, text: str, semaphore: asyncio.Semaphore | None = None) -> list:
+        """Async variant of chunk"""
+        return self._to_dicts(text, await self.achunk_spans(text, semaphore=semaphore))
+
+    @staticmethod
+    def _to_dicts(text: str, spans: list[tuple[int, int, int]]) -> list:
+        return [
+            {
+                "text": text[start:end],
                 "metadata": {
-                    "start_index": len(' '.join(sentences[:-len(current_chunk)])),
-                    "end_index": len(' '.join(sentences)),
-                    "sentence_count": len(current_chunk)
+                    "start_index": start,
+                    "end_index": end,
+                    "sentence_count": sentence_count
                 }
-            })
-        
-        return chunks
+            }
+            for start, end, sentence_count in spans
+        ]
+
+class Chunk(BaseModel):
+    """Chunk class that's compatible with Pydantic"""
+    text: str
+    metadata: dict[str, Any]
+
+# Namespace for content-derived transcript IDs
+TRANSCRIPT_NAMESPACE = uuid.UUID("6f1c8a52-3b9e-5d4a-9c7e-2a4b8d0e1f37")
+
+def _as_datetime(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+def transcript_fingerprint(company: str, transcript_date: Any, text: str) -> str:
+    """SHA-256 of (company, date, text); equal for the same transcript across runs"""
+    parsed = _as_datetime(transcript_date)
+    date_key = parsed.isoformat() if parsed is not None else str(transcript_date)
+    digest = hashlib.sha256()
+    for part in (company, date_key, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+def transcript_id(company: str, transcript_date: Any, text: str) -> uuid.UUID:
+    """Deterministic transcript ID derived from its content fingerprint"""
+    return uuid.uuid5(TRANSCRIPT_NAMESPACE, transcript_fingerprint(company, transcript_date, text))
+
+class Transcript(BaseModel):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    text: str
+    company: str
+    date: datetime
+    quarter: str | None = None
+    chunks: list[Chunk] | None = None
+
+    @model_validator(mode="after")
+    def _content_addressed_id(self) -> "Transcript":
+        # Unless an ID is given, derive it from the content so re-runs agree
+        if "id" not in self.model_fields_set:
+            self.id = transcript_id(self.company, self.date, self.text)
+        return self
+
+class _Pending:
+    """A transcript submitted for chunking, with what the ledger needs to record it"""
+    __slots__ = ("transcript_id", "content_hash", "company", "date", "future")
+
+    def __init__(self, transcript_id: uuid.UUID, content_hash: str, company: str, date_key: str):
+        self.transcript_id = transcript_id
+        self.content_hash = content_hash
+        self.company = company
+        self.date = date_key
+        self.future = None
+
+    @classmethod
+    def for_record(cls, company: str, transcript_date: Any, text: str) -> "_Pending":
+        fingerprint = transcript_fingerprint(company, transcript_date, text)
+        parsed = _as_datetime(transcript_date)
+        return cls(
+            uuid.uuid5(TRANSCRIPT_NAMESPACE, fingerprint),
+            fingerprint,
+            company,
+            parsed.isoformat() if parsed is not None else str(transcript_date),
+        )
+
+    def record(self, ledger: sqlite3.Connection, status: str, chunk_count: int | None = None, error: str | None = None) -> None:
+        record_ingestion(
+            ledger,
+            transcript_id=str(self.transcript_id),
+            content_hash=self.content_hash,
+            company=self.company,
+            date=self.date,
+            status=status,
+            chunk_count=chunk_count,
+            error=error,
+        )
+
+def record_failed_transcript(ledger: sqlite3.Connection, company: str, transcript_date: Any, text: str, error: BaseException) -> None:
+    """Record a transcript that could not be chunked, as the chunkers' ledger mode does"""
+    _Pending.for_record(company, transcript_date, text).record(ledger, "failed", error=str(error))
 
 class GeminiChunker:
-    def __init__(self, api_key: str = None, model: str = "models/embedding-001"):
+    def __init__(
+        self,
+        api_key: str = None,
+        model: str = "models/embedding-001",
+        embedding_cache: EmbeddingCache | None = None,
+        embedding_client: Any = None,
+        pool_size: int = 16,
+    ):
         self.api_key = api_key
         self.model = model
+        self.embedding_cache = embedding_cache
+        self.embedding_client = embedding_client
+        self.pool_size = pool_size
+        self._embeddings = None
+        self._embeddings_lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> GeminiEmbeddings:
+        """Embedding client shared by every worker, created once on first use"""
+        if self._embeddings is None:
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    self._embeddings = GeminiEmbeddings(
+                        api_key=self.api_key,
+                        model=self.model,
+                        cache=self.embedding_cache,
+                        client=self.embedding_client,
+                        pool_size=self.pool_size,
+                    )
+        return self._embeddings
+
+    def pool_stats(self) -> dict:
+        """Utilization of the embedding connection pool"""
+        return self.embeddings.pool.stats()
+
+    def close(self) -> None:
+        """Close the pooled embedding connections"""
+        with self._embeddings_lock:
+            if self._embeddings is not None:
+                self._embeddings.close()
+                self._embeddings = None
+
+    def __enter__(self) -> "GeminiChunker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
     
     def find_quarter(self, text: str) -> str | None:
-        search_results = re.findall(r"[Q]\d\s\d{4}", text)
-
-        if search_results:
-            quarter = str(search_results[0])
-            return quarter
-        
-        return None
+        """First fiscal quarter named near the start of the text, as "Q1 2024"."""
+        found = find_fiscal_quarter(text)
+        return quarter_label(*found) if found else None
     
     def generate_transcripts_and_chunks(
         self,
@@ -112,47 +525,77 @@ class GeminiChunker:
         threshold_value: float = 0.7,
         min_sentences: int = 3,
         num_workers: int = 50,
+        ordered: bool = True,
+        ledger: sqlite3.Connection | None = None,
     ) -> list:
-        # Import Transcript class here to avoid circular imports
-        from datetime import datetime
-        import uuid
-        from pydantic import BaseModel, Field
-        
-        class Chunk(BaseModel):
-            """Chunk class that's compatible with Pydantic"""
-            text: str
-            metadata: dict[str, Any]
-        
-        class Transcript(BaseModel):
-            id: uuid.UUID = Field(default_factory=uuid.uuid4)
-            text: str
-            company: str
-            date: datetime
-            quarter: str | None = None
-            chunks: list[Chunk] | None = None
-        
-        transcripts = [
-            Transcript(
+        transcripts = self.iter_transcripts_and_chunks(
+            dataset,
+            company=company,
+            text_key=text_key,
+            company_key=company_key,
+            date_key=date_key,
+            threshold_value=threshold_value,
+            min_sentences=min_sentences,
+            num_workers=num_workers,
+            ordered=ordered,
+            ledger=ledger,
+        )
+        return list(tqdm(
+            transcripts,
+            total=len(dataset) if hasattr(dataset, "__len__") and not company else None,
+            desc="Generating Semantic Chunks with Gemini"
+        ))
+
+    def iter_transcripts_and_chunks(
+        self,
+        dataset: Iterable[dict],
+        company: list[str] | None = None,
+        text_key: str = "transcript",
+        company_key: str = "company",
+        date_key: str = "date",
+        threshold_value: float = 0.7,
+        min_sentences: int = 3,
+        num_workers: int = 50,
+        ordered: bool = True,
+        max_in_flight: int | None = None,
+        ledger: sqlite3.Connection | None = None,
+    ) -> Iterator[Transcript]:
+        """Stream chunked transcripts from any iterable dataset
+
+        Records are pulled from ``dataset`` lazily and at most ``max_in_flight``
+        (default ``2 * num_workers``) are held at once, so memory stays flat for
+        generators and streaming ``datasets`` splits of any size. With
+        ``ordered=True`` transcripts are yielded in input order, otherwise as
+        soon as each one completes.
+
+        With a ``ledger`` connection (see ``db_interface.create_tables``),
+        transcripts already recorded as done are skipped, and each yielded
+        transcript is recorded once the consumer asks for the next one. A
+        re-run therefore only processes new or changed transcripts, and an
+        interrupted run resumes where it stopped.
+        """
+        done_ids = get_completed_transcript_ids(ledger) if ledger is not None else set()
+        if max_in_flight is None:
+            max_in_flight = 2 * num_workers
+        max_in_flight = max(max_in_flight, 1)
+
+        # Built once before any worker starts; the chunker is stateless and the
+        # embeddings client hands each request its own pooled connection
+        chunker = SimpleSemanticChunker(
+            embedding_model=self.embeddings,
+            threshold=threshold_value,
+            min_sentences=max(min_sentences, 1),
+        )
+
+        def _process(d, t_id: uuid.UUID) -> Transcript:
+            t = Transcript(
+                id=t_id,
                 text=d[text_key],
                 company=d[company_key],
                 date=d[date_key],
                 quarter=self.find_quarter(d[text_key]),
             )
-            for d in dataset
-        ]
-
-        if company:
-            transcripts = [t for t in transcripts if t.company in company]
-
-        def _process(t) -> Transcript:
-            if not hasattr(_process, "chunker"):
-                embed_model = GeminiEmbeddings(api_key=self.api_key, model=self.model)
-                _process.chunker = SimpleSemanticChunker(
-                    embedding_model=embed_model,
-                    threshold=threshold_value,
-                    min_sentences=max(min_sentences, 1),
-                )
-            semantic_chunks = _process.chunker.chunk(t.text)
+            semantic_chunks = chunker.chunk(t.text)
             t.chunks = [
                 Chunk(
                     text=c["text"],
@@ -162,18 +605,160 @@ class GeminiChunker:
             ]
 
             return t
-        
+
         with ThreadPoolExecutor(max_workers=num_workers) as pool:
-            futures = [pool.submit(_process, t) for t in transcripts]
-            transcripts = [
-                f.result()
-                for f in tqdm(
-                    as_completed(futures),
-                    total=len(futures),
-                    desc="Generating Semantic Chunks with Gemini"
+            in_flight: deque[_Pending] = deque()
+            try:
+                for d in dataset:
+                    if company and d[company_key] not in company:
+                        continue
+                    entry = _Pending.for_record(d[company_key], d[date_key], d[text_key])
+                    if str(entry.transcript_id) in done_ids:
+                        continue
+                    entry.future = pool.submit(_process, d, entry.transcript_id)
+                    in_flight.append(entry)
+                    if len(in_flight) >= max_in_flight:
+                        yield from self._drain(in_flight, ordered, max_in_flight - 1, ledger)
+                yield from self._drain(in_flight, ordered, 0, ledger)
+            finally:
+                for entry in in_flight:
+                    entry.future.cancel()
+
+    @staticmethod
+    def _drain(
+        in_flight: deque,
+        ordered: bool,
+        until: int,
+        ledger: sqlite3.Connection | None,
+    ) -> Iterator[Transcript]:
+        """Yield finished results until at most ``until`` futures remain in flight"""
+        while len(in_flight) > until:
+            if ordered:
+                finished = [in_flight.popleft()]
+            else:
+                done, _ = wait([entry.future for entry in in_flight], return_when=FIRST_COMPLETED)
+                finished = [entry for entry in in_flight if entry.future in done]
+                for entry in finished:
+                    in_flight.remove(entry)
+
+            for entry in finished:
+                try:
+                    t = entry.future.result()
+                except Exception as e:
+                    if ledger is not None:
+                        entry.record(ledger, "failed", error=str(e))
+                    raise
+                yield t
+                # Only recorded once the consumer has moved past this transcript
+                if ledger is not None:
+                    entry.record(ledger, "done", chunk_count=len(t.chunks or []))
+
+    async def aiter_transcripts_and_chunks(
+        self,
+        dataset: Any,
+        company: list[str] | None = None,
+        text_key: str = "transcript",
+        company_key: str = "company",
+        date_key: str = "date",
+        threshold_value: float = 0.7,
+        min_sentences: int = 3,
+        max_in_flight: int = 256,
+        embedding_concurrency: int = 32,
+        ledger: sqlite3.Connection | None = None,
+    ) -> AsyncIterator[Transcript]:
+        """Chunk transcripts on asyncio, yielding each one as soon as it finishes
+
+        At most ``max_in_flight`` transcripts are being processed at once and
+        at most ``embedding_concurrency`` embedding requests are outstanding,
+        independent of how many transcripts are waiting on them. ``ledger``
+        works as in iter_transcripts_and_chunks.
+        """
+        done_ids = get_completed_transcript_ids(ledger) if ledger is not None else set()
+        chunker = SimpleSemanticChunker(
+            embedding_model=self.embeddings,
+            threshold=threshold_value,
+            min_sentences=max(min_sentences, 1),
+        )
+        embedding_semaphore = asyncio.Semaphore(embedding_concurrency)
+
+        async def _process(t: Transcript) -> Transcript:
+            semantic_chunks = await chunker.achunk(t.text, semaphore=embedding_semaphore)
+            t.chunks = [Chunk(text=c["text"], metadata=c["metadata"]) for c in semantic_chunks]
+            return t
+
+        pending: dict[asyncio.Task, _Pending] = {}
+
+        async def _finish(done) -> AsyncIterator[Transcript]:
+            for task in done:
+                entry = pending.pop(task)
+                try:
+                    t = task.result()
+                except Exception as e:
+                    if ledger is not None:
+                        entry.record(ledger, "failed", error=str(e))
+                    raise
+                yield t
+                if ledger is not None:
+                    entry.record(ledger, "done", chunk_count=len(t.chunks or []))
+
+        try:
+            for d in dataset:
+                if company and d[company_key] not in company:
+                    continue
+                entry = _Pending.for_record(d[company_key], d[date_key], d[text_key])
+                if str(entry.transcript_id) in done_ids:
+                    continue
+                t = Transcript(
+                    id=entry.transcript_id,
+                    text=d[text_key],
+                    company=d[company_key],
+                    date=d[date_key],
+                    quarter=self.find_quarter(d[text_key]),
                 )
-            ]
+                pending[asyncio.ensure_future(_process(t))] = entry
+                if len(pending) >= max_in_flight:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    async for t in _finish(done):
+                        yield t
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                async for t in _finish(done):
+                    yield t
+        finally:
+            for task in pending:
+                task.cancel()
 
+    async def agenerate_transcripts_and_chunks(
+        self,
+        dataset: Any,
+        company: list[str] | None = None,
+        text_key: str = "transcript",
+        company_key: str = "company",
+        date_key: str = "date",
+        threshold_value: float = 0.7,
+        min_sentences: int = 3,
+        max_in_flight: int = 256,
+        embedding_concurrency: int = 32,
+        ledger: sqlite3.Connection | None = None,
+    ) -> list:
+        """Async counterpart of generate_transcripts_and_chunks"""
+        transcripts = []
+        with tqdm(desc="Generating Semantic Chunks with Gemini") as progress:
+            async for t in self.aiter_transcripts_and_chunks(
+                dataset,
+                company=company,
+                text_key=text_key,
+                company_key=company_key,
+                date_key=date_key,
+                threshold_value=threshold_value,
+                min_sentences=min_sentences,
+                max_in_flight=max_in_flight,
+                embedding_concurrency=embedding_concurrency,
+                ledger=ledger,
+            ):
+                transcripts.append(t)
+                progress.update()
         return transcripts
 
 # Example usage:
@@ -0,0 +1,501 @@
+"""
+Staged pipeline executor separating I/O-bound from CPU-bound work.
+
+GeminiChunker runs sentence splitting, quarter detection and fingerprinting
+in the same thread pool as its embedding calls, so that CPU work serializes
+on the GIL. A Pipeline is a chain of stages, each with its own executor:
+
+- "io" stages (embedding and LLM calls) run on a thread pool.
+- "cpu" stages run on a process pool. Items are sent in batches of
+  ``batch_size`` per task to amortize inter-process overhead. With
+  ``shared_text=True``, the texts of a batch are written once into a
+  shared-memory block, and workers decode them from there instead of
+  receiving pickled copies through the pool's pipe.
+
+Stages are connected by bounded queues, and each stage bounds its submitted
+but uncollected tasks. A slow stage therefore stalls the ones before it
+instead of letting work pile up in memory. Every stage collects results in
+submission order, so items come out in input order.
+
+Example:
+    pipeline = Pipeline([
+        Stage(split_sentences, kind="cpu", batch_size=16, shared_text=True, text_key="text"),
+        Stage(embed_sentences, kind="io", workers=32),
+    ])
+    for item in pipeline.run(records):
+        ...
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, Iterator, Optional
+from uuid import uuid5
+
+import numpy as np
+
+from db_interface import get_completed_transcript_ids, record_ingestion
+from gemini_chunker import (
+    SENTENCE_PATTERN,
+    TRANSCRIPT_NAMESPACE,
+    Chunk,
+    GeminiChunker,
+    SimpleSemanticChunker,
+    Transcript,
+    record_failed_transcript,
+    transcript_fingerprint,
+)
+from transcript_metadata import find_fiscal_quarter, quarter_label
+
+KINDS = ("io", "cpu")
+
+_DONE = object()
+
+class _Failure:
+    """Carries a stage's exception downstream to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+class Stage:
+    """
+    One step of a Pipeline.
+
+    Args:
+        fn (Callable): Function applied to each item. Functions of "cpu"
+            stages run in worker processes and must be picklable, i.e.
+            defined at module level.
+        kind (str): "io" (thread pool) or "cpu" (process pool)
+        workers (int, optional): Threads or processes; 8 threads for "io",
+            the CPU count for "cpu"
+        batch_size (int): Items per process-pool task ("cpu" only)
+        max_pending (int, optional): Submitted tasks not yet collected,
+            2 * workers by default
+        shared_text (bool): Send item texts through shared memory ("cpu" only)
+        text_key (str, optional): With shared_text, the dict field holding
+            the text; None when the items are the texts themselves
+        merge (Callable, optional): ``merge(item, result)`` builds the next
+            item in the main process; the result replaces the item by
+            default, and None drops the item
+        name (str, optional): Name used in stats()
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[Any], Any],
+        kind: str = "io",
+        workers: Optional[int] = None,
+        batch_size: int = 16,
+        max_pending: Optional[int] = None,
+        shared_text: bool = False,
+        text_key: Optional[str] = None,
+        merge: Optional[Callable[[Any, Any], Any]] = None,
+        name: Optional[str] = None,
+    ):
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}")
+        self.fn = fn
+        self.kind = kind
+        self.workers = max(workers or (os.cpu_count() or 1 if kind == "cpu" else 8), 1)
+        self.batch_size = max(batch_size, 1) if kind == "cpu" else 1
+        self.max_pending = max(max_pending or 2 * self.workers, 1)
+        self.shared_text = shared_text and kind == "cpu"
+        self.text_key = text_key
+        self.merge = merge
+        self.name = name or getattr(fn, "__name__", kind)
+
+        self.items = 0
+        self.tasks = 0
+        self.shared_bytes = 0
+
+def _apply(fn: Callable, items: list) -> list:
+    return [fn(item) for item in items]
+
+def _apply_shared(fn: Callable, items: list, text_key: Optional[str], block: str, layout: list) -> list:
+    """Process-pool task: restore each item's text from shared memory, then apply fn."""
+    shm = shared_memory.SharedMemory(block)
+    try:
+        for i, (start, end) in enumerate(layout):
+            view = shm.buf[start:end]
+            try:
+                text = str(view, "utf-8")
+            finally:
+                view.release()
+            if text_key is None:
+                items[i] = text
+            else:
+                items[i][text_key] = text
+    finally:
+        shm.close()
+    return _apply(fn, items)
+
+class Pipeline:
+    """
+    Runs items through a chain of stages with bounded queues between them.
+
+    Args:
+        stages (list[Stage]): Stages in order
+        queue_size (int): Capacity of the queue in front of each stage
+    """
+
+    def __init__(self, stages: list, queue_size: int = 256):
+        if not stages:
+            raise ValueError("a pipeline needs at least one stage")
+        self.stages = list(stages)
+        self.queue_size = max(queue_size, 1)
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Process items, yielding results in input order.
+
+        Items are pulled from ``items`` only as fast as the stages drain
+        them. Any stage error is raised here, and closing the iterator early
+        stops the pipeline.
+
+        Args:
+            items (Iterable): Input items
+
+        Yields:
+            Output of the last stage (after merge) for each item not dropped
+        """
+        stop = threading.Event()
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        executors = [
+            ProcessPoolExecutor(stage.workers) if stage.kind == "cpu" else ThreadPoolExecutor(stage.workers)
+            for stage in self.stages
+        ]
+        threads = [threading.Thread(target=self._feed, args=(items, queues[0], stop), daemon=True)]
+        submitters, pendings = [], []
+        for stage, executor, inbox, outbox in zip(self.stages, executors, queues, queues[1:]):
+            pending = queue.Queue(stage.max_pending)
+            pendings.append(pending)
+            submitters.append(threading.Thread(
+                target=self._submit, args=(stage, executor, inbox, pending, stop), daemon=True
+            ))
+            threads.append(threading.Thread(
+                target=self._collect, args=(stage, pending, outbox, stop), daemon=True
+            ))
+        for thread in threads + submitters:
+            thread.start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            for executor in executors:
+                executor.shutdown(wait=False, cancel_futures=True)
+            for thread in threads:
+                thread.join(timeout=1.0)
+            # Submit threads exit within one poll of stop. A task they queued
+            # after their collector drained on stop is freed here.
+            for thread in submitters:
+                thread.join()
+            for pending in pendings:
+                self._drain(pending)
+
+    def stats(self) -> list:
+        """
+        Report work done per stage.
+
+        Returns:
+            list: One dict per stage with its name, kind, items, tasks and
+            bytes sent through shared memory
+        """
+        return [
+            {
+                "name": stage.name,
+                "kind": stage.kind,
+                "items": stage.items,
+                "tasks": stage.tasks,
+                "shared_bytes": stage.shared_bytes,
+            }
+            for stage in self.stages
+        ]
+
+    @staticmethod
+    def _put(outbox: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        # Blocking put that gives up once the pipeline is stopping
+        while not stop.is_set():
+            try:
+                outbox.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(inbox: queue.Queue, stop: threading.Event) -> Any:
+        while not stop.is_set():
+            try:
+                return inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, items: Iterable[Any], outbox: queue.Queue, stop: threading.Event) -> None:
+        try:
+            for item in items:
+                if not self._put(outbox, item, stop):
+                    return
+        except Exception as e:
+            self._put(outbox, _Failure(e), stop)
+            return
+        self._put(outbox, _DONE, stop)
+
+    def _submit(self, stage: Stage, executor, inbox: queue.Queue, pending: queue.Queue, stop: threading.Event) -> None:
+        while True:
+            item = self._get(inbox, stop)
+            if item is _DONE or isinstance(item, _Failure):
+                self._put(pending, (item, None, None), stop)
+                return
+
+            # Take whatever else is already waiting, up to a full batch
+            batch = [item]
+            end = None
+            while len(batch) < stage.batch_size:
+                try:
+                    nxt = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _DONE or isinstance(nxt, _Failure):
+                    end = nxt
+                    break
+                batch.append(nxt)
+
+            block = None
+            try:
+                if stage.kind == "io":
+                    future = executor.submit(stage.fn, batch[0])
+                elif stage.shared_text:
+                    block, args = self._share(stage, batch)
+                    future = executor.submit(_apply_shared, stage.fn, *args)
+                else:
+                    future = executor.submit(_apply, stage.fn, batch)
+            except Exception as e:
+                # E.g. the executor was shut down because the pipeline stopped
+                _release(block)
+                block = None
+                future = Future()
+                future.set_exception(e)
+            stage.tasks += 1
+            if not self._put(pending, (batch, future, block), stop):
+                _release(block)
+                return
+            if end is not None:
+                self._put(pending, (end, None, None), stop)
+                return
+
+    @staticmethod
+    def _share(stage: Stage, batch: list) -> tuple:
+        """Write the batch's texts into one shared-memory block and strip them from the items."""
+        encoded = [(item if stage.text_key is None else item[stage.text_key]).encode("utf-8") for item in batch]
+        size = sum(len(text) for text in encoded)
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        layout = []
+        offset = 0
+        for text in encoded:
+            block.buf[offset:offset + len(text)] = text
+            layout.append((offset, offset + len(text)))
+            offset += len(text)
+        stage.shared_bytes += size
+        if stage.text_key is None:
+            items = [None] * len(batch)
+        else:
+            items = [{k: v for k, v in item.items() if k != stage.text_key} for item in batch]
+        return block, (items, stage.text_key, block.name, layout)
+
+    def _collect(self, stage: Stage, pending: queue.Queue, outbox: queue.Queue, stop: threading.Event) -> None:
+        try:
+            while True:
+                entry = self._get(pending, stop)
+                if entry is _DONE:
+                    return
+                batch, future, block = entry
+                if future is None:
+                    # End of input, or a failure from upstream
+                    self._put(outbox, batch, stop)
+                    return
+                try:
+                    result = future.result()
+                except BaseException as e:
+                    self._put(outbox, _Failure(e), stop)
+                    stop.set()
+                    return
+                finally:
+                    _release(block)
+
+                results = [result] if stage.kind == "io" else result
+                for item, output in zip(batch, results):
+                    stage.items += 1
+                    try:
+                        nxt = output if stage.merge is None else stage.merge(item, output)
+                    except Exception as e:
+                        self._put(outbox, _Failure(e), stop)
+                        stop.set()
+                        return
+                    if nxt is not None and not self._put(outbox, nxt, stop):
+                        return
+        finally:
+            self._drain(pending)
+
+    @staticmethod
+    def _drain(pending: queue.Queue) -> None:
+        # Free the shared memory of tasks abandoned when the pipeline stopped
+        while True:
+            try:
+                _, _, block = pending.get_nowait()
+            except queue.Empty:
+                return
+            _release(block)
+
+def _release(block: Optional[shared_memory.SharedMemory]) -> None:
+    if block is not None:
+        block.close()
+        block.unlink()
+
+def prepare_transcript(record: dict) -> dict:
+    """
+    CPU stage of chunk_transcripts: sentence spans, quarter and content ID of a record.
+
+    Args:
+        record (dict): {"text", "company", "date"}
+
+    Returns:
+        dict: "sentences" as an (n, 2) int64 array of spans, "quarter" label,
+        "fingerprint" and "id" (as transcript_id computes them)
+    """
+    text = record["text"]
+    spans = np.array([m.span() for m in SENTENCE_PATTERN.finditer(text)], dtype=np.int64).reshape(-1, 2)
+    found = find_fiscal_quarter(text)
+    fingerprint = transcript_fingerprint(record["company"], record["date"], text)
+    return {
+        "sentences": spans,
+        "quarter": quarter_label(*found) if found else None,
+        "fingerprint": fingerprint,
+        "id": str(uuid5(TRANSCRIPT_NAMESPACE, fingerprint)),
+    }
+
+def _prepare_or_error(record: dict) -> dict:
+    # A failure travels with its transcript, so chunk_transcripts can record
+    # it in the ledger before raising
+    try:
+        return prepare_transcript(record)
+    except Exception as e:
+        return {"error": e}
+
+def chunk_transcripts(
+    chunker: GeminiChunker,
+    dataset: Iterable[dict],
+    company: Optional[list] = None,
+    text_key: str = "transcript",
+    company_key: str = "company",
+    date_key: str = "date",
+    threshold_value: float = 0.7,
+    min_sentences: int = 3,
+    processes: Optional[int] = None,
+    io_workers: int = 32,
+    batch_size: int = 16,
+    queue_size: int = 256,
+    ledger=None,
+) -> Iterator[Transcript]:
+    """
+    Chunk transcripts like GeminiChunker.iter_transcripts_and_chunks, with the
+    CPU work in a process pool.
+
+    Sentence splitting, quarter detection and fingerprinting run in
+    ``processes`` worker processes, with transcript texts passed through
+    shared memory. Embedding requests and breakpoint assembly run on
+    ``io_workers`` threads. Transcript and Chunk models are built as
+    results are consumed.
+
+    Args:
+        chunker (GeminiChunker): Source of the embeddings client
+        dataset (Iterable[dict]): Transcript records
+        company (list, optional): Only process these companies
+        text_key, company_key, date_key (str): Record fields
+        threshold_value (float): Similarity threshold for semantic breaks
+        min_sentences (int): Minimum sentences per chunk
+        processes (int, optional): Worker processes, defaults to the CPU count
+        io_workers (int): Threads making embedding requests
+        batch_size (int): Transcripts per process-pool task
+        queue_size (int): Transcripts buffered in front of each stage
+        ledger (sqlite3.Connection, optional): Skip transcripts recorded as
+            done, record each yielded transcript once the consumer moves on,
+            and record a transcript that fails as "failed" before raising
+
+    Yields:
+        Transcript: Chunked transcripts in input order
+    """
+    done_ids = get_completed_transcript_ids(ledger) if ledger is not None else set()
+    semantic = SimpleSemanticChunker(
+        embedding_model=chunker.embeddings,
+        threshold=threshold_value,
+        min_sentences=max(min_sentences, 1),
+    )
+
+    def records():
+        for d in dataset:
+            if company and d[company_key] not in company:
+                continue
+            yield {"text": d[text_key], "company": d[company_key], "date": d[date_key]}
+
+    def prepared(record: dict, result: dict) -> Optional[dict]:
+        if "error" not in result and result["id"] in done_ids:
+            return None
+        return {**record, **result}
+
+    def embed(item: dict) -> dict:
+        if "error" in item:
+            return item
+        try:
+            item["chunks"] = semantic.spans_from_sentences(item["text"], item.pop("sentences").tolist())
+        except Exception as e:
+            item["error"] = e
+        return item
+
+    pipeline = Pipeline(
+        [
+            Stage(
+                _prepare_or_error, kind="cpu", workers=processes, batch_size=batch_size,
+                shared_text=True, text_key="text", merge=prepared, name="prepare",
+            ),
+            Stage(embed, kind="io", workers=io_workers, name="embed"),
+        ],
+        queue_size=queue_size,
+    )
+    for item in pipeline.run(records()):
+        if "error" in item:
+            if ledger is not None:
+                record_failed_transcript(ledger, item["company"], item["date"], item["text"], item["error"])
+            raise item["error"]
+        text = item["text"]
+        t = Transcript(
+            id=item["id"],
+            text=text,
+            company=item["company"],
+            date=item["date"],
+            quarter=item["quarter"],
+            chunks=[
+                Chunk(text=text[start:end], metadata={"start_index": start, "end_index": end, "sentence_count": count})
+                for start, end, count in item["chunks"]
+            ],
+        )
+        yield t
+        if ledger is not None:
+            record_ingestion(
+                ledger,
+                transcript_id=str(t.id),
+                content_hash=item["fingerprint"],
+                company=t.company,
+                date=t.date.isoformat(),
+                status="done",
+                chunk_count=len(t.chunks),
+            )
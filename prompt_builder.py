@@ -0,0 +1,144 @@
+"""
+Precompiled, memoized rendering of the statement extraction prompt.
+
+Rendering ``statement_extraction_prompt`` with Jinja parses the template,
+runs the ``tidy`` macro and expands LABEL_DEFINITIONS and the JSON schema
+every time, although only the ``inputs`` block changes between chunks.
+PromptBuilder renders the template once per (template, definitions, schema)
+version, cuts the output around the inputs block, and then builds each
+prompt by string concatenation.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Mapping, Optional
+
+from jinja2 import Template
+
+from data_model import LABEL_DEFINITIONS, RawStatementList
+from rate_limit import estimate_tokens
+from statement import statement_extraction_prompt
+
+_cache_lock = threading.Lock()
+_rendered: dict[str, tuple[str, str, str, str]] = {}
+
+def prompt_version(template: str, definitions: Any, json_schema: str) -> str:
+    """
+    Short hash identifying a prompt: changes whenever the template,
+    definitions or schema change.
+    """
+    digest = hashlib.sha256()
+    for part in (template, json.dumps(definitions, sort_keys=True, default=str), json_schema):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:16]
+
+def _input_line(key: str, value: Any) -> str:
+    # Matches "- {{ key }}: {{val}}" in the template's inputs loop
+    return f"- {key}: {value}"
+
+def _render_parts(template: str, definitions: Any, json_schema: str) -> tuple[str, str, str, str]:
+    """
+    Render the template once without inputs and once each with one and two
+    stand-in inputs, then cut out the text around and between input lines.
+
+    Returns:
+        tuple: (no-inputs prompt, text before the first input line, text
+        between input lines, text after the last input line)
+    """
+    compiled = Template(template)
+    first, second = _input_line("\x00a", "\x00a"), _input_line("\x00b", "\x00b")
+
+    def render(inputs):
+        return compiled.render(inputs=inputs, definitions=definitions, json_schema=json_schema)
+
+    static = render(None)
+    one = render({"\x00a": "\x00a"})
+    two = render({"\x00a": "\x00a", "\x00b": "\x00b"})
+    if one.count(first) != 1 or two.count(second) != 1:
+        raise ValueError("template must render each input as a '- key: value' line exactly once")
+    before, after = one.split(first)
+    glue = two.split(first)[1].split(second)[0]
+    if two != before + first + glue + second + after:
+        raise ValueError("could not isolate the inputs block of the template")
+    return static, before, glue, after
+
+class PromptBuilder:
+    """
+    Builds extraction prompts from a once-rendered template.
+
+    Output is identical to rendering the Jinja template with the same
+    inputs, definitions and schema.
+
+    Args:
+        template (str): Jinja source, statement_extraction_prompt by default
+        definitions (Mapping): Label definitions, LABEL_DEFINITIONS by default
+        json_schema (str, optional): Output schema text, RawStatementList's JSON schema by default
+        suffix (str): Static text appended after the rendered template
+        token_counter (Callable[[str], int]): Token counting function for budgets
+    """
+
+    def __init__(
+        self,
+        template: str = statement_extraction_prompt,
+        definitions: Optional[Mapping] = None,
+        json_schema: Optional[str] = None,
+        suffix: str = "",
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ):
+        self.definitions = LABEL_DEFINITIONS if definitions is None else definitions
+        self.json_schema = json_schema if json_schema is not None else json.dumps(RawStatementList.model_json_schema())
+        self.suffix = suffix
+        self.count_tokens = token_counter
+        self.version = prompt_version(template + suffix, self.definitions, self.json_schema)
+
+        with _cache_lock:
+            parts = _rendered.get(self.version)
+        if parts is None:
+            parts = _render_parts(template, self.definitions, self.json_schema)
+            with _cache_lock:
+                _rendered[self.version] = parts
+        self._static, self._before, self._glue, self._after = parts
+
+        # The prompt with no inputs: identical for every request, so it is
+        # the part provider prompt caching can reuse
+        self.prefix = self._static + suffix
+        self.prefix_tokens = self.count_tokens(self.prefix)
+
+    def inputs_block(self, inputs: Optional[Mapping[str, Any]]) -> str:
+        """The input lines as the template's inputs loop renders them."""
+        return self._glue.join(_input_line(key, value) for key, value in (inputs or {}).items())
+
+    def render(self, inputs: Optional[Mapping[str, Any]] = None) -> str:
+        """
+        Full prompt for one chunk's inputs, as the template would render it.
+
+        Args:
+            inputs (Mapping, optional): Prompt inputs such as main_entity
+
+        Returns:
+            str: Rendered prompt
+        """
+        if not inputs:
+            return self.prefix
+        return self._before + self.inputs_block(inputs) + self._after + self.suffix
+
+    def token_counts(self, text: str, inputs: Optional[Mapping[str, Any]] = None) -> dict:
+        """
+        Token budget of one chunk's prompt.
+
+        Args:
+            text (str): Chunk text sent with the prompt
+            inputs (Mapping, optional): Prompt inputs
+
+        Returns:
+            dict: prefix, inputs and chunk token counts and their total
+        """
+        counts = {
+            "prefix": self.prefix_tokens,
+            "inputs": self.count_tokens(self.inputs_block(inputs)) if inputs else 0,
+            "chunk": self.count_tokens(text),
+        }
+        counts["total"] = sum(counts.values())
+        return counts
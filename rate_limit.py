@@ -0,0 +1,200 @@
+"""
+Client-side rate limiting and retry helpers for external API calls.
+
+Both the embedding client and the statement extraction engine talk to
+services with per-minute request and token quotas. A token bucket per quota
+keeps concurrent workers under those limits, and retries with jittered
+exponential backoff absorb the 429/5xx responses that still get through.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate used for quota accounting (about 4 characters per token).
+
+    Args:
+        text (str): Text that will be sent to the API
+
+    Returns:
+        int: Estimated token count, at least 1
+    """
+    return max(1, len(text) // 4)
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of blocking.
+
+    reserve() always succeeds and returns how long the caller must wait
+    before using what it reserved, so the same bucket serves threads and
+    coroutines alike.
+
+    Args:
+        rate_per_minute (float): Sustained refill rate
+        capacity (float, optional): Burst size. Defaults to one minute of quota.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Take amount tokens from the bucket, going into debt if necessary.
+
+        Args:
+            amount (float): Number of tokens to take
+
+        Returns:
+            float: Seconds to wait before the reservation may be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+class RateLimiter:
+    """
+    Combined requests-per-minute and tokens-per-minute limiter.
+
+    Args:
+        requests_per_minute (float, optional): Request quota, None for unlimited
+        tokens_per_minute (float, optional): Token quota, None for unlimited
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def _reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block the calling thread until one request of the given size is allowed.
+
+        Args:
+            tokens (int): Estimated tokens in the request
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """
+        Suspend the calling coroutine until one request of the given size is allowed.
+
+        Args:
+            tokens (int): Estimated tokens in the request
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """
+    Decide whether an API error is transient (rate limited or server side).
+
+    Works with google.api_core exceptions, HTTP client errors and test doubles
+    that expose a numeric ``code`` or ``status_code`` attribute.
+
+    Args:
+        exc (BaseException): Error raised by the API call
+
+    Returns:
+        bool: True if the call should be retried
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    for attr in ("code", "status_code"):
+        code = getattr(exc, attr, None)
+        if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+            return True
+    return False
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 60.0) -> float:
+    """
+    Full-jitter exponential backoff delay for a retry attempt.
+
+    Args:
+        attempt (int): Zero-based retry attempt number
+        base_delay (float): Delay scale in seconds
+        max_delay (float): Upper bound on the delay in seconds
+
+    Returns:
+        float: Seconds to sleep before the next attempt
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+def call_with_retry(
+    fn: Callable[[], T],
+    max_attempts: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    is_retryable: Callable[[BaseException], bool] = is_retryable_error,
+) -> T:
+    """
+    Call fn, retrying transient failures with jittered exponential backoff.
+
+    Args:
+        fn (Callable): Zero-argument function performing the API call
+        max_attempts (int): Total attempts including the first one
+        base_delay (float): Backoff scale in seconds
+        max_delay (float): Upper bound on a single backoff in seconds
+        is_retryable (Callable): Predicate selecting errors worth retrying
+
+    Returns:
+        The return value of fn
+
+    Raises:
+        The last error once attempts are exhausted, or the first permanent error.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == max_attempts - 1 or not is_retryable(e):
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+    raise ValueError("max_attempts must be at least 1")
+
+async def call_with_retry_async(
+    fn: Callable,
+    max_attempts: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    is_retryable: Callable[[BaseException], bool] = is_retryable_error,
+):
+    """
+    Async counterpart of call_with_retry; fn is a zero-argument coroutine function.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt == max_attempts - 1 or not is_retryable(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+    raise ValueError("max_attempts must be at least 1")
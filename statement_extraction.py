@@ -0,0 +1,392 @@
+"""
+Batched statement extraction with ``statement_extraction_prompt``.
+
+The extraction prompt carries thousands of tokens of guidelines, label
+definitions, a few-shot example and the output schema before any chunk text.
+Sending it once per chunk makes that fixed prefix the bulk of the token bill.
+StatementExtractor instead:
+
+- renders the prompt once with no inputs, so every request starts with the
+  byte-identical prefix that provider-side prompt caching can reuse,
+- appends several chunks, each tagged with its ID and its own inputs,
+- packs as many chunks per request as the context and output budgets allow,
+- demultiplexes the returned statements back to chunks by ID, re-sending any
+  chunk the model skipped in a smaller batch.
+
+The LLM is any callable taking a prompt string and returning the response
+text, e.g. GeminiLLM or fake_services.FakeLLM.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from data_model import RawStatement
+from extraction_cache import ExtractionCache, extraction_key
+from prompt_builder import PromptBuilder
+from rate_limit import RateLimiter, call_with_retry, is_retryable_error
+
+logger = logging.getLogger(__name__)
+
+class ExtractionError(RuntimeError):
+    """Raised when statements for a chunk cannot be obtained from the LLM."""
+
+class ChunkInput(BaseModel):
+    """One chunk to extract statements from, with its prompt inputs."""
+    chunk_id: str
+    text: str
+    inputs: dict[str, Any] = Field(default_factory=dict)
+
+class ChunkStatements(BaseModel):
+    chunk_id: str
+    statements: list[RawStatement]
+
+class BatchedStatements(BaseModel):
+    """Response format for a request covering several chunks."""
+    results: list[ChunkStatements]
+
+BATCH_INSTRUCTIONS = """
+===Chunks===
+The chunks to process follow, each wrapped in <chunk id="..."> tags and
+preceded by its own inputs. Apply the tasks and guidelines above to every
+chunk independently, using that chunk's inputs (for example its
+main_entity). Return a single JSON object with one entry in "results" per
+chunk, each carrying the chunk's id as "chunk_id" and its statements.
+"""
+
+def chunk_inputs_from_transcript(transcript: Any, document_type: str = "Earnings Call Transcript") -> list[ChunkInput]:
+    """
+    Build extraction inputs for every chunk of a gemini_chunker Transcript.
+
+    Args:
+        transcript: Transcript with id, company, date and chunks
+        document_type (str): Document type passed to the prompt
+
+    Returns:
+        list[ChunkInput]: One input per chunk, with IDs "<transcript id>:<chunk index>"
+    """
+    inputs = {
+        "main_entity": transcript.company,
+        "publication_date": transcript.date.isoformat() if hasattr(transcript.date, "isoformat") else transcript.date,
+        "document_type": document_type,
+    }
+    if transcript.quarter:
+        inputs["quarter"] = transcript.quarter
+    return [
+        ChunkInput(chunk_id=f"{transcript.id}:{i}", text=chunk.text, inputs=inputs)
+        for i, chunk in enumerate(transcript.chunks or [])
+    ]
+
+def render_chunk(chunk: ChunkInput) -> str:
+    """Render one chunk section of a batched prompt."""
+    lines = [f'<chunk id="{chunk.chunk_id}">']
+    lines.extend(f"- {key}: {value}" for key, value in chunk.inputs.items())
+    lines.extend(["", chunk.text.strip(), "</chunk>"])
+    return "\n".join(lines)
+
+_CODE_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+_BATCH_RESULTS = TypeAdapter(list[ChunkStatements])
+
+def parse_batched_response(text: str) -> dict[str, list[RawStatement]]:
+    """
+    Parse an LLM response into statements per chunk ID.
+
+    Accepts the BatchedStatements object, a bare list of its results, and
+    responses wrapped in a Markdown code fence. The JSON is validated in a
+    single pydantic-core pass.
+
+    Raises:
+        ValueError: If the response is not valid JSON of the expected shape
+    """
+    text = _CODE_FENCE.sub("", text)
+    try:
+        if text.lstrip()[:1] == "[":
+            results = _BATCH_RESULTS.validate_json(text)
+        else:
+            results = BatchedStatements.model_validate_json(text).results
+    except ValidationError as e:
+        raise ValueError(f"malformed extraction response: {e}") from e
+    return {result.chunk_id: result.statements for result in results}
+
+class GeminiLLM:
+    """Gemini text generation as a prompt -> JSON text callable
+
+    Args:
+        api_key: Google API key, defaults to the GOOGLE_API_KEY environment variable
+        model: Gemini model name
+        temperature: Sampling temperature
+        max_output_tokens: Largest response the model may generate
+    """
+    def __init__(
+        self,
+        api_key: str = None,
+        model: str = "gemini-1.5-flash",
+        temperature: float = 0.0,
+        max_output_tokens: int = 8192,
+    ):
+        import google.generativeai as genai
+
+        api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("Please provide GOOGLE_API_KEY environment variable or pass api_key parameter")
+        genai.configure(api_key=api_key)
+        self.model_name = model
+        self.max_output_tokens = max_output_tokens
+        self._model = genai.GenerativeModel(
+            model,
+            generation_config={
+                "temperature": temperature,
+                "max_output_tokens": max_output_tokens,
+                "response_mime_type": "application/json",
+            },
+        )
+
+    def __call__(self, prompt: str) -> str:
+        return self._model.generate_content(prompt).text
+
+class StatementExtractor:
+    """
+    Extract RawStatements from many chunks with few, large LLM requests.
+
+    Args:
+        llm (Callable[[str], str]): Function sending a prompt and returning the response text
+        context_tokens (int): Model context window in tokens
+        max_output_tokens (int): Largest response the model will generate
+        output_ratio (float): Expected response tokens per chunk token, used for packing
+        max_chunks_per_request (int): Upper bound on chunks in one request
+        num_workers (int): Requests in flight at once
+        requests_per_minute (float, optional): Request quota
+        tokens_per_minute (float, optional): Prompt token quota
+        max_attempts (int): Attempts per request for transient API errors
+        cache (ExtractionCache, optional): Persistent cache of extractions
+        model (str, optional): Model name for cache keys, defaults to llm.model_name
+    """
+
+    def __init__(
+        self,
+        llm: Callable[[str], str],
+        context_tokens: int = 128_000,
+        max_output_tokens: int = 8192,
+        output_ratio: float = 1.5,
+        max_chunks_per_request: int = 25,
+        num_workers: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_attempts: int = 5,
+        cache: Optional[ExtractionCache] = None,
+        model: Optional[str] = None,
+    ):
+        self.llm = llm
+        self.context_tokens = context_tokens
+        self.max_output_tokens = max_output_tokens
+        self.output_ratio = output_ratio
+        self.max_chunks_per_request = max_chunks_per_request
+        self.num_workers = num_workers
+        self.max_attempts = max_attempts
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.cache = cache
+        self.model = model or getattr(llm, "model_name", type(llm).__name__)
+
+        # Rendered with no inputs so the prefix is identical for every request
+        self.prompt = PromptBuilder(
+            json_schema=json.dumps(BatchedStatements.model_json_schema()),
+            suffix=BATCH_INSTRUCTIONS,
+        )
+        self.prefix = self.prompt.prefix
+        self.prefix_tokens = self.prompt.prefix_tokens
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.chunks_extracted = 0
+        self.splits = 0
+        self.cache_hits = 0
+        self.deduplicated = 0
+
+    def build_prompt(self, batch: list[ChunkInput]) -> str:
+        """Static prefix followed by the batch's chunk sections."""
+        return self.prefix + "\n" + "\n\n".join(render_chunk(chunk) for chunk in batch)
+
+    def token_counts(self, chunk: ChunkInput) -> dict:
+        """
+        Token budget of one chunk: the shared prefix, its inputs and its text.
+
+        Returns:
+            dict: prefix, inputs, chunk and total token counts
+        """
+        return self.prompt.token_counts(chunk.text, chunk.inputs)
+
+    def plan_batches(self, chunks: Iterable[ChunkInput]) -> list[list[ChunkInput]]:
+        """
+        Pack chunks, in order, into requests that fit the token budgets.
+
+        A batch closes when adding the next chunk would exceed the context
+        window (prompt plus expected response), the output token limit, or
+        max_chunks_per_request. A chunk too large for any batch goes alone.
+
+        Args:
+            chunks (Iterable[ChunkInput]): Chunks to extract
+
+        Returns:
+            list[list[ChunkInput]]: Batches in input order
+        """
+        input_budget = self.context_tokens - self.max_output_tokens - self.prefix_tokens
+        batches, batch, input_tokens, output_tokens = [], [], 0, 0
+        for chunk in chunks:
+            tokens = self.prompt.count_tokens(render_chunk(chunk))
+            expected_output = int(self.prompt.count_tokens(chunk.text) * self.output_ratio)
+            if batch and (
+                len(batch) >= self.max_chunks_per_request
+                or input_tokens + tokens > input_budget
+                or output_tokens + expected_output > self.max_output_tokens
+            ):
+                batches.append(batch)
+                batch, input_tokens, output_tokens = [], 0, 0
+            batch.append(chunk)
+            input_tokens += tokens
+            output_tokens += expected_output
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _request(self, batch: list[ChunkInput]) -> dict[str, list[RawStatement]]:
+        prompt = self.build_prompt(batch)
+        tokens = self.prompt.count_tokens(prompt)
+
+        def send() -> str:
+            self.rate_limiter.acquire(tokens)
+            return self.llm(prompt)
+
+        response = call_with_retry(send, max_attempts=self.max_attempts)
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += tokens
+        return parse_batched_response(response)
+
+    def _extract_batch(self, batch: list[ChunkInput]) -> dict[str, list[RawStatement]]:
+        """Extract one batch, splitting it when the response is unusable or incomplete."""
+        try:
+            found = self._request(batch)
+        except ValueError:
+            if len(batch) == 1:
+                raise ExtractionError(f"unparseable response for chunk {batch[0].chunk_id}")
+            found = {}
+        except Exception as e:
+            # Permanent API errors on a large batch (e.g. context exceeded) may
+            # succeed when split; transient ones already exhausted their retries
+            if len(batch) == 1 or is_retryable_error(e):
+                raise ExtractionError(f"extraction failed for chunk {batch[0].chunk_id}: {e}") from e
+            logger.warning("Batch of %d chunks failed (%s); splitting", len(batch), e)
+            found = {}
+
+        results = {chunk.chunk_id: found[chunk.chunk_id] for chunk in batch if chunk.chunk_id in found}
+        missing = [chunk for chunk in batch if chunk.chunk_id not in found]
+        if not missing:
+            return results
+        if len(batch) == 1:
+            # The model answered but listed no statements for the chunk
+            logger.warning("No statements returned for chunk %s", batch[0].chunk_id)
+            return {batch[0].chunk_id: []}
+
+        with self._lock:
+            self.splits += 1
+        if len(missing) == len(batch):
+            middle = len(batch) // 2
+            results.update(self._extract_batch(batch[:middle]))
+            results.update(self._extract_batch(batch[middle:]))
+        else:
+            results.update(self._extract_batch(missing))
+        return results
+
+    def extract(self, chunks: Iterable[ChunkInput]) -> dict[str, list[RawStatement]]:
+        """
+        Extract statements for every chunk.
+
+        Chunks with the same text and inputs are sent once. With a cache,
+        cached chunks are not sent at all, and chunks another thread is
+        already extracting are waited for instead of sent again.
+
+        Args:
+            chunks (Iterable[ChunkInput]): Chunks with unique chunk_id values
+
+        Returns:
+            dict[str, list[RawStatement]]: Statements per chunk ID, in input order
+
+        Raises:
+            ExtractionError: If a single chunk still fails after retries
+        """
+        chunks = list(chunks)
+        if len({chunk.chunk_id for chunk in chunks}) != len(chunks):
+            raise ValueError("chunk_id values must be unique")
+        if not chunks:
+            return {}
+
+        keys = {
+            chunk.chunk_id: extraction_key(self.prompt.version, self.model, chunk.text, chunk.inputs)
+            for chunk in chunks
+        }
+        by_key: dict[str, list[RawStatement]] = {}
+        if self.cache is not None:
+            by_key.update(self.cache.get_many(keys.values()))
+        cached = set(by_key)
+
+        # One representative chunk per distinct key still to extract
+        pending: dict[str, ChunkInput] = {}
+        for chunk in chunks:
+            key = keys[chunk.chunk_id]
+            if key not in by_key:
+                pending.setdefault(key, chunk)
+        waiting = {}
+        if self.cache is not None:
+            owned, waiting = self.cache.claim(pending)
+            pending = {key: pending[key] for key in owned}
+
+        try:
+            if pending:
+                batches = self.plan_batches(pending.values())
+                with ThreadPoolExecutor(max_workers=min(self.num_workers, len(batches))) as executor:
+                    for found in executor.map(self._extract_batch, batches):
+                        extracted = {keys[chunk_id]: statements for chunk_id, statements in found.items()}
+                        by_key.update(extracted)
+                        if self.cache is not None:
+                            self.cache.resolve(extracted)
+        except BaseException as e:
+            if self.cache is not None:
+                self.cache.abandon([key for key in pending if key not in by_key], e)
+            raise
+        for key, future in waiting.items():
+            by_key[key] = future.result()
+
+        with self._lock:
+            self.chunks_extracted += len(chunks)
+            self.cache_hits += sum(1 for key in keys.values() if key in cached)
+            self.deduplicated += len(chunks) - len(set(keys.values()))
+        return {chunk.chunk_id: by_key[keys[chunk.chunk_id]] for chunk in chunks}
+
+    def stats(self) -> dict:
+        """
+        Report request and token usage.
+
+        Returns:
+            dict: Requests, chunks, prompt tokens, prompt tokens per chunk,
+            static prefix size, batch splits, chunks answered from the
+            cache and chunks that duplicated another in the same call
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "chunks": self.chunks_extracted,
+                "prompt_tokens": self.prompt_tokens,
+                "prompt_tokens_per_chunk": self.prompt_tokens / max(self.chunks_extracted, 1),
+                "prefix_tokens": self.prefix_tokens,
+                "splits": self.splits,
+                "cache_hits": self.cache_hits,
+                "deduplicated": self.deduplicated,
+            }
@@ -0,0 +1,404 @@
+"""
+Compact temporal knowledge graph over resolved entities.
+
+A networkx graph keeps every edge in nested dicts, several hundred bytes
+each, and has no notion of time. TemporalGraph keeps entity-to-entity
+triplets as CSR adjacency arrays (plus a reverse index for incoming edges)
+with per-edge columns for the predicate and the validity interval of the
+edge's statement. About 40 bytes per edge are stored, so tens of millions of
+temporal edges fit in a few GB.
+
+"As of" queries never rebuild the graph. The edges of a neighbourhood or
+traversal frontier are gathered as index arrays and filtered with a
+vectorized valid_at <= at < invalid_at mask. networkx is only imported by
+to_networkx().
+
+Example:
+    graph = TemporalGraph.from_db(conn)
+    graph.neighbors(entity_id, at="2023-06-30")
+    nodes, hops = graph.k_hop([entity_id], k=2, at="2023-06-30")
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Optional, Union
+
+import numpy as np
+
+from db_interface import iter_temporal_edges
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+# Open interval ends: statements without valid_at hold since always, and
+# without invalid_at hold until now
+_OPEN_START = np.iinfo(np.int64).min
+_OPEN_END = np.iinfo(np.int64).max
+
+DIRECTIONS = ("out", "in", "both")
+
+def _utc_text(value: Any) -> Optional[str]:
+    """A point in time as naive UTC ISO text to the second; offsets are applied, not dropped."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # Without an offset or fraction the text is already what numpy parses
+        if len(value) <= 19:
+            return value
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value.isoformat() if hasattr(value, "isoformat") else str(value))[:19]
+
+def _seconds(values: Iterable[Any]) -> np.ndarray:
+    """ISO-8601 text, dates or datetimes as int64 UTC epoch seconds; None is NaT (int64 min)."""
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        return values.astype("datetime64[s]").view(np.int64)
+    return np.array([_utc_text(value) for value in values], dtype="datetime64[s]").view(np.int64)
+
+def _at(value: Any) -> int:
+    return int(_seconds([value])[0])
+
+def _datetimes(seconds: np.ndarray) -> np.ndarray:
+    """Epoch seconds back to datetime64[s], with open ends as NaT."""
+    return np.where(seconds == _OPEN_END, _OPEN_START, seconds).astype("datetime64[s]")
+
+def _gather(indptr: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Positions of the CSR entries of all ``nodes``, concatenated."""
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+class TemporalGraph:
+    """
+    Directed multigraph of entities with a validity interval per edge.
+
+    Nodes are entity IDs. Edges are stored in source order; the arrays
+    below are indexed by edge position.
+
+    Args:
+        node_ids (np.ndarray): Sorted entity IDs; a node's dense index is its position
+        indptr (np.ndarray): Outgoing edges of node i are indptr[i]:indptr[i + 1]
+        targets (np.ndarray): Dense index of each edge's target
+        predicates (np.ndarray): Predicate code of each edge, into predicate_labels
+        valid_at (np.ndarray): Edge start, int64 epoch seconds
+        invalid_at (np.ndarray): Edge end (exclusive), int64 epoch seconds
+        edge_ids (np.ndarray): Triplet ID of each edge
+        predicate_labels (list[str]): Predicate text per code
+    """
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        indptr: np.ndarray,
+        targets: np.ndarray,
+        predicates: np.ndarray,
+        valid_at: np.ndarray,
+        invalid_at: np.ndarray,
+        edge_ids: np.ndarray,
+        predicate_labels: list,
+    ):
+        self.node_ids = node_ids
+        self.indptr = indptr
+        self.targets = targets
+        self.predicates = predicates
+        self.valid_at = valid_at
+        self.invalid_at = invalid_at
+        self.edge_ids = edge_ids
+        self.predicate_labels = list(predicate_labels)
+        self._predicate_codes = {label: code for code, label in enumerate(self.predicate_labels)}
+
+        # Sources per edge, and the reverse CSR for incoming edges: edges of
+        # target i are rev_edges[rev_indptr[i]:rev_indptr[i + 1]]
+        self.sources = np.repeat(np.arange(len(node_ids), dtype=np.int32), np.diff(indptr))
+        self.rev_edges = np.argsort(targets).astype(np.int32 if len(targets) < 2**31 else np.int64)
+        self.rev_indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=len(node_ids)), out=self.rev_indptr[1:])
+
+    @classmethod
+    def from_edges(
+        cls,
+        sources: Any,
+        targets: Any,
+        valid_at: Any = None,
+        invalid_at: Any = None,
+        predicates: Optional[Iterable[str]] = None,
+        edge_ids: Any = None,
+    ) -> "TemporalGraph":
+        """
+        Build a graph from parallel edge columns.
+
+        Args:
+            sources, targets: Entity IDs of each edge's ends
+            valid_at, invalid_at (optional): Interval of each edge as ISO-8601
+                text, dates, datetimes or a datetime64 array; None or NaT
+                leaves that end open. Times with an offset are converted to
+                UTC, naive times are taken as UTC
+            predicates (Iterable[str], optional): Predicate of each edge
+            edge_ids (optional): ID of each edge, positions by default
+
+        Returns:
+            TemporalGraph: The graph
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        count = len(sources)
+        valid = _seconds(valid_at) if valid_at is not None else np.full(count, _OPEN_START, dtype=np.int64)
+        invalid = _seconds(invalid_at) if invalid_at is not None else np.full(count, _OPEN_END, dtype=np.int64)
+        labels: dict[str, int] = {}
+        codes = (
+            np.fromiter((labels.setdefault(p, len(labels)) for p in predicates), dtype=np.int32, count=count)
+            if predicates is not None else np.zeros(count, dtype=np.int32)
+        )
+        ids = np.asarray(edge_ids, dtype=np.int64) if edge_ids is not None else np.arange(count, dtype=np.int64)
+        return cls._build(sources, targets, codes, valid, invalid, ids, list(labels) or [""])
+
+    @classmethod
+    def from_db(cls, conn, batch_size: int = 100_000) -> "TemporalGraph":
+        """
+        Build the graph of all entity-to-entity triplets in the database.
+
+        Each edge takes valid_at and invalid_at from the triplet's statement.
+
+        Args:
+            conn (sqlite3.Connection): Database connection
+            batch_size (int): Rows converted to arrays at a time
+
+        Returns:
+            TemporalGraph: The graph
+        """
+        labels: dict[str, int] = {}
+        parts = []
+        for batch in iter_temporal_edges(conn, batch_size):
+            ids, sources, targets, predicates, valid_at, invalid_at = zip(*batch)
+            parts.append((
+                np.array(sources, dtype=np.int64),
+                np.array(targets, dtype=np.int64),
+                np.fromiter((labels.setdefault(p, len(labels)) for p in predicates), dtype=np.int32, count=len(batch)),
+                _seconds(valid_at),
+                _seconds(invalid_at),
+                np.array(ids, dtype=np.int64),
+            ))
+        if not parts:
+            empty = np.empty(0, dtype=np.int64)
+            return cls._build(empty, empty, np.empty(0, dtype=np.int32), empty, empty, empty, [])
+        columns = [np.concatenate(column) for column in zip(*parts)]
+        return cls._build(*columns, list(labels))
+
+    @classmethod
+    def _build(cls, sources, targets, predicates, valid, invalid, edge_ids, labels) -> "TemporalGraph":
+        # A missing date is NaT, which is int64 min: already an open start
+        # for valid_at, and mapped to an open end for invalid_at
+        invalid = np.where(invalid == _OPEN_START, _OPEN_END, invalid)
+
+        # One sort maps both ends to dense indices
+        node_ids, inverse = np.unique(np.concatenate([sources, targets]), return_inverse=True)
+        inverse = inverse.astype(np.int32)
+        source_index, target_index = inverse[:len(sources)], inverse[len(sources):]
+        order = np.argsort(source_index)
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source_index, minlength=len(node_ids)), out=indptr[1:])
+        return cls(
+            node_ids,
+            indptr,
+            target_index[order],
+            predicates[order],
+            valid[order],
+            invalid[order],
+            edge_ids[order],
+            labels,
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the graph's arrays."""
+        arrays = (
+            self.node_ids, self.indptr, self.targets, self.predicates, self.valid_at,
+            self.invalid_at, self.edge_ids, self.sources, self.rev_edges, self.rev_indptr,
+        )
+        return sum(a.nbytes for a in arrays)
+
+    def _dense(self, entity_ids: Any) -> np.ndarray:
+        entity_ids = np.atleast_1d(np.asarray(entity_ids, dtype=np.int64))
+        index = np.searchsorted(self.node_ids, entity_ids)
+        found = index < len(self.node_ids)
+        found[found] = self.node_ids[index[found]] == entity_ids[found]
+        return index[found]
+
+    def _edges_of(self, nodes: np.ndarray, direction: str) -> np.ndarray:
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}")
+        edges = []
+        if direction in ("out", "both"):
+            edges.append(_gather(self.indptr, nodes))
+        if direction in ("in", "both"):
+            edges.append(self.rev_edges[_gather(self.rev_indptr, nodes)])
+        return np.concatenate(edges) if len(edges) > 1 else edges[0]
+
+    def _filter(self, edges: np.ndarray, at: Any, predicate: Optional[Union[str, Iterable[str]]]) -> np.ndarray:
+        mask = np.ones(len(edges), dtype=bool)
+        if at is not None:
+            at = _at(at)
+            mask &= (self.valid_at[edges] <= at) & (at < self.invalid_at[edges])
+        if predicate is not None:
+            wanted = [predicate] if isinstance(predicate, str) else list(predicate)
+            codes = [self._predicate_codes[p] for p in wanted if p in self._predicate_codes]
+            mask &= np.isin(self.predicates[edges], codes)
+        return edges[mask]
+
+    def active(self, at: Any) -> np.ndarray:
+        """Boolean mask of the edges valid at time ``at``, by edge position."""
+        at = _at(at)
+        return (self.valid_at <= at) & (at < self.invalid_at)
+
+    def edges(
+        self,
+        entity_id: int,
+        at: Any = None,
+        direction: str = "out",
+        predicate: Optional[Union[str, Iterable[str]]] = None,
+    ) -> dict:
+        """
+        Edges of one entity, optionally as of a point in time.
+
+        Args:
+            entity_id (int): Entity ID
+            at (optional): Only edges valid at this time (ISO-8601 text, date or datetime)
+            direction (str): "out", "in" or "both"
+            predicate (str or Iterable[str], optional): Only edges with these predicates
+
+        Returns:
+            dict: Arrays "source", "target" (entity IDs), "predicate" (codes
+            into predicate_labels), "valid_at", "invalid_at" (datetime64[s],
+            NaT for open ends) and "edge_id"
+        """
+        edges = self._filter(self._edges_of(self._dense(entity_id), direction), at, predicate)
+        return {
+            "source": self.node_ids[self.sources[edges]],
+            "target": self.node_ids[self.targets[edges]],
+            "predicate": self.predicates[edges],
+            "valid_at": _datetimes(self.valid_at[edges]),
+            "invalid_at": _datetimes(self.invalid_at[edges]),
+            "edge_id": self.edge_ids[edges],
+        }
+
+    def neighbors(
+        self,
+        entity_id: int,
+        at: Any = None,
+        direction: str = "out",
+        predicate: Optional[Union[str, Iterable[str]]] = None,
+    ) -> np.ndarray:
+        """
+        Entity IDs adjacent to an entity, optionally as of a point in time.
+
+        Args:
+            entity_id (int): Entity ID
+            at (optional): Only edges valid at this time
+            direction (str): "out", "in" or "both"
+            predicate (str or Iterable[str], optional): Only edges with these predicates
+
+        Returns:
+            np.ndarray: Sorted unique neighbour entity IDs
+        """
+        nodes = self._dense(entity_id)
+        edges = self._filter(self._edges_of(nodes, direction), at, predicate)
+        ends = np.concatenate([self.sources[edges], self.targets[edges]])
+        ends = ends[~np.isin(ends, nodes)]
+        return self.node_ids[np.unique(ends)]
+
+    def k_hop(
+        self,
+        seeds: Any,
+        k: int,
+        at: Any = None,
+        direction: str = "out",
+        predicate: Optional[Union[str, Iterable[str]]] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Entities within k hops of the seeds, traversing only edges valid at ``at``.
+
+        Each hop expands the whole frontier at once.
+
+        Args:
+            seeds (int or Iterable[int]): Starting entity IDs
+            k (int): Maximum number of hops
+            at (optional): Only edges valid at this time
+            direction (str): "out", "in" or "both"
+            predicate (str or Iterable[str], optional): Only edges with these predicates
+
+        Returns:
+            tuple: (entity IDs, hop distance of each), seeds at distance 0
+        """
+        distance = np.full(self.num_nodes, -1, dtype=np.int32)
+        frontier = np.unique(self._dense(seeds))
+        distance[frontier] = 0
+        for hop in range(1, k + 1):
+            if len(frontier) == 0:
+                break
+            edges = self._filter(self._edges_of(frontier, direction), at, predicate)
+            ends = []
+            if direction in ("out", "both"):
+                ends.append(self.targets[edges])
+            if direction in ("in", "both"):
+                ends.append(self.sources[edges])
+            reached = np.unique(np.concatenate(ends))
+            frontier = reached[distance[reached] < 0]
+            distance[frontier] = hop
+        found = np.flatnonzero(distance >= 0)
+        return self.node_ids[found], distance[found]
+
+    def as_of(self, at: Any) -> "TemporalGraph":
+        """Subgraph of the edges valid at time ``at``, as a new TemporalGraph."""
+        edges = np.flatnonzero(self.active(at))
+        return self._build(
+            self.node_ids[self.sources[edges]],
+            self.node_ids[self.targets[edges]],
+            self.predicates[edges],
+            self.valid_at[edges],
+            self.invalid_at[edges],
+            self.edge_ids[edges],
+            self.predicate_labels,
+        )
+
+    def to_networkx(self, at: Any = None, names: Optional[Mapping[int, str]] = None):
+        """
+        Export to a networkx MultiDiGraph, for analysis or plotting.
+
+        Args:
+            at (optional): Only export edges valid at this time
+            names (Mapping, optional): Entity name per ID, stored as the "name" node attribute
+
+        Returns:
+            networkx.MultiDiGraph: Nodes are entity IDs; edges carry
+            predicate, valid_at, invalid_at and edge_id attributes
+        """
+        if nx is None:
+            raise ImportError("to_networkx requires networkx: pip install networkx")
+        graph = nx.MultiDiGraph()
+        for entity_id in self.node_ids.tolist():
+            graph.add_node(entity_id, **({"name": names.get(entity_id)} if names else {}))
+        edges = np.flatnonzero(self.active(at)) if at is not None else np.arange(self.num_edges)
+        for source, target, code, start, end, edge_id in zip(
+            self.node_ids[self.sources[edges]].tolist(),
+            self.node_ids[self.targets[edges]].tolist(),
+            self.predicates[edges].tolist(),
+            _datetimes(self.valid_at[edges]).tolist(),
+            _datetimes(self.invalid_at[edges]).tolist(),
+            self.edge_ids[edges].tolist(),
+        ):
+            graph.add_edge(
+                source, target, key=edge_id,
+                predicate=self.predicate_labels[code], valid_at=start, invalid_at=end, edge_id=edge_id,
+            )
+        return graph
@@ -0,0 +1,252 @@
+"""
+Temporal invalidation of DYNAMIC statements.
+
+LABEL_DEFINITIONS describes DYNAMIC statements as valid from their valid_at
+until a later STATIC statement or a contradictory one ends them. Comparing
+every new statement with every earlier one is quadratic. InvalidationEngine
+instead keeps one timeline per (subject, predicate), sorted by valid_at. A
+new statement is only checked against the intervals on its own timeline
+that are still open at its valid_at. Statements can arrive in any order,
+so backfilled transcripts update the intervals around them incrementally.
+
+Within a timeline, a DYNAMIC statement is invalidated at the valid_at of the
+first strictly later statement that is STATIC or that states a different
+object. A later DYNAMIC statement with the same object restates it and
+leaves it open. An invalid_at stated by the extraction is kept when it is
+earlier.
+
+Example:
+    engine = InvalidationEngine()
+    engine.add_many(temporal_statements)
+    update_statements_invalid_at(conn, engine.take_updates())
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Hashable, Iterable, NamedTuple, Optional
+
+from data_model import TemporalType
+from db_interface import as_timestamp, update_statements_invalid_at
+
+class TemporalStatement(NamedTuple):
+    statement_id: int
+    subject: str
+    predicate: str
+    object: Optional[str]
+    temporal_type: Any  # TemporalType or its label
+    valid_at: Any  # ISO-8601 text, date or datetime
+    invalid_at: Any = None
+
+def _timestamp(value: Any) -> Optional[str]:
+    # Same representation as the statements table, which sorts chronologically
+    return None if value is None else as_timestamp(value)
+
+def _normalize(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return " ".join(str(value).split()).casefold()
+
+def _earliest(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+class _Timeline:
+    """Statements of one (subject, predicate), as parallel lists sorted by valid_at."""
+
+    __slots__ = ("times", "ids", "objects", "static", "stated", "derived")
+
+    def __init__(self):
+        self.times: list[str] = []
+        self.ids: list[int] = []
+        self.objects: list[Optional[str]] = []
+        self.static: list[bool] = []
+        # invalid_at from the extraction, and the one implied by later statements
+        self.stated: list[Optional[str]] = []
+        self.derived: list[Optional[str]] = []
+
+    def insert(self, index: int, time: str, statement_id: int, obj: Optional[str], static: bool, stated: Optional[str]) -> None:
+        self.times.insert(index, time)
+        self.ids.insert(index, statement_id)
+        self.objects.insert(index, obj)
+        self.static.insert(index, static)
+        self.stated.insert(index, stated)
+        self.derived.insert(index, None)
+
+    def effective(self, index: int) -> Optional[str]:
+        return _earliest(self.stated[index], self.derived[index])
+
+class InvalidationEngine:
+    """
+    Incremental interval index deriving invalid_at for DYNAMIC statements.
+
+    ATEMPORAL statements and statements without a valid_at are ignored.
+    Changed invalid_at values accumulate until take_updates() is called.
+    """
+
+    def __init__(self):
+        self._timelines: dict[tuple[Hashable, Hashable], _Timeline] = {}
+        self._where: dict[int, _Timeline] = {}
+        self._updates: dict[int, Optional[str]] = {}
+
+        self.ignored = 0
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def add(self, statement: TemporalStatement) -> dict[int, Optional[str]]:
+        """
+        Insert one statement and close the intervals it supersedes.
+
+        Args:
+            statement (TemporalStatement): Statement with its subject, predicate and object
+
+        Returns:
+            dict: New effective invalid_at per DYNAMIC statement ID whose value
+            changed, including the new statement's own when it is already closed
+        """
+        temporal_type = TemporalType(statement.temporal_type)
+        time = _timestamp(statement.valid_at)
+        if temporal_type is TemporalType.ATEMPORAL or time is None:
+            self.ignored += 1
+            return {}
+        if statement.statement_id in self._where:
+            raise ValueError(f"statement {statement.statement_id} was already added")
+
+        key = (_normalize(statement.subject), _normalize(statement.predicate))
+        timeline = self._timelines.get(key)
+        if timeline is None:
+            timeline = self._timelines[key] = _Timeline()
+        obj = _normalize(statement.object)
+        static = temporal_type is TemporalType.STATIC
+
+        changes: dict[int, Optional[str]] = {}
+        self._close_earlier(timeline, time, obj, static, changes)
+
+        index = bisect_right(timeline.times, time)
+        timeline.insert(index, time, statement.statement_id, obj, static, _timestamp(statement.invalid_at))
+        self._where[statement.statement_id] = timeline
+        if not static:
+            # First strictly later statement that is STATIC or states another object
+            for j in range(index + 1, len(timeline.times)):
+                self.comparisons += 1
+                if timeline.times[j] > time and (timeline.static[j] or timeline.objects[j] != obj):
+                    timeline.derived[index] = timeline.times[j]
+                    break
+            if timeline.effective(index) is not None:
+                changes[statement.statement_id] = timeline.effective(index)
+
+        self._updates.update(changes)
+        return changes
+
+    def _close_earlier(self, timeline: _Timeline, time: str, obj: Optional[str], static: bool, changes: dict) -> None:
+        """
+        Close the DYNAMIC intervals open at ``time`` that a new statement contradicts.
+
+        Scans backwards from ``time`` one valid_at group at a time. Each group
+        closes every strictly earlier interval except those with its own
+        object, so the objects that can still be open only shrink, and the
+        scan stops once none are left or none of them is contradicted.
+        """
+        times = timeline.times
+        surviving: Optional[set] = None  # None: any object may still be open
+        i = bisect_left(times, time) - 1
+        while i >= 0:
+            group_time = times[i]
+            group_objects = set()
+            group_static = False
+            while i >= 0 and times[i] == group_time:
+                if timeline.static[i]:
+                    group_static = True
+                else:
+                    candidate = timeline.objects[i]
+                    group_objects.add(candidate)
+                    if surviving is None or candidate in surviving:
+                        self.comparisons += 1
+                        derived = timeline.derived[i]
+                        if (static or candidate != obj) and (derived is None or derived > time):
+                            before = timeline.effective(i)
+                            timeline.derived[i] = time
+                            if timeline.effective(i) != before:
+                                changes[timeline.ids[i]] = timeline.effective(i)
+                i -= 1
+
+            if group_static or len(group_objects) > 1:
+                break
+            surviving = group_objects if surviving is None else surviving & group_objects
+            if not surviving or (not static and surviving == {obj}):
+                break
+
+    def add_many(self, statements: Iterable[TemporalStatement]) -> dict[int, Optional[str]]:
+        """
+        Insert many statements in one pass.
+
+        Statements are inserted in valid_at order, so each insertion appends
+        to its timeline and only looks back over the run of intervals still
+        open at its end.
+
+        Args:
+            statements (Iterable[TemporalStatement]): Statements in any order
+
+        Returns:
+            dict: Final effective invalid_at per DYNAMIC statement ID whose value changed
+        """
+        changes: dict[int, Optional[str]] = {}
+        # ATEMPORAL statements have no valid_at and are ignored, sort them first
+        for statement in sorted(statements, key=lambda s: _timestamp(s.valid_at) or ""):
+            changes.update(self.add(statement))
+        return changes
+
+    def invalid_at(self, statement_id: int) -> Optional[str]:
+        """
+        Effective invalid_at of an added statement.
+
+        Args:
+            statement_id (int): ID of the statement
+
+        Returns:
+            str or None: ISO-8601 invalid_at, None while the statement is open
+            or when it is STATIC
+        """
+        timeline = self._where[statement_id]
+        return timeline.effective(timeline.ids.index(statement_id))
+
+    def take_updates(self) -> dict[int, Optional[str]]:
+        """
+        Return the invalid_at values changed since the last call and reset them.
+
+        Returns:
+            dict: Effective invalid_at per statement ID, ready for
+            db_interface.update_statements_invalid_at
+        """
+        updates, self._updates = self._updates, {}
+        return updates
+
+    def apply(self, conn) -> int:
+        """
+        Write pending invalid_at changes to the statements table.
+
+        Args:
+            conn (sqlite3.Connection): Database connection
+
+        Returns:
+            int: Number of statements updated
+        """
+        return update_statements_invalid_at(conn, self.take_updates())
+
+    def stats(self) -> dict:
+        """
+        Report index size and work done.
+
+        Returns:
+            dict: Indexed statements, (subject, predicate) timelines, ignored
+            statements and candidate comparisons made
+        """
+        return {
+            "statements": len(self._where),
+            "timelines": len(self._timelines),
+            "ignored": self.ignored,
+            "comparisons": self.comparisons,
+        }
@@ -0,0 +1,17 @@
+import pytest
+
+from client_pool import ClientPool, PoolClosedError
+
+def test_detached_clients_are_counted_and_closed():
+    closed = []
+    pool = ClientPool(object, size=2, close=closed.append)
+    with pool.acquire() as pooled:
+        pass
+    detached = pool.create_detached()
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["detached"] == 1
+
+    pool.close()
+    assert {id(c) for c in closed} == {id(pooled), id(detached)}
+    with pytest.raises(PoolClosedError):
+        pool.create_detached()
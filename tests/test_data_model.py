@@ -0,0 +1,42 @@
+import pytest
+from pydantic import ValidationError
+
+from data_model import StatementType, TemporalType, parse_raw_statements, raw_statements_from_rows
+
+def test_enums_are_strict():
+    for enum in (StatementType, TemporalType):
+        with pytest.raises(ValueError):
+            enum(None)
+        with pytest.raises(ValueError):
+            enum("fact")
+
+def test_raw_statement_normalizes_llm_labels():
+    statements = parse_raw_statements(
+        '[{"statement": "a", "statement_type": " opinion ", "temporal_type": null},'
+        ' {"statement": "b", "statement_type": null, "temporal_type": "Dynamic"}]'
+    )
+    assert [(s.statement_type, s.temporal_type) for s in statements] == [
+        (StatementType.OPINION, TemporalType.ATEMPORAL),
+        (StatementType.FACT, TemporalType.DYNAMIC),
+    ]
+
+def test_raw_statement_rejects_unknown_labels():
+    with pytest.raises(ValidationError):
+        parse_raw_statements('[{"statement": "a", "statement_type": "RUMOUR", "temporal_type": "STATIC"}]')
+
+def test_rows_build_independent_mutable_statements():
+    first, second = raw_statements_from_rows([
+        ("Revenue grew.", "FACT", "STATIC"),
+        {"statement": "Demand is strong.", "statement_type": StatementType.OPINION, "temporal_type": "DYNAMIC"},
+    ])
+    assert second.statement_type is StatementType.OPINION
+    first.statement = "Revenue grew 10%."
+    copy = second.model_copy(update={"temporal_type": TemporalType.STATIC})
+    assert first.statement == "Revenue grew 10%."
+    assert copy.temporal_type is TemporalType.STATIC
+    assert second.temporal_type is TemporalType.DYNAMIC
+
+def test_missing_labels_default():
+    (statement,) = parse_raw_statements('[{"statement": "Revenue grew."}]')
+    assert statement.statement_type is StatementType.FACT
+    assert statement.temporal_type is TemporalType.ATEMPORAL
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import pytest
+
+from db_interface import create_tables, get_statements_valid_at, insert_company, insert_statements_bulk, make_connection
+
+@pytest.fixture
+def conn():
+    conn = make_connection(db_path=":memory:")
+    create_tables(conn)
+    yield conn
+    conn.close()
+
+@pytest.mark.parametrize("at", [datetime(2024, 6, 1, 12), "2024-06-01T12:00:00", "2024-06-01 12:00:00"])
+def test_valid_at_compares_bulk_inserted_times(conn, at):
+    company_id = insert_company(conn, "Acme")
+    insert_statements_bulk(conn, [{
+        "company_id": company_id,
+        "statement": "Guidance is $2B.",
+        "temporal_type": "DYNAMIC",
+        "valid_at": datetime(2024, 5, 1),
+        "invalid_at": datetime(2024, 6, 1, 18),
+    }])
+    assert len(get_statements_valid_at(conn, company_id, at)) == 1
+    assert get_statements_valid_at(conn, company_id, datetime(2024, 6, 1, 18)) == []
+
+def test_bulk_insert_stores_dates_with_as_timestamp(conn):
+    company_id = insert_company(conn, "Acme")
+    insert_statements_bulk(conn, [{
+        "company_id": company_id,
+        "statement": "Revenue grew.",
+        "temporal_type": "STATIC",
+        "valid_at": datetime(2024, 5, 1, 9, 30),
+    }])
+    assert conn.execute("SELECT valid_at FROM statements").fetchone()[0] == "2024-05-01 09:30:00"
+
+def test_point_in_time_lookup_reads_only_the_covering_index(conn):
+    plan = conn.execute(
+        """EXPLAIN QUERY PLAN
+        SELECT id, chunk_id, transcript_id, company_id, statement, statement_type, temporal_type, valid_at, invalid_at
+        FROM statements WHERE company_id = ? AND temporal_type = 'DYNAMIC' AND valid_at <= ?
+          AND (invalid_at IS NULL OR invalid_at > ?)
+        ORDER BY valid_at DESC""",
+        (1, "2024-06-01", "2024-06-01"),
+    ).fetchall()
+    assert [row[-1] for row in plan] == [
+        "SEARCH statements USING COVERING INDEX idx_statements_company_covering "
+        "(company_id=? AND temporal_type=? AND valid_at<?)"
+    ]
@@ -0,0 +1,45 @@
+import time
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache
+
+def test_disk_bytes_with_mixed_dimensions(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.db"))
+    cache.put_many("small", ["a", "b"], np.ones((2, 8)))
+    cache.put_many("large", ["a"], np.ones((1, 768)))
+    cache.put_many("mixed", ["a", "b"], [np.ones(8), np.ones(768)])
+    stored = cache._conn.execute("SELECT SUM(LENGTH(vector)) FROM embedding_cache").fetchone()[0]
+    assert cache.stats()["disk_bytes"] == stored == (8 + 8 + 768 + 8 + 768) * 4
+    cache.close()
+
+def test_memory_hits_keep_entries_from_eviction(tmp_path):
+    # Room for about three 1 KiB vectors on disk, all of them in memory
+    cache = EmbeddingCache(str(tmp_path / "cache.db"), max_disk_bytes=3500)
+    cache.put_many("m", ["hot", "cold"], np.ones((2, 256)))
+    time.sleep(0.01)
+    assert cache.get("m", "hot") is not None  # memory-tier hit
+    time.sleep(0.01)
+    cache.put_many("m", ["new1", "new2"], np.ones((2, 256)))
+    assert cache.stats()["evictions"] >= 1
+    assert cache.get("m", "cold") is None
+    assert cache.get("m", "hot") is not None
+    cache.close()
+
+def test_disk_hits_do_not_commit(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(path)
+    cache.put_many("m", ["a", "b"], np.ones((2, 8)))
+    cache.close()
+
+    cache = EmbeddingCache(path)
+    changes = cache._conn.total_changes
+    assert cache.get("m", "a") is not None  # disk-tier hit
+    assert cache._conn.total_changes == changes
+    before = cache._conn.execute("SELECT last_used FROM embedding_cache WHERE text_hash != ?", ("",)).fetchall()
+    cache.close()
+
+    cache = EmbeddingCache(path)
+    after = cache._conn.execute("SELECT last_used FROM embedding_cache WHERE text_hash != ?", ("",)).fetchall()
+    assert sum(a > b for (a,), (b,) in zip(sorted(after), sorted(before))) == 1
+    cache.close()
@@ -0,0 +1,28 @@
+import sqlite3
+
+import pytest
+
+from db_interface import create_tables, get_entities, make_connection
+from entity_resolution import EntityResolver, store_triplets
+
+@pytest.fixture
+def conn():
+    conn = make_connection(db_path=":memory:")
+    create_tables(conn)
+    yield conn
+    conn.close()
+
+def test_store_triplets_is_one_transaction(conn):
+    resolver = EntityResolver()
+    with pytest.raises(sqlite3.IntegrityError):
+        store_triplets(conn, resolver, [
+            {"subject": "Acme Corp.", "predicate": "acquired", "object": "Widget Inc"},
+            {"subject": "Acme Corp.", "predicate": None, "object": "Gadget Ltd"},
+        ])
+    assert get_entities(conn) == []
+    assert conn.execute("SELECT COUNT(*) FROM triplets").fetchone()[0] == 0
+
+    # Entities from the failed call are written by the next one
+    store_triplets(conn, resolver, [{"subject": "Acme", "predicate": "reported", "value": "$2B"}])
+    assert {e["name"] for e in get_entities(conn)} == {"Acme Corp.", "Widget Inc", "Gadget Ltd"}
+    assert conn.execute("SELECT COUNT(*) FROM triplets").fetchone()[0] == 1
@@ -0,0 +1,76 @@
+import os
+import threading
+
+import pytest
+
+from pipeline_executor import Pipeline, Stage
+
+def _length(text):
+    return len(text)
+
+def _shared_blocks():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+def test_merge_error_is_raised():
+    def merge(item, result):
+        raise ValueError("bad merge")
+
+    pipeline = Pipeline([Stage(str.upper, kind="io", merge=merge)])
+    outcome = {}
+
+    def consume():
+        try:
+            list(pipeline.run(["a", "b"]))
+        except ValueError as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "pipeline hung on a merge error"
+    assert str(outcome["error"]) == "bad merge"
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs /dev/shm")
+def test_closing_early_frees_shared_memory():
+    before = _shared_blocks()
+    pipeline = Pipeline([Stage(_length, kind="cpu", workers=2, batch_size=4, shared_text=True)], queue_size=4)
+    results = pipeline.run("x" * (i + 1) for i in range(500))
+    assert [next(results) for _ in range(3)] == [1, 2, 3]
+    results.close()
+    assert _shared_blocks() <= before
+
+class _FailingClient:
+    """Embeds deterministically, but fails any batch containing "BOOM"."""
+
+    def embed_content(self, model, content, **kwargs):
+        if any("BOOM" in text for text in content):
+            raise ValueError("embedding failed")
+        return {"embedding": [[float(len(text)), 1.0] for text in content]}
+
+def _ledger_rows(conn):
+    return conn.execute("SELECT transcript_id, content_hash, date, status, error FROM ingestion_ledger ORDER BY transcript_id").fetchall()
+
+def test_failed_transcript_ledger_matches_threaded_chunker():
+    from db_interface import create_tables, make_connection
+    from gemini_chunker import GeminiChunker
+    from pipeline_executor import chunk_transcripts
+
+    dataset = [
+        {"company": "Acme", "date": "2024-01-30", "transcript": "Revenue grew. Margins expanded. We raised guidance."},
+        {"company": "Acme", "date": "2024-04-30", "transcript": "Demand held up. BOOM went the supply chain. We are cautious."},
+    ]
+    ledgers = []
+    for run in ("threaded", "pipeline"):
+        conn = make_connection(db_path=":memory:")
+        create_tables(conn)
+        chunker = GeminiChunker(embedding_client=_FailingClient())
+        if run == "threaded":
+            transcripts = chunker.iter_transcripts_and_chunks(dataset, num_workers=2, ledger=conn)
+        else:
+            transcripts = chunk_transcripts(chunker, dataset, processes=1, io_workers=2, ledger=conn)
+        with pytest.raises(Exception, match="embedding failed"):
+            list(transcripts)
+        ledgers.append(_ledger_rows(conn))
+        chunker.close()
+    assert ledgers[0] == ledgers[1]
+    assert sorted(row[3] for row in ledgers[1]) == ["done", "failed"]
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from temporal_graph import TemporalGraph
+
+def test_timezone_offsets_are_converted_to_utc():
+    graph = TemporalGraph.from_edges(
+        [1, 1, 1],
+        [2, 3, 4],
+        valid_at=[
+            "2024-06-01T12:00:00+05:00",
+            datetime(2024, 6, 1, 12, tzinfo=timezone(timedelta(hours=-4))),
+            "2024-06-01 07:00:00Z",
+        ],
+    )
+    assert graph.edges(1)["valid_at"].tolist() == [
+        np.datetime64("2024-06-01T07:00:00"),
+        np.datetime64("2024-06-01T16:00:00"),
+        np.datetime64("2024-06-01T07:00:00"),
+    ]
+    assert graph.neighbors(1, at="2024-06-01 08:00:00").tolist() == [2, 4]
+    assert graph.neighbors(1, at="2024-06-01T12:00:00+05:00").tolist() == [2, 4]
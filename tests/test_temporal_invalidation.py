@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from temporal_invalidation import InvalidationEngine, TemporalStatement
+
+def test_mixed_timestamp_formats_are_ordered_chronologically():
+    engine = InvalidationEngine()
+    engine.add_many([
+        TemporalStatement(1, "Acme", "guidance", "$2B", "DYNAMIC", "2024-06-01 06:00:00"),
+        TemporalStatement(2, "Acme", "guidance", "$3B", "DYNAMIC", datetime(2024, 6, 1, 12)),
+        TemporalStatement(3, "Acme", "guidance", "$4B", "DYNAMIC", "2024-06-01T18:00:00"),
+    ])
+    assert engine.invalid_at(1) == "2024-06-01 12:00:00"
+    assert engine.invalid_at(2) == "2024-06-01 18:00:00"
+    assert engine.invalid_at(3) is None
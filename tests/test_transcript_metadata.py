@@ -0,0 +1,17 @@
+import pytest
+
+from transcript_metadata import find_fiscal_quarter
+
+@pytest.mark.parametrize("text, expected", [
+    ("Welcome to the Q1 2024 earnings call.", (2024, 1)),
+    ("Results for Q3'23 were strong.", (2023, 3)),
+    ("This is our FY24 Q2 call.", (2024, 2)),
+    ("Welcome to the first quarter of fiscal 2024 call.", (2024, 1)),
+    ("Our fourth-quarter 2023 results.", (2023, 4)),
+    ("Welcome to the second-quarter fiscal 2024 earnings call.", (2024, 2)),
+    ("Our third-fiscal-quarter 2022 results.", (2022, 3)),
+    ("Fiscal 2024 fourth-quarter revenue grew.", (2024, 4)),
+    ("Revenue grew in Q1 10 percent.", None),
+])
+def test_find_fiscal_quarter(text, expected):
+    assert find_fiscal_quarter(text) == expected
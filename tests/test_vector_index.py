@@ -0,0 +1,24 @@
+import numpy as np
+
+from vector_index import VectorIndex
+
+def test_save_over_loaded_index_keeps_vectors(tmp_path):
+    rng = np.random.default_rng(0)
+    first = rng.standard_normal((50, 16)).astype(np.float32)
+    second = rng.standard_normal((10, 16)).astype(np.float32)
+
+    index = VectorIndex(dim=16)
+    index.add(range(50), first)
+    index.save(str(tmp_path))
+
+    loaded = VectorIndex.load(str(tmp_path))  # memory-mapped
+    loaded.add(range(50, 60), second)
+    loaded.save(str(tmp_path))
+
+    reloaded = VectorIndex.load(str(tmp_path))
+    assert len(reloaded) == 60
+    for i, vector in enumerate(np.vstack([first, second])):
+        ids, scores = reloaded.search(vector, k=1)
+        assert ids[0] == i
+        assert scores[0] > 0.99
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,434 @@
+"""
+Embedded vector index for chunk embeddings, built on NumPy only.
+
+Vectors are stored as float32 matrices that can be saved to disk and
+memory-mapped back, so an index larger than RAM is paged in on demand. Small
+corpora are searched exactly, block by block; large ones can be trained into
+an IVF (inverted file) index that clusters the vectors with k-means and only
+scans the ``nprobe`` clusters nearest to each query.
+
+Example:
+    index = VectorIndex(dim=768)
+    index.add(chunk_ids, embeddings.embed_documents(texts))
+    index.train()  # optional, for large corpora
+    ids, scores = index.search(query_vector, k=10)
+    index.save("chunks.index")
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from db_interface import get_chunk_ids
+
+METRICS = ("cosine", "ip")
+
+class VectorIndex:
+    """
+    Vector index keyed by integer IDs (normally chunk IDs from db_interface).
+
+    Args:
+        dim (int): Vector dimension
+        metric (str): "cosine" (vectors are normalized on add) or "ip" (raw inner product)
+        nprobe (int): Number of IVF clusters scanned per query once trained
+        block_size (int): Rows scored per matrix product in exact search
+        exact_threshold (int): Below this many vectors, search is always exact
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        metric: str = "cosine",
+        nprobe: int = 8,
+        block_size: int = 65536,
+        exact_threshold: int = 50_000,
+    ):
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}")
+        self.dim = dim
+        self.metric = metric
+        self.nprobe = nprobe
+        self.block_size = block_size
+        self.exact_threshold = exact_threshold
+
+        # Rows are appended in segments so a memory-mapped base matrix is
+        # never copied when new vectors arrive; save() consolidates them
+        self._segments: list[np.ndarray] = []
+        self._ids = np.empty(0, dtype=np.int64)
+        self._deleted = np.empty(0, dtype=bool)
+        self._rows: dict[int, int] = {}
+
+        self.centroids: Optional[np.ndarray] = None
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._lists: Optional[list[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def _prepare(self, vectors: Any) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(f"expected vectors of dimension {self.dim}, got shape {matrix.shape}")
+        if self.metric == "cosine":
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.maximum(norms, 1e-12)
+        return np.ascontiguousarray(matrix, dtype=np.float32)
+
+    def _blocks(self, rows: Optional[np.ndarray] = None) -> Iterable[tuple[int, np.ndarray]]:
+        """Yield (first_row, matrix) blocks of at most block_size rows."""
+        if rows is not None:
+            for start in range(0, len(rows), self.block_size):
+                yield start, self._take(rows[start:start + self.block_size])
+            return
+        offset = 0
+        for segment in self._segments:
+            for start in range(0, len(segment), self.block_size):
+                yield offset + start, segment[start:start + self.block_size]
+            offset += len(segment)
+
+    def _take(self, rows: np.ndarray) -> np.ndarray:
+        """Gather arbitrary rows across segments."""
+        if len(self._segments) == 1:
+            return self._segments[0][rows]
+        out = np.empty((len(rows), self.dim), dtype=np.float32)
+        offset = 0
+        for segment in self._segments:
+            mask = (rows >= offset) & (rows < offset + len(segment))
+            if mask.any():
+                out[mask] = segment[rows[mask] - offset]
+            offset += len(segment)
+        return out
+
+    def add(self, ids: Iterable[int], vectors: Any) -> None:
+        """
+        Add vectors under the given IDs; an existing ID is replaced.
+
+        Args:
+            ids (Iterable[int]): One ID per vector
+            vectors: Array-like of shape (n, dim)
+        """
+        ids = np.fromiter(ids, dtype=np.int64)
+        matrix = self._prepare(vectors)
+        if len(ids) != len(matrix):
+            raise ValueError(f"got {len(ids)} ids for {len(matrix)} vectors")
+        if len(np.unique(ids)) != len(ids):
+            raise ValueError("ids must be unique within one add() call")
+        if not len(ids):
+            return
+
+        self.delete(i for i in ids.tolist() if i in self._rows)
+        first = len(self._ids)
+        self._segments.append(matrix)
+        self._ids = np.concatenate([self._ids, ids])
+        self._deleted = np.concatenate([self._deleted, np.zeros(len(ids), dtype=bool)])
+        self._rows.update(zip(ids.tolist(), range(first, first + len(ids))))
+
+        if self.trained:
+            assignments = self._assign(matrix)
+            self._assignments = np.concatenate([self._assignments, assignments])
+            new_rows = np.arange(first, first + len(ids))
+            for cluster in np.unique(assignments):
+                self._lists[cluster] = np.concatenate([self._lists[cluster], new_rows[assignments == cluster]])
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """
+        Remove vectors by ID. Space is reclaimed by the next compact() or save().
+
+        Args:
+            ids (Iterable[int]): IDs to remove; unknown IDs are ignored
+
+        Returns:
+            int: Number of vectors removed
+        """
+        removed = 0
+        for i in ids:
+            row = self._rows.pop(int(i), None)
+            if row is not None:
+                self._deleted[row] = True
+                removed += 1
+        return removed
+
+    def _assign(self, matrix: np.ndarray) -> np.ndarray:
+        assignments = np.empty(len(matrix), dtype=np.int32)
+        for start in range(0, len(matrix), self.block_size):
+            block = matrix[start:start + self.block_size]
+            assignments[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def train(self, nlist: Optional[int] = None, sample_size: int = 100_000, iterations: int = 20, seed: int = 0) -> None:
+        """
+        Cluster the stored vectors into an IVF index for approximate search.
+
+        Args:
+            nlist (int, optional): Number of clusters. Defaults to about 4 * sqrt(n).
+            sample_size (int): Vectors sampled to fit the centroids
+            iterations (int): k-means iterations
+            seed (int): Random seed for sampling and initialization
+        """
+        live = np.flatnonzero(~self._deleted)
+        if not len(live):
+            raise ValueError("cannot train an empty index")
+        nlist = min(nlist or max(1, int(4 * np.sqrt(len(live)))), len(live))
+
+        rng = np.random.default_rng(seed)
+        sample = self._take(np.sort(rng.choice(live, size=min(sample_size, len(live)), replace=False)))
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        # Spherical k-means: assignment by inner product, centroids renormalized
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            # Per-cluster sums over contiguous runs of the sorted sample
+            sums = np.zeros_like(centroids)
+            starts = np.cumsum(counts) - counts
+            sums[~empty] = np.add.reduceat(sample[order], starts[~empty], axis=0)
+            # Re-seed empty clusters with random sample points
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = (sums / np.maximum(norms, 1e-12)).astype(np.float32)
+
+        self.centroids = centroids
+        self._assignments = np.concatenate([self._assign(m) for _, m in self._blocks()])
+        self._build_lists()
+
+    def _build_lists(self) -> None:
+        order = np.argsort(self._assignments, kind="stable")
+        bounds = np.searchsorted(self._assignments[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(len(self.centroids))]
+
+    def search(
+        self,
+        query: Any,
+        k: int = 10,
+        ids: Optional[Iterable[int]] = None,
+        exact: Optional[bool] = None,
+        nprobe: Optional[int] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest vectors to each query.
+
+        Args:
+            query: One vector of shape (dim,) or a batch of shape (q, dim)
+            k (int): Number of neighbours per query
+            ids (Iterable[int], optional): Restrict results to these IDs
+            exact (bool, optional): Force exact (True) or IVF (False) search.
+                Defaults to IVF once trained and above exact_threshold candidates.
+            nprobe (int, optional): Clusters scanned per query, overrides self.nprobe
+
+        Returns:
+            tuple: (ids, scores) arrays of shape (k,) for a single query or
+            (q, k) for a batch, best first; missing results are -1 / -inf
+        """
+        single = np.asarray(query).ndim == 1
+        queries = self._prepare(query)
+
+        allowed = None
+        if ids is not None:
+            allowed = np.zeros(len(self._ids), dtype=bool)
+            rows = [self._rows[i] for i in ids if i in self._rows]
+            allowed[rows] = True
+
+        if exact is None:
+            # A small filtered subset is cheaper to scan exactly than to probe,
+            # and probing could miss it entirely
+            candidates = len(self) if allowed is None else int(allowed.sum())
+            exact = not self.trained or candidates < self.exact_threshold
+        if exact or not self.trained:
+            result_ids, scores = self._search_exact(queries, k, allowed)
+        else:
+            result_ids, scores = self._search_ivf(queries, k, allowed, nprobe or self.nprobe)
+        if single:
+            return result_ids[0], scores[0]
+        return result_ids, scores
+
+    def _search_exact(self, queries: np.ndarray, k: int, allowed: Optional[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        live = ~self._deleted if allowed is None else allowed & ~self._deleted
+        best_rows = np.full((len(queries), 0), -1, dtype=np.int64)
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+
+        # A selective filter gathers just the allowed rows instead of scanning all blocks
+        selective = allowed is not None and live.sum() < len(live) // 4
+        blocks = self._blocks(np.flatnonzero(live)) if selective else self._blocks()
+        candidates = np.flatnonzero(live) if selective else None
+
+        for first, block in blocks:
+            scores = queries @ block.T
+            if candidates is not None:
+                rows = candidates[first:first + len(block)]
+            else:
+                rows = np.arange(first, first + len(block))
+                scores[:, ~live[rows]] = -np.inf
+            best_rows, best_scores = _merge_top_k(best_rows, best_scores, rows, scores, k)
+        return self._finish(best_rows, best_scores, k)
+
+    def _search_ivf(
+        self, queries: np.ndarray, k: int, allowed: Optional[np.ndarray], nprobe: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        live = ~self._deleted if allowed is None else allowed & ~self._deleted
+
+        out_rows = np.full((len(queries), k), -1, dtype=np.int64)
+        out_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for q, clusters in enumerate(probes):
+            rows = np.concatenate([self._lists[c] for c in clusters])
+            rows = np.sort(rows[live[rows]])
+            if not len(rows):
+                continue
+            scores = self._take(rows) @ queries[q]
+            top = _top_k(scores, k)
+            out_rows[q, :len(top)] = rows[top]
+            out_scores[q, :len(top)] = scores[top]
+        return self._finish(out_rows, out_scores, k)
+
+    def _finish(self, rows: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        pad = k - rows.shape[1]
+        if pad > 0:
+            rows = np.pad(rows, ((0, 0), (0, pad)), constant_values=-1)
+            scores = np.pad(scores, ((0, 0), (0, pad)), constant_values=-np.inf)
+        ids = np.where(rows >= 0, self._ids[np.maximum(rows, 0)] if len(self._ids) else -1, -1)
+        ids[~np.isfinite(scores)] = -1
+        return ids, scores
+
+    def search_chunks(
+        self,
+        conn: sqlite3.Connection,
+        query: Any,
+        k: int = 10,
+        company_id: Optional[int] = None,
+        date_range: Optional[tuple] = None,
+        **kwargs,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Search restricted to chunks of one company and/or a transcript date range.
+
+        The filter is resolved against the chunks and transcripts tables
+        with db_interface.get_chunk_ids.
+
+        Args:
+            conn (sqlite3.Connection): Database connection
+            query: Query vector(s)
+            k (int): Number of neighbours per query
+            company_id (int, optional): Filter by company ID
+            date_range (tuple, optional): Inclusive (start, end) transcript dates
+            **kwargs: Passed on to search()
+
+        Returns:
+            tuple: (ids, scores) as returned by search()
+        """
+        ids = None
+        if company_id is not None or date_range is not None:
+            ids = get_chunk_ids(conn, company_id=company_id, date_range=date_range)
+        return self.search(query, k=k, ids=ids, **kwargs)
+
+    def compact(self) -> None:
+        """Drop deleted rows and merge segments into one in-memory matrix."""
+        live = np.flatnonzero(~self._deleted)
+        matrix = self._take(live) if len(live) else np.empty((0, self.dim), dtype=np.float32)
+        self._segments = [matrix] if len(live) else []
+        self._ids = self._ids[live]
+        self._deleted = np.zeros(len(live), dtype=bool)
+        self._rows = dict(zip(self._ids.tolist(), range(len(live))))
+        if self.trained:
+            self._assignments = self._assignments[live]
+            self._build_lists()
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a directory, dropping deleted rows.
+
+        Args:
+            path (str): Directory to write (created if missing)
+        """
+        os.makedirs(path, exist_ok=True)
+        live = np.flatnonzero(~self._deleted)
+        # Segments may be memory-mapped from the file being replaced (load, add,
+        # save to the same path), so write a temporary file and swap it in
+        target = os.path.join(path, "vectors.npy")
+        temp = target + ".tmp"
+        try:
+            vectors = np.lib.format.open_memmap(temp, mode="w+", dtype=np.float32, shape=(len(live), self.dim))
+            # Stream block by block so saving never holds a second copy in memory
+            for start in range(0, len(live), self.block_size):
+                rows = live[start:start + self.block_size]
+                vectors[start:start + len(rows)] = self._take(rows)
+            vectors.flush()
+            del vectors
+            os.replace(temp, target)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+
+        np.save(os.path.join(path, "ids.npy"), self._ids[live])
+        if self.trained:
+            np.save(os.path.join(path, "centroids.npy"), self.centroids)
+            np.save(os.path.join(path, "assignments.npy"), self._assignments[live])
+        with open(os.path.join(path, "index.json"), "w") as f:
+            json.dump({"dim": self.dim, "metric": self.metric, "nprobe": self.nprobe}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, **kwargs) -> "VectorIndex":
+        """
+        Open an index written by save().
+
+        Args:
+            path (str): Directory written by save()
+            mmap (bool): Memory-map the vectors instead of reading them into memory
+            **kwargs: Overrides for constructor arguments such as block_size
+
+        Returns:
+            VectorIndex: The loaded index
+        """
+        with open(os.path.join(path, "index.json")) as f:
+            meta = json.load(f)
+        meta.update(kwargs)
+        index = cls(**meta)
+
+        vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r" if mmap else None)
+        index._segments = [vectors] if len(vectors) else []
+        index._ids = np.load(os.path.join(path, "ids.npy"))
+        index._deleted = np.zeros(len(index._ids), dtype=bool)
+        index._rows = dict(zip(index._ids.tolist(), range(len(index._ids))))
+
+        centroids = os.path.join(path, "centroids.npy")
+        if os.path.exists(centroids):
+            index.centroids = np.load(centroids)
+            index._assignments = np.load(os.path.join(path, "assignments.npy"))
+            index._build_lists()
+        return index
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first."""
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+def _merge_top_k(
+    best_rows: np.ndarray, best_scores: np.ndarray, rows: np.ndarray, scores: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge one block's scores into the running per-query top k."""
+    all_scores = np.concatenate([best_scores, scores], axis=1)
+    all_rows = np.concatenate([best_rows, np.broadcast_to(rows, scores.shape)], axis=1)
+    if all_scores.shape[1] > k:
+        top = np.argpartition(-all_scores, k - 1, axis=1)[:, :k]
+    else:
+        top = np.broadcast_to(np.arange(all_scores.shape[1]), all_scores.shape)
+    top_scores = np.take_along_axis(all_scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(np.take_along_axis(all_rows, top, axis=1), order, axis=1),
+        np.take_along_axis(top_scores, order, axis=1),
+    )